@@ -0,0 +1,278 @@
+"""Batch simulation of many games in lockstep with NumPy.
+
+A round is always 52 plays, so every live game in a batch is on the same
+round number and the same play of that round: the pass direction, the trick
+position and the first-trick rule are shared, and only hands, seats, points
+and scores differ per game. Those are NumPy arrays, with hands as uint64 card
+masks laid out as in hearts_engine.cards.
+
+play_round plays one round of a batch, by the engine's RESTRICTION_MASKS;
+batch_games deals whole games from their seeds and plays them round by
+round.
+"""
+
+import dataclasses
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.rules import RESTRICTION_MASKS
+from hearts_engine.scoring import card_points
+from hearts_engine.state import pass_direction_for_round
+from hearts_engine.state import pass_target
+from numpy.typing import NDArray
+
+Masks = NDArray[np.uint64]
+Ints = NDArray[np.int64]
+Bools = NDArray[np.bool_]
+
+ONE = np.uint64(1)
+SHIFTS = np.arange(52, dtype=np.uint64)
+RANKS = np.arange(52, dtype=np.int64) % 13
+LANES = np.arange(52, dtype=np.int64) // 13
+HEARTS_LANE = T.Suit.HEARTS.order
+POINTS = np.array([card_points(c) for c in T.CARDS], dtype=np.int64)
+NO_CARD = -1
+
+# RESTRICTION_MASKS keyed by lead lane (4 = leading), first trick, broken,
+# padded to a common width with the full mask (which never restricts).
+_LANE_SUITS: tuple[T.Suit | None, ...] = (*T.Suit, None)
+_RESTRICTION_ROWS = [
+    RESTRICTION_MASKS[suit, first_trick, hearts_broken]
+    for suit in _LANE_SUITS
+    for first_trick in (False, True)
+    for hearts_broken in (False, True)
+]
+_RESTRICTIONS: Masks = np.array(
+    [
+        (*row, *((1 << 52) - 1 for _ in range(3 - len(row))))
+        for row in _RESTRICTION_ROWS
+    ],
+    dtype=np.uint64,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Table:
+    """What a batched policy sees: one row per game it is deciding for.
+
+    Arrays are shared with the simulator and must not be modified.
+    """
+
+    games: Ints  # index of each row's game in the batch
+    round_number: int
+    tricks_played: int
+    hands: Masks  # (n, 4) card masks by seat
+    trick: Ints  # (n, 4) card index by seat, NO_CARD if not played
+    lead: Ints
+    current: Ints  # the seat deciding
+    hearts_broken: Bools
+    round_points: Ints  # (n, 4)
+    scores: Ints  # (n, 4), before this round
+
+    def take(self, rows: Ints) -> Table:
+        """The sub-table of the given rows."""
+        return Table(
+            games=self.games[rows],
+            round_number=self.round_number,
+            tricks_played=self.tricks_played,
+            hands=self.hands[rows],
+            trick=self.trick[rows],
+            lead=self.lead[rows],
+            current=self.current[rows],
+            hearts_broken=self.hearts_broken[rows],
+            round_points=self.round_points[rows],
+            scores=self.scores[rows],
+        )
+
+    @property
+    def own_hands(self) -> Masks:
+        return self.hands[np.arange(len(self.games)), self.current]
+
+
+class BatchPolicy(Protocol):
+    """A strategy deciding for many games at once."""
+
+    def pass_cards(
+        self,
+        table: Table,
+        direction: T.PassDirection,
+        rng: np.random.Generator,
+    ) -> Masks:
+        """Choose 3 cards from each current seat's hand, as masks."""
+        ...
+
+    def play_cards(
+        self, table: Table, legal: Masks, rng: np.random.Generator
+    ) -> Ints:
+        """Choose one card index from each row of legal."""
+        ...
+
+    def add_to_others(self, table: Table, rng: np.random.Generator) -> Bools:
+        """Moon choice for each current seat, which has shot the moon."""
+        ...
+
+
+def play_round(
+    games: Ints,
+    round_number: int,
+    hands: Masks,
+    scores: Ints,
+    policies: Sequence[BatchPolicy],
+    rng: np.random.Generator,
+) -> Ints:
+    """Pass, play 52 cards and score one round; returns the score changes.
+
+    hands is modified in place.
+    """
+    n = len(games)
+    rows = np.arange(n)
+    table = Table(
+        games=games,
+        round_number=round_number,
+        tricks_played=0,
+        hands=hands,
+        trick=np.full((n, 4), NO_CARD, dtype=np.int64),
+        lead=np.zeros(n, dtype=np.int64),
+        current=np.zeros(n, dtype=np.int64),
+        hearts_broken=np.zeros(n, dtype=np.bool_),
+        round_points=np.zeros((n, 4), dtype=np.int64),
+        scores=scores,
+    )
+
+    direction = pass_direction_for_round(round_number)
+    if direction != T.PassDirection.HOLD:
+        passed = np.zeros((n, 4), dtype=np.uint64)
+        for seat in T.PLAYER_IDS:
+            table.current[:] = seat
+            chosen = policies[seat].pass_cards(table, direction, rng)
+            assert np.all(chosen & ~hands[:, seat] == 0), "not in hand"
+            assert np.all(np.bitwise_count(chosen) == 3), "not 3 cards"
+            passed[:, seat] = chosen
+        hands &= ~passed
+        for seat in T.PLAYER_IDS:
+            hands[:, pass_target(seat, direction)] |= passed[:, seat]
+
+    # The 2C holder leads.
+    table.lead[:] = table.current[:] = (hands & ONE).argmax(axis=1)
+    for step in range(52):
+        position = step % 4
+        if step and not position:
+            table = dataclasses.replace(table, tricks_played=step // 4)
+        current = table.current
+        if position:
+            lane = table.trick[rows, table.lead] // 13
+        else:
+            lane = np.full(n, 4)
+        code = lane * 4 + (step < 4) * 2 + table.hearts_broken
+        legal = legal_plays(hands[rows, current], code)
+
+        cards = _play_cards(policies, table, legal, rng)
+        bits = ONE << cards.astype(np.uint64)
+        assert np.all(legal & bits), "invalid play"
+        hands[rows, current] ^= bits
+        table.trick[rows, current] = cards
+        table.hearts_broken[:] |= cards // 13 == HEARTS_LANE
+
+        if position < 3:
+            table.current[:] = (current + 1) % 4
+            continue
+        winner = trick_winners(table.trick, table.lead)
+        table.round_points[rows, winner] += POINTS[table.trick].sum(axis=1)
+        table.lead[:] = table.current[:] = winner
+        table.trick[:] = NO_CARD
+
+    return _score_round(policies, table, rng)
+
+
+def legal_plays(hands: Masks, codes: Ints) -> Masks:
+    """Legal card masks, per the engine's restriction tables.
+
+    codes are lead lane (4 when leading) * 4 + first trick * 2 + broken.
+    """
+    valid = hands.copy()
+    for column in _RESTRICTIONS[codes].T:
+        restricted = valid & column
+        valid = np.where(restricted != 0, restricted, valid)
+    return valid
+
+
+def trick_winners(trick: Ints, lead: Ints) -> Ints:
+    """Seat taking each complete trick: the highest card of the led lane."""
+    lane = trick[np.arange(len(lead)), lead] // 13
+    return np.where(trick // 13 == lane[:, None], trick, NO_CARD).argmax(
+        axis=1
+    )
+
+
+def mask_bits(masks: Masks) -> Bools:
+    """(n, 52) membership matrix of card masks."""
+    return (masks[:, None] >> SHIFTS) & ONE != 0
+
+
+def highest_card(masks: Masks) -> Ints:
+    """Index of each mask's highest bit (masks must be non-empty).
+
+    Masks are below 2**53, so the float conversion is exact.
+    """
+    return np.frexp(masks.astype(np.float64))[1].astype(np.int64) - 1
+
+
+def lowest_card(masks: Masks) -> Ints:
+    """Index of each mask's lowest bit (masks must be non-empty)."""
+    return highest_card(masks & (~masks + ONE))
+
+
+def best_cards(masks: Masks, weights: NDArray[np.float64], k: int) -> Masks:
+    """Mask of the k highest-weighted cards of each mask.
+
+    weights is (52,) or (n, 52); each mask must hold at least k cards.
+    """
+    keyed = np.where(mask_bits(masks), weights, -np.inf)
+    picked = np.argpartition(-keyed, k - 1, axis=1)[:, :k]
+    return np.bitwise_or.reduce(ONE << picked.astype(np.uint64), axis=1)
+
+
+def _play_cards(
+    policies: Sequence[BatchPolicy],
+    table: Table,
+    legal: Masks,
+    rng: np.random.Generator,
+) -> Ints:
+    """Ask each seat's policy about the games where that seat is to play."""
+    if all(p is policies[0] for p in policies):
+        return policies[0].play_cards(table, legal, rng)
+    cards = np.empty(len(legal), dtype=np.int64)
+    for seat in T.PLAYER_IDS:
+        rows = np.flatnonzero(table.current == seat)
+        if rows.size:
+            cards[rows] = policies[seat].play_cards(
+                table.take(rows), legal[rows], rng
+            )
+    return cards
+
+
+def _score_round(
+    policies: Sequence[BatchPolicy], table: Table, rng: np.random.Generator
+) -> Ints:
+    """Score changes, asking each shooter for its moon choice."""
+    points = table.round_points.copy()
+    takers = np.count_nonzero(points, axis=1)
+    shot = np.flatnonzero((takers == 1) & (points.max(axis=1) == 26))
+    if not shot.size:
+        return points
+    shooters = points[shot].argmax(axis=1)
+    table.current[shot] = shooters
+    add = np.empty(len(shot), dtype=np.bool_)
+    for seat in T.PLAYER_IDS:
+        rows = np.flatnonzero(shooters == seat)
+        if rows.size:
+            add[rows] = policies[seat].add_to_others(
+                table.take(shot[rows]), rng
+            )
+    moon = np.where(add[:, None], 26, 0).repeat(4, axis=1)
+    moon[np.arange(len(shot)), shooters] = np.where(add, 0, -26)
+    points[shot] = moon
+    return points
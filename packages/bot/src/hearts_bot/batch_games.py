@@ -0,0 +1,58 @@
+"""Whole games simulated in lockstep, one batch of rounds at a time.
+
+Deals come from each game's own Random, drawn exactly as new_game and
+start_new_round draw them, and each round is played by batch.play_round.
+A batch game and an engine game on the same seed see the same cards, and
+the same choices give the same scores.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from random import Random
+
+import numpy as np
+from hearts_engine.cards import Deck
+from hearts_engine.cards import deal_hands
+from hearts_engine.round import LOSING_SCORE
+
+from .batch import BatchPolicy
+from .batch import Ints
+from .batch import play_round
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    """Final scores of a simulated batch."""
+
+    scores: Ints  # (n, 4)
+    rounds: Ints  # rounds played per game
+
+
+def simulate(
+    seeds: Sequence[int],
+    policies: Sequence[BatchPolicy],
+    rng: np.random.Generator,
+) -> BatchResult:
+    """Play one game per seed to the end, policies[seat] deciding for seat.
+
+    Game g is dealt from Random(seeds[g]), as new_game(Random(seeds[g]))
+    would deal it.
+    """
+    assert len(policies) == 4, policies
+    n = len(seeds)
+    randoms = [Random(seed) for seed in seeds]
+    scores = np.zeros((n, 4), dtype=np.int64)
+    rounds = np.zeros(n, dtype=np.int64)
+    round_number = 0
+    while (live := np.flatnonzero(scores.max(axis=1) < LOSING_SCORE)).size:
+        hands = np.array(
+            [[h.mask for h in deal_hands(Deck(), randoms[g])] for g in live],
+            dtype=np.uint64,
+        ).reshape(-1, 4)
+        points = play_round(
+            live, round_number, hands, scores[live], policies, rng
+        )
+        scores[live] += points
+        rounds[live] += 1
+        round_number += 1
+    return BatchResult(scores=scores, rounds=rounds)
@@ -0,0 +1,114 @@
+"""Batched policies for the batch simulator."""
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.card import QUEEN_OF_SPADES
+from hearts_engine.cards import SUIT_MASKS
+from hearts_engine.round import LOSING_SCORE
+
+from .batch import HEARTS_LANE
+from .batch import LANES
+from .batch import NO_CARD
+from .batch import ONE
+from .batch import RANKS
+from .batch import Bools
+from .batch import Ints
+from .batch import Masks
+from .batch import Table
+from .batch import best_cards
+from .batch import highest_card
+from .batch import lowest_card
+from .playout import random_cards
+
+
+class RandomPolicy:
+    """Uniformly random legal choices."""
+
+    def pass_cards(
+        self,
+        table: Table,
+        direction: T.PassDirection,
+        rng: np.random.Generator,
+    ) -> Masks:
+        return best_cards(
+            table.own_hands, rng.random((len(table.games), 52)), 3
+        )
+
+    def play_cards(
+        self, table: Table, legal: Masks, rng: np.random.Generator
+    ) -> Ints:
+        return random_cards(legal, rng)
+
+    def add_to_others(self, table: Table, rng: np.random.Generator) -> Bools:
+        return rng.random(len(table.games)) < 0.5
+
+
+QUEEN_OF_SPADES_INDEX = QUEEN_OF_SPADES.index
+_HIGH_SPADES = (LANES == T.Suit.SPADES.order) & (RANKS >= 10)
+_HEARTS = LANES == HEARTS_LANE
+# Passing: the high spades first, then by rank with hearts ahead on ties.
+_PASS_WEIGHTS = RANKS + 13.0 * _HIGH_SPADES + 0.5 * _HEARTS
+# Discarding: the queen of spades, then high spades and hearts, then rank.
+_DUMP_WEIGHTS = RANKS + 13.0 * (_HIGH_SPADES | _HEARTS)
+_DUMP_WEIGHTS[QUEEN_OF_SPADES_INDEX] = 100.0
+_LANE_MASKS = np.array([SUIT_MASKS[s] for s in T.Suit], dtype=np.uint64)
+
+
+class HeuristicPolicy:
+    """A simple point-avoiding strategy.
+
+    Passes high spades and high cards; leads low; follows with the highest
+    card that still loses the trick, otherwise the lowest (the highest when
+    last to play); when void discards the queen of spades, high spades and
+    hearts. Adds to the others after a moon unless that ends the game with
+    the shooter not alone in the lead.
+    """
+
+    def pass_cards(
+        self,
+        table: Table,
+        direction: T.PassDirection,
+        rng: np.random.Generator,
+    ) -> Masks:
+        return best_cards(table.own_hands, _PASS_WEIGHTS, 3)
+
+    def play_cards(
+        self, table: Table, legal: Masks, rng: np.random.Generator
+    ) -> Ints:
+        rows = np.arange(len(legal))
+        low = lowest_card(legal)
+        high = highest_card(legal)
+        if np.all(table.trick == NO_CARD):
+            return low  # leading
+        lane = table.trick[rows, table.lead] // 13
+        winning = np.where(table.trick // 13 == lane[:, None], table.trick, -1)
+        duck = legal & ((ONE << winning.max(axis=1).astype(np.uint64)) - ONE)
+        last = np.count_nonzero(table.trick != NO_CARD, axis=1) == 3
+        following = np.select(
+            [duck != 0, last], [highest_card(duck | ONE), high], low
+        )
+        discard = _dump(legal)
+        return np.where(LANES[low] == lane, following, discard)
+
+    def add_to_others(self, table: Table, rng: np.random.Generator) -> Bools:
+        rows = np.arange(len(table.games))
+        added = table.scores + 26
+        added[rows, table.current] -= 26
+        others = added.copy()
+        others[rows, table.current] = LOSING_SCORE * 2
+        ends = added.max(axis=1) >= LOSING_SCORE
+        return ~ends | (added[rows, table.current] < others.min(axis=1))
+
+
+def _dump(legal: Masks) -> Ints:
+    """The highest _DUMP_WEIGHTS card of each mask.
+
+    Weights rise with rank within a lane, so only the queen of spades and
+    the top card of each lane compete.
+    """
+    by_lane = legal[:, None] & _LANE_MASKS
+    tops = highest_card(by_lane)
+    weights = np.where(by_lane != 0, _DUMP_WEIGHTS[tops], -np.inf)
+    best = tops[np.arange(len(legal)), weights.argmax(axis=1)]
+    has_queen = legal >> np.uint64(QUEEN_OF_SPADES_INDEX) & ONE != 0
+    return np.where(has_queen, QUEEN_OF_SPADES_INDEX, best)
@@ -0,0 +1,146 @@
+"""Tests for the batch simulator."""
+
+from collections import defaultdict
+from random import Random
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.cards import iter_mask
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.rules import valid_plays_mask
+from hearts_engine.state import ChooseMoonOption
+from hearts_engine.state import PlayCard
+from hearts_engine.state import PlayerAction
+from hearts_engine.state import SelectPass
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .batch import BatchPolicy
+from .batch import Bools
+from .batch import Ints
+from .batch import Masks
+from .batch import Table
+from .batch import highest_card
+from .batch import legal_plays
+from .batch import lowest_card
+from .batch_games import simulate
+from .batch_policies import HeuristicPolicy
+from .batch_policies import RandomPolicy
+
+
+class _Recorder:
+    """Wraps a policy, logging its choices as engine actions per game."""
+
+    def __init__(
+        self, policy: BatchPolicy, log: dict[int, list[PlayerAction]]
+    ) -> None:
+        self.policy = policy
+        self.log = log
+
+    def pass_cards(
+        self,
+        table: Table,
+        direction: T.PassDirection,
+        rng: np.random.Generator,
+    ) -> Masks:
+        chosen = self.policy.pass_cards(table, direction, rng)
+        for game, mask in zip(table.games, chosen):
+            a, b, c = iter_mask(int(mask))
+            self.log[int(game)].append(SelectPass(cards=(a, b, c)))
+        return chosen
+
+    def play_cards(
+        self, table: Table, legal: Masks, rng: np.random.Generator
+    ) -> Ints:
+        cards = self.policy.play_cards(table, legal, rng)
+        for game, card in zip(table.games, cards):
+            action = PlayCard(card=T.Card.from_index(int(card)))
+            self.log[int(game)].append(action)
+        return cards
+
+    def add_to_others(self, table: Table, rng: np.random.Generator) -> Bools:
+        add = self.policy.add_to_others(table, rng)
+        for game, choice in zip(table.games, add):
+            action = ChooseMoonOption(add_to_others=bool(choice))
+            self.log[int(game)].append(action)
+        return add
+
+
+def _check_against_engine(
+    seeds: list[int], policies: list[BatchPolicy], rng_seed: int
+) -> None:
+    log: dict[int, list[PlayerAction]] = defaultdict(list)
+    recorders: list[BatchPolicy] = [_Recorder(p, log) for p in policies]
+    result = simulate(seeds, recorders, np.random.default_rng(rng_seed))
+
+    for g, seed in enumerate(seeds):
+        random = Random(seed)
+        game = new_game(random)
+        for action in log[g]:
+            step = apply_action(game, action, random)
+            assert isinstance(step, T.ActionSuccess), (g, action, step)
+            game = step.new_state
+        assert game.phase == T.Phase.GAME_END
+        assert [p.score for p in game.players] == result.scores[g].tolist()
+        assert game.round_number + 1 == result.rounds[g]
+
+
+class DescribeSimulate:
+    def it_agrees_with_apply_action_for_random_play(self) -> None:
+        random = RandomPolicy()
+        _check_against_engine(list(range(40)), [random] * 4, rng_seed=1)
+
+    def it_agrees_with_apply_action_for_mixed_seats(self) -> None:
+        heuristic, random = HeuristicPolicy(), RandomPolicy()
+        policies: list[BatchPolicy] = [heuristic, random, heuristic, random]
+        _check_against_engine(list(range(100, 140)), policies, rng_seed=2)
+
+    def it_plays_every_game_to_the_end(self) -> None:
+        policies: list[BatchPolicy] = [RandomPolicy()] * 4
+        result = simulate(range(200), policies, np.random.default_rng(0))
+        assert np.all(result.scores.max(axis=1) >= 100)
+        assert np.all(result.rounds >= 4)
+
+    def it_lets_the_heuristic_beat_random_play(self) -> None:
+        heuristic, random = HeuristicPolicy(), RandomPolicy()
+        policies: list[BatchPolicy] = [heuristic, random, random, random]
+        result = simulate(range(500), policies, np.random.default_rng(0))
+        mean = result.scores.mean(axis=0)
+        assert mean[0] < mean[1:].min()
+
+
+class DescribeLegalPlays:
+    @given(
+        st.integers(min_value=1, max_value=(1 << 52) - 1),
+        st.sampled_from([*T.Suit, None]),
+        st.booleans(),
+        st.booleans(),
+    )
+    @settings(max_examples=200)
+    def it_agrees_with_valid_plays_mask(
+        self,
+        hand: int,
+        lead_suit: T.Suit | None,
+        first_trick: bool,
+        hearts_broken: bool,
+    ) -> None:
+        if lead_suit is None and first_trick:
+            hand |= 1  # the first lead is always from the 2C holder
+        lane = 4 if lead_suit is None else lead_suit.order
+        code = lane * 4 + first_trick * 2 + hearts_broken
+        masks = np.array([hand], dtype=np.uint64)
+        got = legal_plays(masks, np.array([code]))
+        expected = valid_plays_mask(
+            hand, lead_suit, first_trick, hearts_broken
+        )
+        assert int(got[0]) == expected
+
+
+class DescribeBitHelpers:
+    @given(st.integers(min_value=1, max_value=(1 << 52) - 1))
+    def it_finds_the_highest_and_lowest_card(self, mask: int) -> None:
+        masks = np.array([mask], dtype=np.uint64)
+        assert highest_card(masks)[0] == mask.bit_length() - 1
+        assert lowest_card(masks)[0] == (mask & -mask).bit_length() - 1
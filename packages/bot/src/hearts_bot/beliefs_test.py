@@ -0,0 +1,126 @@
+"""Tests for card-location beliefs."""
+
+from random import Random
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.rules import valid_actions_for_state
+from hearts_engine.solver import QS
+from hearts_engine.state import GameState
+from hearts_engine.state import PlayCard
+from hearts_engine.state import SelectPass
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .batch import mask_bits
+from .beliefs import Beliefs
+from .beliefs import observe_play
+from .beliefs import probabilities
+from .beliefs import sample_weighted
+from .beliefs import weigh
+from .knowledge import unseen
+
+
+def _midgame(seed: int, plays: int) -> tuple[GameState, tuple[T.Card, ...]]:
+    """A random game `plays` cards into its first round, and seat 0's pass."""
+    random = Random(seed)
+    game = new_game(random)
+    passed: tuple[T.Card, ...] = ()
+    while plays or game.phase != T.Phase.PLAYING:
+        action = random.choice(valid_actions_for_state(game))
+        if isinstance(action, SelectPass) and game.current_player == 0:
+            passed = action.cards
+        if game.phase == T.Phase.PLAYING:
+            plays -= 1
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+    return game, passed
+
+
+def _beliefs(seed: int, plays: int) -> Beliefs:
+    state, passed = _midgame(seed, plays)
+    return Beliefs.from_game_state(state, T.player_id(0), passed)
+
+
+class DescribeProbabilities:
+    @given(
+        st.integers(min_value=0, max_value=10000),
+        st.integers(min_value=0, max_value=48),
+    )
+    @settings(max_examples=20, deadline=None)
+    def it_meets_the_hard_constraints(self, seed: int, plays: int) -> None:
+        beliefs = _beliefs(seed, plays)
+        knowledge = beliefs.knowledge
+        p = probabilities(beliefs)
+        hidden = mask_bits(np.array([unseen(knowledge)], dtype=np.uint64))[0]
+        assert np.allclose(p.sum(axis=1), knowledge.sizes)
+        assert np.allclose(p[:, hidden].sum(axis=0), 1.0, atol=1e-5)
+        assert np.allclose(
+            p[0], mask_bits(np.array([knowledge.hand], dtype=np.uint64))[0]
+        )
+        for seat in range(4):
+            for lane in range(4):
+                if knowledge.voids[seat] >> lane & 1:
+                    assert not p[seat, 13 * lane : 13 * lane + 13].any()
+
+    def it_leans_towards_the_evidence(self) -> None:
+        beliefs = _beliefs(1, 0)
+        if not unseen(beliefs.knowledge) >> QS & 1:
+            beliefs = _beliefs(2, 0)
+        likelihoods = np.ones((4, 52))
+        likelihoods[2, QS] = 5.0
+        before = probabilities(beliefs)[2, QS]
+        after = probabilities(weigh(beliefs, likelihoods))[2, QS]
+        assert after > before
+
+    def it_is_updated_by_each_play(self) -> None:
+        state, passed = _midgame(3, 0)
+        beliefs = Beliefs.from_game_state(state, T.player_id(0), passed)
+        seat = state.current_player
+        card = next(iter(state.players[seat].hand)).index
+        played = probabilities(observe_play(beliefs, seat, card))
+        assert not played[:, card].any()
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=None)
+    def it_refits_each_play_as_a_fresh_fit_would(self, seed: int) -> None:
+        state, passed = _midgame(seed, 0)
+        player = T.player_id(0)
+        likelihoods = np.random.default_rng(seed).uniform(0.2, 5.0, (4, 52))
+        beliefs = weigh(
+            Beliefs.from_game_state(state, player, passed), likelihoods
+        )
+        random = Random(seed)
+        for _ in range(24):
+            seat = state.current_player
+            action = random.choice(valid_actions_for_state(state))
+            assert isinstance(action, PlayCard)
+            beliefs = observe_play(beliefs, seat, action.card.index)
+            result = apply_action(state, action, random)
+            assert isinstance(result, T.ActionSuccess), result
+            state = result.new_state
+        fresh = weigh(Beliefs.from_knowledge(beliefs.knowledge), likelihoods)
+        assert np.allclose(
+            probabilities(beliefs), probabilities(fresh), atol=1e-4
+        )
+
+
+class DescribeSampleWeighted:
+    def it_deals_consistently_and_by_the_evidence(self) -> None:
+        beliefs = _beliefs(1, 0)
+        if not unseen(beliefs.knowledge) >> QS & 1:
+            beliefs = _beliefs(2, 0)
+        likelihoods = np.ones((4, 52))
+        likelihoods[2, QS] = 20.0
+        rng = np.random.default_rng(0)
+        deals = sample_weighted(weigh(beliefs, likelihoods), 2000, rng)
+        knowledge = beliefs.knowledge
+        assert (deals[:, 0] == knowledge.hand).all()
+        sizes = np.bitwise_count(deals).mean(axis=0)
+        assert sizes.tolist() == list(knowledge.sizes)
+        share = (deals[:, 2] >> np.uint64(QS) & np.uint64(1)).mean()
+        assert share > 0.8
@@ -0,0 +1,282 @@
+"""Uniform sampling of the hidden cards, consistent with what a player saw.
+
+A player sees their own hand, every trick played and the hand sizes. From
+the tricks they know who is void in what, and having passed they know where
+three of their old cards went (GameState forgets passes once executed, so
+the caller supplies them). Constraints holds that knowledge; Sampler draws
+deals of the unseen cards that satisfy it, every consistent deal equally
+likely.
+
+Rejection sampling over whole deals stalls once a few voids are known. The
+sampler counts instead: unseen cards are grouped by which opponents may hold
+them, and a deal is a split of each group between those opponents. The
+number of deals that complete a partial split is counted exactly, so each
+split is drawn with its true probability and no draw is ever rejected.
+"""
+
+import math
+from bisect import bisect_right
+from collections.abc import Iterable
+from collections.abc import Mapping
+from dataclasses import dataclass
+from dataclasses import field
+from random import Random
+from typing import Self
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.cards import cards_mask
+from hearts_engine.state import GameState
+from hearts_engine.state import pass_target
+
+from .batch import ONE
+from .batch import Masks
+from .knowledge import Knowledge
+from .knowledge import known_cards
+from .knowledge import unseen
+
+_ALL = (1 << 52) - 1
+
+Split = tuple[int, int, int]  # cards to each opponent, in seat order
+Caps = tuple[int, int, int]  # cards each opponent still has room for
+# Possible splits of a group, with cumulative counts of the deals they allow
+SplitTable = tuple[tuple[Split, ...], tuple[int, ...]]
+
+
+@dataclass(frozen=True, slots=True)
+class Constraints:
+    """What one player knows about where the cards they cannot see are."""
+
+    player: T.PlayerId
+    hands: tuple[int, ...]  # card mask per seat: the player's own hand only
+    unseen: int  # cards in the other hands
+    sizes: tuple[int, ...]  # hand size per seat
+    voids: tuple[int, ...]  # per seat, bit per suit lane known void
+    known: tuple[int, ...]  # per seat, unseen cards known to be there
+
+    @classmethod
+    def from_game_state(
+        cls,
+        state: GameState,
+        player: T.PlayerId,
+        passed: Iterable[T.Card] = (),
+    ) -> Self:
+        """The player's view of a playing-phase state.
+
+        passed is the three cards the player passed this round, if any.
+        """
+        hand = state.players[player].hand.mask
+        played = 0
+        voids = [0, 0, 0, 0]
+        tricks = [t for tricks in state.tricks_won for t in tricks]
+        if state.trick is not None:
+            tricks.append(state.trick)
+        for trick in tricks:
+            lead_suit = trick.lead_suit
+            for seat, card in trick.items():
+                played |= 1 << card.index
+                if lead_suit is not None and card.suit != lead_suit:
+                    voids[seat] |= 1 << lead_suit.order
+        unseen = _ALL & ~hand & ~played
+        known = [0, 0, 0, 0]
+        if state.pass_direction != T.PassDirection.HOLD:
+            target = pass_target(player, state.pass_direction)
+            known[target] = cards_mask(passed) & unseen
+        hands = [0, 0, 0, 0]
+        hands[player] = hand
+        return cls(
+            player=player,
+            hands=tuple(hands),
+            unseen=unseen,
+            sizes=tuple(len(p.hand) for p in state.players),
+            voids=tuple(voids),
+            known=tuple(known),
+        )
+
+    @classmethod
+    def from_knowledge(cls, knowledge: Knowledge) -> Self:
+        """The same view, read off a Knowledge without rescanning tricks."""
+        rest = unseen(knowledge)
+        hands = [0, 0, 0, 0]
+        hands[knowledge.player] = knowledge.hand
+        return cls(
+            player=knowledge.player,
+            hands=tuple(hands),
+            unseen=rest,
+            sizes=knowledge.sizes,
+            voids=knowledge.voids,
+            known=tuple(
+                known_cards(knowledge, T.player_id(seat)) & rest
+                for seat in range(4)
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Sampler:
+    """Draws deals consistent with a set of Constraints.
+
+    Building one counts the deals, so build one per decision and draw as
+    many deals from it as needed.
+    """
+
+    constraints: Constraints
+    opponents: tuple[T.PlayerId, T.PlayerId, T.PlayerId]
+    # Unseen cards that are not known, grouped by the opponents who may
+    # hold them: (one bit per opponent, cards low to high)
+    groups: tuple[tuple[int, tuple[int, ...]], ...]
+    caps: Caps
+    # Split tables by (group index, caps before the group)
+    tables: Mapping[tuple[int, Caps], SplitTable] = field(
+        repr=False, compare=False
+    )
+
+    @classmethod
+    def from_constraints(cls, constraints: Constraints) -> Self:
+        player = constraints.player
+        opponents = (
+            T.player_id(player + 1),
+            T.player_id(player + 2),
+            T.player_id(player + 3),
+        )
+        free = constraints.unseen
+        for seat in opponents:
+            free &= ~constraints.known[seat]
+        by_allowed: dict[int, list[int]] = {}
+        rest = free
+        while rest:
+            low = rest & -rest
+            rest ^= low
+            card = low.bit_length() - 1
+            allowed = sum(
+                1 << i
+                for i, seat in enumerate(opponents)
+                if not constraints.voids[seat] >> (card // 13) & 1
+            )
+            assert allowed, f"No one can hold card {card}"
+            by_allowed.setdefault(allowed, []).append(card)
+        a, b, c = (
+            constraints.sizes[seat] - constraints.known[seat].bit_count()
+            for seat in opponents
+        )
+        assert a + b + c == free.bit_count(), (a, b, c, free.bit_count())
+        groups = tuple(
+            (allowed, tuple(cards))
+            for allowed, cards in sorted(by_allowed.items())
+        )
+        return cls(
+            constraints=constraints,
+            opponents=opponents,
+            groups=groups,
+            caps=(a, b, c),
+            tables=_split_tables(groups, (a, b, c)),
+        )
+
+
+def count_deals(sampler: Sampler) -> int:
+    """Number of deals consistent with the constraints."""
+    if not sampler.groups:
+        return 1
+    return sampler.tables[0, sampler.caps][1][-1]
+
+
+def sample_deal(sampler: Sampler, random: Random) -> tuple[int, ...]:
+    """One consistent deal, as a card mask per seat."""
+    hands = _fixed_hands(sampler)
+    caps = sampler.caps
+    for i, (_, cards) in enumerate(sampler.groups):
+        splits, cumulative = sampler.tables[i, caps]
+        split = splits[
+            bisect_right(cumulative, random.randrange(cumulative[-1]))
+        ]
+        shuffled = random.sample(cards, len(cards))
+        start = 0
+        for k, seat in enumerate(sampler.opponents):
+            for card in shuffled[start : start + split[k]]:
+                hands[seat] |= 1 << card
+            start += split[k]
+        caps = (caps[0] - split[0], caps[1] - split[1], caps[2] - split[2])
+    return tuple(hands)
+
+
+def sample_deals(sampler: Sampler, n: int, rng: np.random.Generator) -> Masks:
+    """n independent consistent deals, as an (n, 4) array of card masks.
+
+    Splits are drawn per deal, and the cards of each group are then shuffled
+    and handed out for all n deals at once.
+    """
+    groups = sampler.groups
+    counts = np.zeros((len(groups), n, 3), dtype=np.int64)
+    caps = [sampler.caps] * n
+    for i in range(len(groups)):
+        tables = [sampler.tables[i, c] for c in caps]
+        # An exact integer below each count: the counts reach 39!/13!**3,
+        # past a float's 2**53 but within an int64
+        picks = rng.integers([cumulative[-1] for _, cumulative in tables])
+        for d, ((splits, cumulative), pick) in enumerate(
+            zip(tables, picks.tolist())
+        ):
+            split = splits[bisect_right(cumulative, pick)]
+            counts[i, d] = split
+            c = caps[d]
+            caps[d] = (c[0] - split[0], c[1] - split[1], c[2] - split[2])
+    hands = np.tile(np.array(_fixed_hands(sampler), dtype=np.uint64), (n, 1))
+    for i, (_, cards) in enumerate(groups):
+        bits = ONE << np.array(cards, dtype=np.uint64)
+        shuffled = bits[np.argsort(rng.random((n, len(cards))), axis=1)]
+        position = np.arange(len(cards))
+        ends = np.cumsum(counts[i], axis=1)
+        starts = ends - counts[i]
+        for k, seat in enumerate(sampler.opponents):
+            dealt = (position >= starts[:, k, None]) & (
+                position < ends[:, k, None]
+            )
+            hands[:, seat] |= np.bitwise_or.reduce(
+                np.where(dealt, shuffled, np.uint64(0)), axis=1
+            )
+    return hands
+
+
+def _fixed_hands(sampler: Sampler) -> list[int]:
+    """The player's own hand and the known cards of the others."""
+    constraints = sampler.constraints
+    return [h | k for h, k in zip(constraints.hands, constraints.known)]
+
+
+def _split_tables(
+    groups: tuple[tuple[int, tuple[int, ...]], ...], caps: Caps
+) -> dict[tuple[int, Caps], SplitTable]:
+    """Split tables for every (group, caps) a deal can reach."""
+    tables: dict[tuple[int, Caps], SplitTable] = {}
+
+    def count(i: int, caps: Caps) -> int:
+        """Ways to deal groups i onwards into the remaining room."""
+        if i == len(groups):
+            return 1
+        table = tables.get((i, caps))
+        if table is None:
+            table = tables[i, caps] = split(i, caps)
+        return table[1][-1]
+
+    def split(i: int, caps: Caps) -> SplitTable:
+        allowed, cards = groups[i]
+        n = len(cards)
+        splits: list[Split] = []
+        cumulative: list[int] = []
+        total = 0
+        for x in range(min(n, caps[0]) + 1 if allowed & 1 else 1):
+            for y in range(min(n - x, caps[1]) + 1 if allowed & 2 else 1):
+                z = n - x - y
+                if z > caps[2] or z and not allowed & 4:
+                    continue
+                rest = (caps[0] - x, caps[1] - y, caps[2] - z)
+                ways = count(i + 1, rest)
+                if not ways:
+                    continue
+                total += math.comb(n, x) * math.comb(n - x, y) * ways
+                splits.append((x, y, z))
+                cumulative.append(total)
+        return (tuple(splits), tuple(cumulative) or (0,))
+
+    count(0, caps)
+    return tables
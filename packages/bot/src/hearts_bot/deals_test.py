@@ -0,0 +1,158 @@
+"""Tests for constrained deal sampling."""
+
+import itertools
+from collections import Counter
+from random import Random
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.rules import valid_actions_for_state
+from hearts_engine.state import GameState
+from hearts_engine.state import SelectPass
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .deals import Constraints
+from .deals import Sampler
+from .deals import count_deals
+from .deals import sample_deal
+from .deals import sample_deals
+
+
+def _midgame(seed: int, plays: int) -> tuple[GameState, tuple[T.Card, ...]]:
+    """A random game `plays` cards into its first round, and seat 0's pass."""
+    random = Random(seed)
+    game = new_game(random)
+    passed: tuple[T.Card, ...] = ()
+    while plays:
+        action = random.choice(valid_actions_for_state(game))
+        if isinstance(action, SelectPass) and game.current_player == 0:
+            passed = action.cards
+        if game.phase == T.Phase.PLAYING:
+            plays -= 1
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+    return game, passed
+
+
+def _consistent(constraints: Constraints, hands: tuple[int, ...]) -> bool:
+    player = constraints.player
+    others = 0
+    for seat, hand in enumerate(hands):
+        if seat == player:
+            if hand != constraints.hands[player]:
+                return False
+            continue
+        if others & hand or hand & constraints.known[seat] != (
+            constraints.known[seat]
+        ):
+            return False
+        others |= hand
+        if hand.bit_count() != constraints.sizes[seat]:
+            return False
+        for lane in range(4):
+            if (
+                constraints.voids[seat] >> lane & 1
+                and hand >> 13 * lane & 8191
+            ):
+                return False
+    return others == constraints.unseen
+
+
+def _small() -> Constraints:
+    """Nine unseen cards, with one opponent void in hearts."""
+    hearts = [c.index for c in T.CARDS if c.suit == T.Suit.HEARTS][:4]
+    spades = [c.index for c in T.CARDS if c.suit == T.Suit.SPADES][:5]
+    unseen = sum(1 << card for card in hearts + spades)
+    return Constraints(
+        player=0,
+        hands=(0b111, 0, 0, 0),
+        unseen=unseen,
+        sizes=(3, 3, 3, 3),
+        voids=(0, 1 << T.Suit.HEARTS.order, 0, 0),
+        known=(0, 0, 0, 1 << spades[0]),
+    )
+
+
+def _all_deals(constraints: Constraints) -> list[tuple[int, ...]]:
+    cards = [c for c in range(52) if constraints.unseen >> c & 1]
+    deals: list[tuple[int, ...]] = []
+    for owners in itertools.product((1, 2, 3), repeat=len(cards)):
+        hands = list(constraints.hands)
+        for card, owner in zip(cards, owners):
+            hands[owner] |= 1 << card
+        if _consistent(constraints, tuple(hands)):
+            deals.append(tuple(hands))
+    return deals
+
+
+class DescribeConstraints:
+    @given(
+        st.integers(min_value=0, max_value=10000),
+        st.integers(min_value=1, max_value=51),
+    )
+    @settings(max_examples=30, deadline=None)
+    def it_admits_the_actual_deal(self, seed: int, plays: int) -> None:
+        game, passed = _midgame(seed, plays)
+        constraints = Constraints.from_game_state(game, 0, passed)
+        actual = tuple(p.hand.mask for p in game.players)
+        assert _consistent(constraints, actual)
+
+    def it_knows_where_passed_cards_went(self) -> None:
+        game, passed = _midgame(3, 1)
+        constraints = Constraints.from_game_state(game, 0, passed)
+        assert constraints.known[1] == sum(1 << c.index for c in passed)
+
+
+class DescribeSampler:
+    def it_counts_consistent_deals(self) -> None:
+        constraints = _small()
+        sampler = Sampler.from_constraints(constraints)
+        assert count_deals(sampler) == len(_all_deals(constraints))
+
+    def it_samples_deals_uniformly(self) -> None:
+        constraints = _small()
+        deals = _all_deals(constraints)
+        sampler = Sampler.from_constraints(constraints)
+        random = Random(1)
+        drawn = Counter(sample_deal(sampler, random) for _ in range(4000))
+        batch = sample_deals(sampler, 4000, np.random.default_rng(1))
+        drawn_batch = Counter(tuple(int(m) for m in row) for row in batch)
+        for counts in (drawn, drawn_batch):
+            assert set(counts) == set(deals)
+            expected = 4000 / len(deals)
+            assert all(
+                abs(n - expected) < 0.3 * expected for n in counts.values()
+            )
+
+    @given(
+        st.integers(min_value=0, max_value=10000),
+        st.integers(min_value=20, max_value=45),
+    )
+    @settings(max_examples=20, deadline=None)
+    def it_only_draws_consistent_deals(self, seed: int, plays: int) -> None:
+        game, passed = _midgame(seed, plays)
+        player = game.current_player
+        constraints = Constraints.from_game_state(
+            game, player, passed if player == 0 else ()
+        )
+        sampler = Sampler.from_constraints(constraints)
+        assert count_deals(sampler) > 0
+        assert _consistent(constraints, sample_deal(sampler, Random(seed)))
+        batch = sample_deals(sampler, 50, np.random.default_rng(seed))
+        assert batch.shape == (50, 4)
+        for row in batch:
+            assert _consistent(constraints, tuple(int(m) for m in row))
+
+    def it_draws_consistent_deals_past_float_precision(self) -> None:
+        game, _ = _midgame(3, 1)
+        constraints = Constraints.from_game_state(game, game.current_player)
+        sampler = Sampler.from_constraints(constraints)
+        assert 2**53 < count_deals(sampler) < 2**63
+        batch = sample_deals(sampler, 50, np.random.default_rng(3))
+        for row in batch:
+            assert _consistent(constraints, tuple(int(m) for m in row))
@@ -0,0 +1,105 @@
+"""Duplicate evaluation: every player plays every seat of the same cards.
+
+The engine's Random is used only for dealing, so a game seed fixes the cards
+of every round whatever is played. Each deal is played four times with the
+lineup rotated one seat further each time; a player's deal score is its total
+over the four games. Card luck then cancels out of the difference between two
+players' deal scores.
+"""
+
+import math
+import pickle
+import statistics
+from collections.abc import Iterator
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import batched
+
+from hearts_engine import types as T
+from hearts_engine.player import Player
+
+from .tournament import game_seeds
+from .tournament import run_games
+
+
+@dataclass(frozen=True, slots=True)
+class DealResult:
+    """Scores of one deal, by lineup position, summed over the rotations."""
+
+    deal: int
+    seed: int
+    scores: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    """Mean paired score difference per game, with a confidence interval.
+
+    Negative means the first player scores fewer points (plays better).
+    """
+
+    deals: int
+    mean: float
+    stdev: float
+    low: float
+    high: float
+
+    @classmethod
+    def from_differences(
+        cls, differences: Sequence[float], confidence: float = 0.95
+    ) -> Comparison:
+        """Normal-approximation interval over per-deal differences."""
+        n = len(differences)
+        assert n >= 2, "need at least two deals"
+        mean = statistics.fmean(differences)
+        stdev = statistics.stdev(differences, mean)
+        z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+        half_width = z * stdev / math.sqrt(n)
+        return cls(
+            deals=n,
+            mean=mean,
+            stdev=stdev,
+            low=mean - half_width,
+            high=mean + half_width,
+        )
+
+
+def rotate(players: Sequence[Player], rotation: int) -> tuple[Player, ...]:
+    """Seat players[(s - rotation) % 4] in each seat s."""
+    return tuple(players[(seat - rotation) % 4] for seat in T.PLAYER_IDS)
+
+
+def run_duplicate(
+    players: Sequence[Player],
+    deals: int,
+    master_seed: int,
+    workers: int | None = None,
+) -> Iterator[DealResult]:
+    """Play each deal in all four rotations, yielding results in order."""
+    assert len(players) == 4, players
+    rotations = [pickle.dumps(rotate(players, r)) for r in range(4)]
+    seeds = game_seeds(master_seed, deals)
+    games = run_games(
+        rotations * deals, [s for s in seeds for _ in rotations], workers
+    )
+    for deal, (seed, results) in enumerate(zip(seeds, batched(games, 4))):
+        totals = [0, 0, 0, 0]
+        for rotation, result in enumerate(results):
+            for seat, score in enumerate(result.scores):
+                totals[(seat - rotation) % 4] += score
+        yield DealResult(deal=deal, seed=seed, scores=tuple(totals))
+
+
+def compare(
+    results: Sequence[DealResult],
+    a: int,
+    b: int | None = None,
+    confidence: float = 0.95,
+) -> Comparison:
+    """Compare lineup positions a and b (the mean of the others when None)."""
+    others = [b] if b is not None else [p for p in range(4) if p != a]
+    differences = [
+        (r.scores[a] - statistics.fmean(r.scores[o] for o in others)) / 4
+        for r in results
+    ]
+    return Comparison.from_differences(differences, confidence)
@@ -0,0 +1,80 @@
+"""Tests for duplicate evaluation."""
+
+import pickle
+from random import Random
+
+import pytest
+from hearts_engine.player import Player
+
+from .duplicate import Comparison
+from .duplicate import DealResult
+from .duplicate import compare
+from .duplicate import rotate
+from .duplicate import run_duplicate
+from .players import LowestCardPlayer
+from .players import RandomPlayer
+from .tournament import game_seeds
+from .tournament import load_players
+from .tournament import play_game
+
+
+class DescribeRotate:
+    def it_puts_every_player_in_every_seat(self) -> None:
+        lineup: list[Player] = [RandomPlayer(Random(i)) for i in range(4)]
+        for player in lineup:
+            seats = {rotate(lineup, r).index(player) for r in range(4)}
+            assert seats == {0, 1, 2, 3}
+
+
+class DescribeRunDuplicate:
+    def it_sums_each_players_scores_over_the_rotations(self) -> None:
+        lineup: list[Player] = [
+            LowestCardPlayer(),
+            RandomPlayer(Random(1)),
+            RandomPlayer(Random(2)),
+            RandomPlayer(Random(3)),
+        ]
+        (result,) = run_duplicate(lineup, 1, master_seed=5, workers=1)
+        (seed,) = game_seeds(5, 1)
+        assert result.seed == seed
+        expected = [0, 0, 0, 0]
+        for r in range(4):
+            # Fresh and reseeded, as each game is; game r of the first deal
+            seated = load_players(pickle.dumps(rotate(lineup, r)), seed, r)
+            state = play_game(seated, seed, game_id="0")
+            for seat, player in enumerate(state.players):
+                expected[(seat - r) % 4] += player.score
+        assert list(result.scores) == expected
+
+    def it_cancels_card_luck_between_identical_players(self) -> None:
+        lineup: list[Player] = [LowestCardPlayer()] * 4
+        results = list(run_duplicate(lineup, 6, master_seed=1, workers=2))
+        comparison = compare(results, 0)
+        assert comparison.mean == comparison.stdev == 0.0
+
+
+class DescribeCompare:
+    def it_compares_a_pair_of_positions(self) -> None:
+        results = [
+            DealResult(deal=0, seed=0, scores=(100, 140, 0, 0)),
+            DealResult(deal=1, seed=1, scores=(120, 140, 0, 0)),
+        ]
+        comparison = compare(results, 0, 1)
+        assert comparison.mean == -7.5
+        assert comparison.low < comparison.mean < comparison.high
+
+    def it_compares_against_the_others_by_default(self) -> None:
+        results = [
+            DealResult(deal=0, seed=0, scores=(100, 140, 160, 180)),
+            DealResult(deal=1, seed=1, scores=(200, 140, 160, 180)),
+        ]
+        assert compare(results, 0).mean == pytest.approx(-2.5)
+
+
+class DescribeComparison:
+    def it_widens_with_confidence(self) -> None:
+        differences = [1.0, -2.0, 3.0, 0.5, -1.0]
+        narrow = Comparison.from_differences(differences, 0.8)
+        wide = Comparison.from_differences(differences, 0.99)
+        assert narrow.mean == wide.mean == 0.3
+        assert wide.low < narrow.low < narrow.high < wide.high
@@ -0,0 +1,120 @@
+"""Fixed-length feature vectors of a player's view, for learned evaluators.
+
+encode_batch writes one row per (state, player) into a preallocated float
+array, so encoding many states allocates per batch, not per state. For each
+state it only collects a few card masks and numbers, in Python. All card
+masks of the batch are then unpacked into bits by one NumPy operation.
+
+Seats are relative to the viewer: seat 0 is the player, 1 the next to play
+after them, and so on. LAYOUT names the slice of each feature group.
+"""
+
+from collections.abc import Mapping
+from collections.abc import Sequence
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.card import Trick
+from hearts_engine.round import LOSING_SCORE
+from hearts_engine.state import GameState
+from numpy.typing import NDArray
+
+from .batch import ONE
+from .batch import SHIFTS
+
+Floats = NDArray[np.float32]
+
+# Card masks per state: own hand, then played by each seat, then the
+# current trick by each seat
+_MASKS = 9
+_GROUPS: tuple[tuple[str, int], ...] = (
+    ("hand", 52),
+    ("played", 4 * 52),
+    ("trick", 4 * 52),
+    ("voids", 4 * 4),  # seat by suit lane
+    ("points", 4),  # round points / 26
+    ("scores", 4),  # game scores / LOSING_SCORE
+    ("pass_direction", len(T.PassDirection)),
+    ("hearts_broken", 1),
+)
+
+
+def _layout() -> dict[str, slice]:
+    layout: dict[str, slice] = {}
+    start = 0
+    for name, width in _GROUPS:
+        layout[name] = slice(start, start + width)
+        start += width
+    return layout
+
+
+LAYOUT: Mapping[str, slice] = _layout()
+SIZE = sum(width for _, width in _GROUPS)
+_BITS = _MASKS * 52  # the leading features, all from card masks
+_DIRECTIONS = tuple(T.PassDirection)
+
+
+def encode(state: GameState, player: T.PlayerId) -> Floats:
+    """The player's view of the state as a (SIZE,) vector."""
+    return encode_batch([(state, player)], np.empty((1, SIZE), np.float32))[0]
+
+
+def encode_batch(
+    views: Sequence[tuple[GameState, T.PlayerId]], out: Floats
+) -> Floats:
+    """Encode each (state, player) into a row of out; returns those rows.
+
+    out must be (at least len(views), SIZE) and is overwritten row by row.
+    """
+    n = len(views)
+    assert out.shape[0] >= n and out.shape[1] == SIZE, out.shape
+    masks: list[int] = []
+    numbers: list[float] = []
+    for state, player in views:
+        _collect(state, player, masks, numbers)
+    bits = np.array(masks, dtype=np.uint64).reshape(n, _MASKS, 1)
+    rows = out[:n]
+    rows[:, :_BITS] = ((bits >> SHIFTS) & ONE).reshape(n, _BITS)
+    rows[:, _BITS:] = np.array(numbers, dtype=np.float32).reshape(n, -1)
+    return rows
+
+
+def _collect(
+    state: GameState,
+    player: T.PlayerId,
+    masks: list[int],
+    numbers: list[float],
+) -> None:
+    """Append the state's card masks and other features, in LAYOUT order."""
+    played = [0, 0, 0, 0]
+    voids = [0, 0, 0, 0]
+    for tricks in state.tricks_won:
+        for trick in tricks:
+            _add_trick(trick, player, played, voids)
+    current = [0, 0, 0, 0]
+    if state.trick is not None:
+        _add_trick(state.trick, player, played, voids)
+        for seat, card in state.trick.items():
+            current[(seat - player) % 4] |= 1 << card.index
+    masks.append(state.players[player].hand.mask)
+    masks.extend(played)
+    masks.extend(current)
+    for void in voids:
+        numbers.extend(float(void >> lane & 1) for lane in range(4))
+    seats = [state.players[(player + i) % 4] for i in range(4)]
+    numbers.extend(p.round_points / 26 for p in seats)
+    numbers.extend(p.score / LOSING_SCORE for p in seats)
+    direction = state.pass_direction
+    numbers.extend(float(d == direction) for d in _DIRECTIONS)
+    numbers.append(float(state.hearts_broken))
+
+
+def _add_trick(
+    trick: Trick, player: T.PlayerId, played: list[int], voids: list[int]
+) -> None:
+    lead_suit = trick.lead_suit
+    for seat, card in trick.items():
+        relative = (seat - player) % 4
+        played[relative] |= 1 << card.index
+        if lead_suit is not None and card.suit != lead_suit:
+            voids[relative] |= 1 << lead_suit.order
@@ -0,0 +1,81 @@
+"""Tests for the feature encoder."""
+
+from random import Random
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.rules import valid_actions_for_state
+from hearts_engine.state import GameState
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .batch import mask_bits
+from .features import LAYOUT
+from .features import SIZE
+from .features import encode
+from .features import encode_batch
+from .knowledge import Knowledge
+
+
+def _states(seed: int) -> list[GameState]:
+    """Every state of a random game's first round."""
+    random = Random(seed)
+    game = new_game(random)
+    states = [game]
+    while game.round_number == 0 and game.phase != T.Phase.GAME_END:
+        action = random.choice(valid_actions_for_state(game))
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+        states.append(game)
+    return states
+
+
+def _bits(mask: int) -> list[bool]:
+    return mask_bits(np.array([mask], dtype=np.uint64))[0].tolist()
+
+
+class DescribeEncode:
+    @given(
+        st.integers(min_value=0, max_value=10000),
+        st.integers(min_value=0, max_value=3),
+    )
+    @settings(max_examples=10, deadline=None)
+    def it_encodes_the_players_view(self, seed: int, player: int) -> None:
+        me = T.player_id(player)
+        for state in _states(seed):
+            features = encode(state, me)
+            assert features.shape == (SIZE,)
+            hand = features[LAYOUT["hand"]]
+            assert hand.tolist() == _bits(state.players[me].hand.mask)
+            points = features[LAYOUT["points"]] * 26
+            assert round(points[0]) == state.players[me].round_points
+            broken = features[LAYOUT["hearts_broken"]]
+            assert broken.tolist() == [state.hearts_broken]
+            if state.phase != T.Phase.PLAYING:
+                continue
+            knowledge = Knowledge.from_game_state(state, me)
+            played = features[LAYOUT["played"]].reshape(4, 52).any(axis=0)
+            assert played.tolist() == _bits(knowledge.played)
+            voids = features[LAYOUT["voids"]].reshape(4, 4)
+            for seat in range(4):
+                void = knowledge.voids[(seat + player) % 4]
+                assert voids[seat].tolist() == [
+                    void >> i & 1 for i in range(4)
+                ]
+
+
+class DescribeEncodeBatch:
+    def it_fills_the_given_rows_like_encode(self) -> None:
+        views: list[tuple[GameState, T.PlayerId]] = [
+            (s, T.player_id(i % 4)) for i, s in enumerate(_states(7))
+        ]
+        out = np.full((len(views) + 3, SIZE), -1.0, dtype=np.float32)
+        rows = encode_batch(views, out)
+        assert np.shares_memory(rows, out)
+        for row, (state, player) in zip(rows, views):
+            assert (row == encode(state, player)).all()
+        assert (out[len(views) :] == -1.0).all()
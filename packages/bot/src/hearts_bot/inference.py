@@ -0,0 +1,249 @@
+"""Batched decisions for many tables at once.
+
+A server filling seats with bots asks for one decision per call, and a
+model pays its per-call overhead every time. A DecisionQueue collects the
+pending decisions of all its tables instead: submit queues one player's
+hand, with their view of the state if there is one, and returns a Future.
+flush encodes every queued view with one encode_batch call and answers them
+with one call of the BatchModel for passes and one for plays, given the
+feature rows and the card masks in NumPy arrays. It then checks each answer
+against its request and resolves each Future with its own table's answer.
+
+BatchedPlayer is a Bot over a queue: a table thread asks for its action,
+waits up to the queue's linger time for other tables to join the batch,
+and flushes whatever is queued if no one has answered it by then. As a
+Player it has no state to encode, so it queues the hand alone.
+"""
+
+import threading
+from collections.abc import Iterable
+from collections.abc import Sequence
+from concurrent.futures import Future
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Protocol
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.cards import Cards
+from hearts_engine.cards import Hand
+from hearts_engine.cards import iter_mask
+from hearts_engine.rules import is_first_trick
+from hearts_engine.rules import valid_plays
+from hearts_engine.state import ChooseMoonOption
+from hearts_engine.state import GameState
+from hearts_engine.state import PlayCard
+from hearts_engine.state import PlayerAction
+from hearts_engine.state import SelectPass
+
+from .batch import LANES
+from .batch import RANKS
+from .batch import Ints
+from .batch import Masks
+from .batch import best_cards
+from .batch import mask_bits
+from .features import LAYOUT
+from .features import SIZE
+from .features import Floats
+from .features import encode_batch
+from .tournament import default_moon_choice
+
+
+class BatchModel(Protocol):
+    """Chooses for many players at once, from their views.
+
+    features holds a row of encode_batch's features per player, with the
+    player's hand (and valid plays) as card masks alongside. A player asked
+    without the state has only the hand features set.
+    """
+
+    def pass_cards(self, hands: Masks, features: Floats) -> Masks:
+        """Mask of three cards to pass from each hand."""
+        ...
+
+    def play_cards(self, hands: Masks, valid: Masks, features: Floats) -> Ints:
+        """A card index from each valid mask."""
+        ...
+
+
+# LowestCardPlayer's sort: by rank, ties by suit in card order
+_LOWEST_ORDER = (RANKS * 4 + LANES).astype(np.float64)
+
+
+@dataclass(frozen=True, slots=True)
+class LowestCardModel:
+    """LowestCardPlayer, for many hands at once."""
+
+    def pass_cards(self, hands: Masks, features: Floats) -> Masks:
+        return best_cards(hands, _LOWEST_ORDER, 3)
+
+    def play_cards(self, hands: Masks, valid: Masks, features: Floats) -> Ints:
+        keyed = np.where(mask_bits(valid), _LOWEST_ORDER, np.inf)
+        return keyed.argmin(axis=1)
+
+
+@dataclass(frozen=True, slots=True)
+class _Request:
+    hand: int
+    valid: int  # 0 for a pass
+    view: tuple[GameState, T.PlayerId] | None
+    future: Future[int]  # the card mask passed, or the card index played
+
+
+@dataclass(slots=True)
+class DecisionQueue:
+    """Decisions waiting for the next batch, shared by many tables."""
+
+    model: BatchModel
+    linger: float = 0.002  # seconds a caller waits for others to join
+    pending: list[_Request] = field(default_factory=list[_Request])
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def submit(
+    queue: DecisionQueue,
+    hand: int,
+    valid: int = 0,
+    view: tuple[GameState, T.PlayerId] | None = None,
+) -> Future[int]:
+    """Queue a decision for the hand: a play from valid, or a pass if 0.
+
+    view is the deciding player's (state, player), if known, for the
+    model's features.
+    """
+    future: Future[int] = Future()
+    with queue.lock:
+        queue.pending.append(_Request(hand, valid, view, future))
+    return future
+
+
+def flush(queue: DecisionQueue) -> int:
+    """Answer every queued decision in one batch; returns how many.
+
+    If the model fails, or answers the wrong number of rows, every
+    decision it has not answered fails with the error. An answer that is
+    not three cards of the hand, or a card of valid, fails its decision
+    alone with a ValueError.
+    """
+    with queue.lock:
+        requests, queue.pending = queue.pending, []
+    passes = [r for r in requests if not r.valid]
+    plays = [r for r in requests if r.valid]
+    try:
+        if passes:
+            hands, features = _inputs(passes)
+            _resolve(passes, queue.model.pass_cards(hands, features))
+        if plays:
+            hands, features = _inputs(plays)
+            valid = _masks(r.valid for r in plays)
+            _resolve(plays, queue.model.play_cards(hands, valid, features))
+    except Exception as e:
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(e)
+    return len(requests)
+
+
+def decide(
+    queue: DecisionQueue,
+    hand: int,
+    valid: int = 0,
+    view: tuple[GameState, T.PlayerId] | None = None,
+) -> int:
+    """Submit a decision and wait for it, flushing if no one else does."""
+    future = submit(queue, hand, valid, view)
+    wait([future], timeout=queue.linger)
+    if not future.done():
+        flush(queue)
+    # Or another thread's flush took the request and answers it
+    return future.result()
+
+
+@dataclass(frozen=True, slots=True)
+class BatchedPlayer:
+    """A Bot whose decisions go through a shared DecisionQueue."""
+
+    queue: DecisionQueue
+
+    def pass_cards(self, hand: Hand) -> tuple[T.Card, T.Card, T.Card]:
+        a, b, c = iter_mask(decide(self.queue, hand.mask))
+        return (a, b, c)
+
+    def play_card(self, hand: Hand, valid: Cards) -> T.Card:
+        return T.CARDS[decide(self.queue, hand.mask, valid.mask)]
+
+    def choose_action(self, state: GameState) -> PlayerAction:
+        player = state.current_player
+        hand = state.players[player].hand
+        match state.phase:
+            case T.Phase.PASSING:
+                view = (state, player)
+                a, b, c = iter_mask(decide(self.queue, hand.mask, view=view))
+                return SelectPass(cards=(a, b, c))
+            case T.Phase.PLAYING:
+                assert state.trick is not None
+                valid = valid_plays(
+                    hand,
+                    state.trick.lead_suit,
+                    is_first_trick(state.tricks_played),
+                    state.hearts_broken,
+                )
+                view = (state, player)
+                card = decide(self.queue, hand.mask, valid.mask, view)
+                return PlayCard(card=T.CARDS[card])
+            case T.Phase.ROUND_END:
+                return ChooseMoonOption(
+                    add_to_others=default_moon_choice(state)
+                )
+            case T.Phase.GAME_END:
+                raise AssertionError("Game is over")
+
+
+def _inputs(requests: Sequence[_Request]) -> tuple[Masks, Floats]:
+    """The hands and the feature rows of the requests' views.
+
+    A request without a view gets a row of only its hand's features.
+    """
+    hands = _masks(r.hand for r in requests)
+    features = np.zeros((len(requests), SIZE), np.float32)
+    seen = [i for i, r in enumerate(requests) if r.view is not None]
+    views = [r.view for r in requests if r.view is not None]
+    if views:
+        features[seen] = encode_batch(
+            views, np.empty((len(views), SIZE), np.float32)
+        )
+    blind = [i for i, r in enumerate(requests) if r.view is None]
+    features[blind, LAYOUT["hand"]] = mask_bits(hands[blind])
+    return hands, features
+
+
+def _masks(values: Iterable[int]) -> Masks:
+    return np.fromiter(values, dtype=np.uint64)
+
+
+def _resolve(requests: Sequence[_Request], answers: Masks | Ints) -> None:
+    if len(answers) != len(requests):
+        raise ValueError(
+            f"The model answered {len(answers)} of {len(requests)} requests"
+        )
+    for request, answer in zip(requests, answers.tolist()):
+        answer = int(answer)
+        error = _check(request, answer)
+        if error is None:
+            request.future.set_result(answer)
+        else:
+            request.future.set_exception(ValueError(error))
+
+
+def _check(request: _Request, answer: int) -> str | None:
+    """Why the answer is not a decision for the request, if it is not."""
+    if not request.valid:
+        if answer & ~request.hand or answer.bit_count() != 3:
+            return (
+                f"The model passed {answer:#x}, "
+                f"not 3 cards of the hand {request.hand:#x}"
+            )
+    elif not 0 <= answer < 52 or not request.valid >> answer & 1:
+        return f"The model played {answer}, not a card of {request.valid:#x}"
+    return None
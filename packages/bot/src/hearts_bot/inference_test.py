@@ -0,0 +1,202 @@
+"""Tests for batched decisions."""
+
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from random import Random
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.cards import Cards
+from hearts_engine.cards import Hand
+from hearts_engine.main import new_game
+from hearts_engine.state import GameState
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .batch import Ints
+from .batch import Masks
+from .batch import mask_bits
+from .features import LAYOUT
+from .features import SIZE
+from .features import Floats
+from .features import encode
+from .inference import BatchedPlayer
+from .inference import DecisionQueue
+from .inference import LowestCardModel
+from .inference import decide
+from .inference import flush
+from .inference import submit
+from .players import LowestCardPlayer
+from .tournament import play_game
+
+
+@dataclass(slots=True)
+class _Recording:
+    """LowestCardModel, recording the features of each batch."""
+
+    batches: list[Floats] = field(default_factory=list[Floats])
+
+    def pass_cards(self, hands: Masks, features: Floats) -> Masks:
+        self.batches.append(features)
+        return LowestCardModel().pass_cards(hands, features)
+
+    def play_cards(self, hands: Masks, valid: Masks, features: Floats) -> Ints:
+        self.batches.append(features)
+        return LowestCardModel().play_cards(hands, valid, features)
+
+
+class _Failing:
+    def pass_cards(self, hands: Masks, features: Floats) -> Masks:
+        raise ValueError("no model")
+
+    def play_cards(self, hands: Masks, valid: Masks, features: Floats) -> Ints:
+        raise ValueError("no model")
+
+
+class _Wrong:
+    """LowestCardModel, but answering the first request out of bounds."""
+
+    def pass_cards(self, hands: Masks, features: Floats) -> Masks:
+        answers = LowestCardModel().pass_cards(hands, features)
+        answers[0] &= answers[0] - 1  # two cards
+        return answers
+
+    def play_cards(self, hands: Masks, valid: Masks, features: Floats) -> Ints:
+        answers = LowestCardModel().play_cards(hands, valid, features)
+        answers[0] = 51 - answers[0]
+        return answers
+
+
+class _Short:
+    """Answers all but the last request."""
+
+    def pass_cards(self, hands: Masks, features: Floats) -> Masks:
+        return LowestCardModel().pass_cards(hands[:-1], features[:-1])
+
+    def play_cards(self, hands: Masks, valid: Masks, features: Floats) -> Ints:
+        return LowestCardModel().play_cards(
+            hands[:-1], valid[:-1], features[:-1]
+        )
+
+
+def _holding(state: GameState, masks: list[int]) -> GameState:
+    """The state with the seats dealt the masks instead."""
+    players = tuple(
+        replace(p, hand=Hand(Cards.from_mask(m)))
+        for p, m in zip(state.players, masks)
+    )
+    return replace(state, players=players)
+
+
+_START = new_game(Random(0), game_id="batched")
+_SUITS = [0b1111111111111 << 13 * i for i in range(4)]
+
+
+class DescribeBatchedPlayer:
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=5, deadline=None)
+    def it_plays_like_the_player_it_batches(self, seed: int) -> None:
+        queue = DecisionQueue(LowestCardModel(), linger=0.0)
+        batched = play_game([BatchedPlayer(queue)] * 4, seed)
+        expected = play_game([LowestCardPlayer()] * 4, seed)
+        assert batched.players == expected.players
+
+    def it_decides_from_the_players_view(self) -> None:
+        model = _Recording()
+        queue = DecisionQueue(model, linger=0.0)
+        player = _START.current_player
+        hand = _START.players[player].hand.mask
+        decide(queue, hand, view=(_START, player))
+        [features] = model.batches
+        assert (features == encode(_START, player)).all()
+
+    def it_decides_from_the_hand_alone_as_a_player(self) -> None:
+        model = _Recording()
+        batched = BatchedPlayer(DecisionQueue(model, linger=0.0))
+        hand = _START.players[T.player_id(0)].hand
+        valid = Cards.from_mask(hand.mask & _SUITS[0])
+        assert set(batched.pass_cards(hand)) == set(
+            LowestCardPlayer().pass_cards(hand)
+        )
+        assert batched.play_card(hand, valid) == LowestCardPlayer().play_card(
+            hand, valid
+        )
+        assert len(model.batches) == 2
+        for features in model.batches:
+            expected = np.zeros(SIZE, np.float32)
+            expected[LAYOUT["hand"]] = mask_bits(
+                np.array([hand.mask], np.uint64)
+            )[0]
+            assert (features == expected).all()
+
+
+class DescribeFlush:
+    def it_answers_passes_and_plays_in_order(self) -> None:
+        queue = DecisionQueue(LowestCardModel())
+        states = [_holding(_START, _SUITS[i:] + _SUITS[:i]) for i in range(3)]
+        player = T.player_id(0)
+        views: list[tuple[GameState, T.PlayerId]] = [
+            (state, player) for state in states
+        ]
+        hands = [state.players[0].hand.mask for state in states]
+        passes = [
+            submit(queue, hand, view=view) for hand, view in zip(hands, views)
+        ]
+        plays = [
+            submit(queue, hand, _SUITS[i], view)
+            for i, (hand, view) in enumerate(zip(hands, views))
+        ]
+        assert flush(queue) == 6
+        assert [f.result() for f in passes] == [
+            0b111 << 10 + 13 * i for i in range(3)
+        ]
+        assert [f.result() for f in plays] == [13 * i for i in range(3)]
+
+    def it_answers_every_table_in_one_call(self) -> None:
+        model = _Recording()
+        queue = DecisionQueue(model)
+        states = [
+            new_game(Random(seed), game_id="batched") for seed in range(4)
+        ]
+        futures = [
+            submit(
+                queue,
+                state.players[state.current_player].hand.mask,
+                view=(state, state.current_player),
+            )
+            for state in states
+        ]
+        flush(queue)
+        [features] = model.batches
+        assert features.shape == (4, SIZE)
+        for future, state in zip(futures, states):
+            hand = state.players[state.current_player].hand
+            cards = LowestCardPlayer().pass_cards(hand)
+            assert future.result() == sum(1 << c.index for c in cards)
+
+    def it_fails_every_request_when_the_model_fails(self) -> None:
+        queue = DecisionQueue(_Failing())
+        hand = _START.players[0].hand.mask
+        futures = [submit(queue, hand), submit(queue, hand, hand & -hand)]
+        flush(queue)
+        assert all(isinstance(f.exception(), ValueError) for f in futures)
+
+    def it_fails_every_request_when_the_model_answers_too_few(self) -> None:
+        queue = DecisionQueue(_Short())
+        hand = _START.players[0].hand.mask
+        futures = [submit(queue, hand) for _ in range(3)]
+        flush(queue)
+        assert all(isinstance(f.exception(0), ValueError) for f in futures)
+
+    def it_fails_only_the_requests_answered_out_of_bounds(self) -> None:
+        queue = DecisionQueue(_Wrong())
+        hands = [_SUITS[i] for i in range(2)]
+        passes = [submit(queue, hand) for hand in hands]
+        plays = [submit(queue, hand, hand) for hand in hands]
+        flush(queue)
+        for futures in passes, plays:
+            assert isinstance(futures[0].exception(0), ValueError)
+        assert passes[1].result(0) == 0b111 << 23
+        assert plays[1].result(0) == 13
@@ -0,0 +1,285 @@
+"""Information-set Monte Carlo tree search player.
+
+IsmctsPlayer searches one tree over its seat's information sets rather than
+one tree per sampled deal: each iteration samples a deal consistent with
+what the seat has seen, walks the tree choosing only among cards legal in
+that deal, adds one node, plays the rest of the round out with
+heuristic_card and credits every node on the path with the round score of
+the player who made its move. A node's availability counts the iterations
+in which its card could be played, and UCB uses that rather than its
+parent's visits.
+
+The tree is kept between the player's turns in a round. On its next turn
+the player re-roots at the node reached by its own card and the plays seen
+since, keeping the statistics gathered below it, so each decision starts
+from the previous search instead of from nothing.
+
+Nodes are mutated in place and live only inside the player, as SearchState
+lives only inside a search.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from random import Random
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.card import Trick
+from hearts_engine.cards import Cards
+from hearts_engine.cards import Hand
+from hearts_engine.search import SearchState
+from hearts_engine.search import is_round_over
+from hearts_engine.search import legal_moves
+from hearts_engine.search import make_move
+from hearts_engine.search import unmake_move
+from hearts_engine.solver import final_score
+from hearts_engine.state import ChooseMoonOption
+from hearts_engine.state import GameState
+from hearts_engine.state import PlayCard
+from hearts_engine.state import PlayerAction
+from hearts_engine.state import SelectPass
+
+from .deals import Constraints
+from .deals import Sampler
+from .deals import sample_deals
+from .pimc import Passed
+from .pimc import pass_by_danger
+from .pimc import passed_cards
+from .playout import heuristic_card
+from .tournament import default_moon_choice
+
+_BATCH = 256  # deals sampled at a time
+
+
+@dataclass(slots=True)
+class Node:
+    """Statistics for the card that leads to this node."""
+
+    mover: int  # seat that played the card
+    visits: int = 0
+    available: int = 0  # iterations in which the card was legal
+    total: int = 0  # mover's round scores, summed over visits
+    children: dict[T.CardIndex, Node] = field(
+        default_factory=dict[T.CardIndex, "Node"]
+    )
+
+
+@dataclass(slots=True)
+class Tree:
+    """A search tree rooted at one of the player's turns."""
+
+    root: Node
+    round_number: int
+    played: int  # mask of the cards played before the root
+    chosen: T.CardIndex = -1  # card the player then played
+
+
+@dataclass(slots=True)
+class IsmctsPlayer:
+    """Searches its information sets, reusing the tree within a round."""
+
+    seed: int = 0
+    budget: float = 5.0  # seconds per play
+    iterations: int | None = None  # stop after this many instead, if set
+    exploration: float = 0.7
+    tree: Tree | None = None
+    passed: Passed = (-1, ())  # the state forgets passes; the player must not
+    random: Random = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.random = Random(self.seed)
+
+    def reseed(self, seed: int) -> None:
+        self.random = Random(seed)
+        self.tree = None
+        self.passed = (-1, ())
+
+    def pass_cards(self, hand: Hand) -> tuple[T.Card, T.Card, T.Card]:
+        return pass_by_danger(hand)
+
+    def play_card(self, hand: Hand, valid: Cards) -> T.Card:
+        """Without the state there is nothing to search: play low."""
+        return min(valid, key=lambda card: card.rank.order)
+
+    def choose_action(self, state: GameState) -> PlayerAction:
+        match state.phase:
+            case T.Phase.PASSING:
+                hand = state.players[state.current_player].hand
+                cards = self.pass_cards(hand)
+                self.passed = (state.round_number, cards)
+                return SelectPass(cards=cards)
+            case T.Phase.PLAYING:
+                return PlayCard(card=T.CARDS[choose_card(self, state)])
+            case T.Phase.ROUND_END:
+                return ChooseMoonOption(
+                    add_to_others=default_moon_choice(state)
+                )
+            case T.Phase.GAME_END:
+                raise AssertionError("Game is over")
+
+
+def choose_card(player: IsmctsPlayer, state: GameState) -> T.CardIndex:
+    """Search from the re-rooted tree until the budget, then play."""
+    deadline = time.monotonic() + player.budget
+    tree = advance(player.tree, state)
+    search(
+        tree,
+        state,
+        player.random,
+        passed=passed_cards(player.passed, state),
+        deadline=deadline,
+        iterations=player.iterations,
+        exploration=player.exploration,
+    )
+    tree.chosen = best_card(tree)
+    player.tree = tree
+    return tree.chosen
+
+
+def advance(tree: Tree | None, state: GameState) -> Tree:
+    """The tree re-rooted at the state, or a new one if it cannot be.
+
+    The state must be the player's next turn in the round after the one the
+    tree was rooted at, so the plays between are the player's own card, the
+    rest of that trick, and the current trick so far.
+    """
+    assert state.trick is not None
+    played = _played(state)
+    if tree is None or tree.round_number != state.round_number:
+        return _new_tree(state, played)
+    done = next((t for t in _completed(state) if tree.chosen in t), None)
+    if done is None or not tree.root.children.get(tree.chosen):
+        return _new_tree(state, played)
+    since = [*_rest_of(done, tree.chosen), *_in_order(state.trick)]
+    expected = played & ~tree.played & ~(1 << tree.chosen)
+    if sum(1 << card for card in since) != expected:
+        return _new_tree(state, played)
+    node = tree.root.children[tree.chosen]
+    for card in since:
+        child = node.children.get(card)
+        if child is None:
+            return _new_tree(state, played)
+        node = child
+    return Tree(root=node, round_number=state.round_number, played=played)
+
+
+def search(
+    tree: Tree,
+    state: GameState,
+    random: Random,
+    passed: tuple[T.Card, ...] = (),
+    deadline: float | None = None,
+    iterations: int | None = None,
+    exploration: float = 0.7,
+) -> int:
+    """Grow the tree until the deadline or iteration count; anytime.
+
+    passed is the cards the player passed this round, if any. Runs at
+    least one iteration and returns the number run. best_card may be
+    called after any number of them.
+    """
+    assert deadline is not None or iterations is not None
+    player = state.current_player
+    sampler = Sampler.from_constraints(
+        Constraints.from_game_state(state, player, passed)
+    )
+    rng = np.random.default_rng(random.getrandbits(64))
+    s = SearchState.from_game_state(state)
+    done = 0
+    while True:
+        for hands in sample_deals(sampler, _BATCH, rng):
+            s.hands = [int(hand) for hand in hands]
+            _iterate(tree.root, s, random, exploration)
+            done += 1
+            if iterations is not None and done >= iterations:
+                return done
+            if deadline is not None and time.monotonic() > deadline:
+                return done
+
+
+def best_card(tree: Tree) -> T.CardIndex:
+    """The most visited card at the root."""
+    children = tree.root.children
+    return max(children, key=lambda card: children[card].visits)
+
+
+def _iterate(
+    root: Node, s: SearchState, random: Random, exploration: float
+) -> None:
+    """One iteration on a determinized SearchState, left unchanged."""
+    path = [root]
+    node = root
+    while not is_round_over(s):
+        legal = legal_moves(s)
+        untried: list[T.CardIndex] = []
+        best = -1
+        best_value = -math.inf
+        rest = legal
+        while rest:
+            low = rest & -rest
+            rest ^= low
+            card = low.bit_length() - 1
+            child = node.children.get(card)
+            if child is None:
+                untried.append(card)
+                continue
+            child.available += 1
+            value = (
+                1
+                - child.total / (26 * child.visits)
+                + exploration
+                * (math.sqrt(math.log(child.available) / child.visits))
+            )
+            if value > best_value:
+                best, best_value = card, value
+        if untried:
+            card = random.choice(untried)
+            child = node.children[card] = Node(mover=s.current, available=1)
+            make_move(s, card)
+            path.append(child)
+            break
+        make_move(s, best)
+        node = node.children[best]
+        path.append(node)
+    depth = len(path) - 1
+    while not is_round_over(s):
+        make_move(s, heuristic_card(s))
+        depth += 1
+    scores = [final_score(s, seat) for seat in range(4)]
+    for _ in range(depth):
+        unmake_move(s)
+    for node in path:
+        node.visits += 1
+        node.total += scores[node.mover]
+
+
+def _new_tree(state: GameState, played: int) -> Tree:
+    root = Node(mover=(state.current_player + 3) % 4)
+    return Tree(root=root, round_number=state.round_number, played=played)
+
+
+def _played(state: GameState) -> int:
+    played = 0
+    for trick in _completed(state):
+        for card in trick:
+            played |= 1 << card
+    assert state.trick is not None
+    for card in _in_order(state.trick):
+        played |= 1 << card
+    return played
+
+
+def _completed(state: GameState) -> list[list[T.CardIndex]]:
+    """Cards of each completed trick this round, each from the lead."""
+    return [_in_order(t) for tricks in state.tricks_won for t in tricks]
+
+
+def _in_order(trick: Trick) -> list[T.CardIndex]:
+    cards = (trick[T.player_id(trick.lead + i)] for i in range(4))
+    return [card.index for card in cards if card is not None]
+
+
+def _rest_of(trick: list[T.CardIndex], card: T.CardIndex) -> list[T.CardIndex]:
+    return trick[trick.index(card) + 1 :]
@@ -0,0 +1,102 @@
+"""Tests for the ISMCTS player."""
+
+import dataclasses
+from random import Random
+
+from hearts_engine import types as T
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.rules import valid_actions_for_state
+from hearts_engine.search import SearchState
+from hearts_engine.search import legal_moves
+from hearts_engine.state import GameState
+from hearts_engine.state import PlayCard
+from hearts_engine.state import SelectPass
+
+from .ismcts import IsmctsPlayer
+from .ismcts import Node
+from .ismcts import advance
+from .ismcts import best_card
+from .ismcts import search
+from .pimc import passed_cards
+from .players import LowestCardPlayer
+from .tournament import Bot
+from .tournament import play_game
+
+
+def _playing(seed: int, plays: int) -> GameState:
+    """A random game `plays` cards into its first round."""
+    random = Random(seed)
+    game = new_game(random)
+    while plays or game.phase != T.Phase.PLAYING:
+        if game.phase == T.Phase.PLAYING:
+            plays -= 1
+        action = random.choice(valid_actions_for_state(game))
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+    return game
+
+
+def _play(state: GameState, card: T.CardIndex) -> GameState:
+    result = apply_action(state, PlayCard(card=T.CARDS[card]), Random(0))
+    assert isinstance(result, T.ActionSuccess), result
+    return result.new_state
+
+
+class DescribeIsmctsPlayer:
+    def it_is_a_bot(self) -> None:
+        assert isinstance(IsmctsPlayer(), Bot)
+
+    def it_plays_a_whole_game(self) -> None:
+        ismcts = IsmctsPlayer(iterations=20)
+        state = play_game([ismcts, *[LowestCardPlayer()] * 3], seed=3)
+        assert state.phase == T.Phase.GAME_END
+
+    def it_remembers_its_pass_for_the_round(self) -> None:
+        ismcts = IsmctsPlayer(iterations=1)
+        state = new_game(Random(2))
+        action = ismcts.choose_action(state)
+        assert isinstance(action, SelectPass)
+        assert passed_cards(ismcts.passed, state) == action.cards
+        ismcts.reseed(1)
+        assert passed_cards(ismcts.passed, state) == ()
+
+
+class DescribeSearch:
+    def it_has_a_legal_answer_after_any_iteration(self) -> None:
+        state = _playing(2, 5)
+        tree = advance(None, state)
+        legal = legal_moves(SearchState.from_game_state(state))
+        for _ in range(3):
+            assert search(tree, state, Random(1), iterations=1) == 1
+            assert legal >> best_card(tree) & 1
+
+
+class DescribeAdvance:
+    def it_re_roots_at_the_plays_since_its_turn(self) -> None:
+        state = _playing(6, 36)
+        me = state.current_player
+        tree = advance(None, state)
+        search(tree, state, Random(1), iterations=3000)
+        tree.chosen = best_card(tree)
+        node = tree.root
+        card = tree.chosen
+        while True:
+            node = node.children[card]
+            state = _play(state, card)
+            if state.current_player == me:
+                break
+            legal = legal_moves(SearchState.from_game_state(state))
+            card = next(c for c in node.children if legal >> c & 1)
+        advanced = advance(tree, state)
+        assert advanced.root is node
+        assert advanced.root.visits > 0
+
+    def it_starts_over_in_a_new_round(self) -> None:
+        state = _playing(6, 36)
+        tree = advance(None, state)
+        search(tree, state, Random(1), iterations=100)
+        tree.chosen = best_card(tree)
+        later = dataclasses.replace(state, round_number=1)
+        assert advance(tree, later).root == Node(mover=tree.root.mover)
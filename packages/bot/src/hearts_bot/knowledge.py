@@ -0,0 +1,186 @@
+"""What one seat has seen this round, kept up to date play by play.
+
+Counting bots ask the same questions every decision: which cards have gone,
+who is void in what, has the queen of spades been played, how many points
+each player has. Rescanning tricks_won answers them in time linear in the
+round; Knowledge answers them from masks and tuples kept current by
+observe_pass and observe_play, each a constant amount of work.
+
+Knowledge is immutable, so a snapshot is the object itself: a search keeps
+the one it started from and goes back to it by reference, with no copying.
+"""
+
+from dataclasses import dataclass
+from dataclasses import replace
+from typing import Self
+
+from hearts_engine import types as T
+from hearts_engine.cards import FULL_MASK
+from hearts_engine.cards import cards_mask
+from hearts_engine.search import POINTS
+from hearts_engine.solver import HEARTS_MASK
+from hearts_engine.solver import QS
+from hearts_engine.state import GameState
+from hearts_engine.state import pass_target
+
+
+@dataclass(frozen=True, slots=True)
+class Knowledge:
+    """One seat's view of the round so far."""
+
+    player: T.PlayerId
+    round_number: int
+    hand: int  # the player's own cards
+    played: int  # cards played this round, the current trick included
+    voids: tuple[int, ...]  # per seat, bit per suit lane shown void
+    sizes: tuple[int, ...]  # hand size per seat
+    points: tuple[int, ...]  # round points taken per seat
+    passed: int  # cards the player passed and has not seen played since
+    passed_to: T.PlayerId | None  # who they went to; None before passing
+    trick: tuple[T.CardIndex, ...]  # the current trick, from the lead
+    lead: T.PlayerId  # leader of the current trick, once anyone has played
+
+    @classmethod
+    def for_round(
+        cls, player: T.PlayerId, hand: int, round_number: int
+    ) -> Self:
+        """A fresh view from the dealt hand, before any passing or play."""
+        return cls(
+            player=player,
+            round_number=round_number,
+            hand=hand,
+            played=0,
+            voids=(0, 0, 0, 0),
+            sizes=(13, 13, 13, 13),
+            points=(0, 0, 0, 0),
+            passed=0,
+            passed_to=None,
+            trick=(),
+            lead=player,
+        )
+
+    @classmethod
+    def from_game_state(
+        cls,
+        state: GameState,
+        player: T.PlayerId,
+        passed: tuple[T.Card, ...] = (),
+    ) -> Knowledge:
+        """The view of a playing-phase state, rebuilt from its tricks.
+
+        For joining a round already under way; passed is the three cards
+        the player passed this round, if any.
+        """
+        assert state.trick is not None
+        knowledge = cls.for_round(
+            player, state.players[player].hand.mask, state.round_number
+        )
+        if passed:
+            target = pass_target(player, state.pass_direction)
+            knowledge = replace(
+                knowledge, passed=cards_mask(passed), passed_to=target
+            )
+        # tricks_won loses the order of play, which none of the counts need
+        tricks = [t for tricks in state.tricks_won for t in tricks]
+        for trick in [*tricks, state.trick]:
+            for i in range(len(trick)):
+                seat = T.player_id(trick.lead + i)
+                card = trick[seat]
+                assert card is not None
+                knowledge = _play(knowledge, seat, card.index)
+        return replace(
+            knowledge,
+            hand=state.players[player].hand.mask,
+            lead=state.trick.lead,
+        )
+
+
+def observe_pass(
+    knowledge: Knowledge,
+    direction: T.PassDirection,
+    passed: tuple[T.Card, ...],
+    received: tuple[T.Card, ...],
+) -> Knowledge:
+    """The view after the player passes three cards and receives three."""
+    if direction == T.PassDirection.HOLD:
+        return knowledge
+    gone = cards_mask(passed)
+    return replace(
+        knowledge,
+        hand=knowledge.hand & ~gone | cards_mask(received),
+        passed=gone,
+        passed_to=pass_target(knowledge.player, direction),
+    )
+
+
+def observe_play(
+    knowledge: Knowledge, seat: T.PlayerId, card: T.CardIndex
+) -> Knowledge:
+    """The view after a seat plays a card, completing the trick if fourth."""
+    knowledge = _play(knowledge, seat, card)
+    if seat == knowledge.player:
+        knowledge = replace(knowledge, hand=knowledge.hand & ~(1 << card))
+    return knowledge
+
+
+def is_void(knowledge: Knowledge, seat: T.PlayerId, suit: T.Suit) -> bool:
+    """Whether the seat has shown it holds no cards of the suit."""
+    return bool(knowledge.voids[seat] >> suit.order & 1)
+
+
+def is_played(knowledge: Knowledge, card: T.CardIndex) -> bool:
+    return bool(knowledge.played >> card & 1)
+
+
+def queen_played(knowledge: Knowledge) -> bool:
+    return is_played(knowledge, QS)
+
+
+def hearts_broken(knowledge: Knowledge) -> bool:
+    return bool(knowledge.played & HEARTS_MASK)
+
+
+def unseen(knowledge: Knowledge) -> int:
+    """Mask of the cards in the other hands."""
+    return FULL_MASK & ~knowledge.hand & ~knowledge.played
+
+
+def known_cards(knowledge: Knowledge, seat: T.PlayerId) -> int:
+    """Mask of the unseen cards the player knows the seat holds."""
+    if seat != knowledge.passed_to:
+        return 0
+    return knowledge.passed
+
+
+def _play(
+    knowledge: Knowledge, seat: T.PlayerId, card: T.CardIndex
+) -> Knowledge:
+    trick = knowledge.trick
+    lead = knowledge.lead if trick else seat
+    voids = knowledge.voids
+    if trick and card // 13 != trick[0] // 13:
+        lane = 1 << trick[0] // 13
+        voids = tuple(
+            v | lane if s == seat else v for s, v in enumerate(voids)
+        )
+    sizes = tuple(n - (s == seat) for s, n in enumerate(knowledge.sizes))
+    trick = (*trick, card)
+    points = knowledge.points
+    if len(trick) == 4:
+        lane = trick[0] // 13
+        best = max(c for c in trick if c // 13 == lane)
+        winner = (lead + trick.index(best)) % 4
+        taken = sum(POINTS[c] for c in trick)
+        points = tuple(p + taken * (s == winner) for s, p in enumerate(points))
+        lead = T.player_id(winner)
+        trick = ()
+    return replace(
+        knowledge,
+        played=knowledge.played | 1 << card,
+        voids=voids,
+        sizes=sizes,
+        points=points,
+        passed=knowledge.passed & ~(1 << card),
+        trick=trick,
+        lead=lead,
+    )
@@ -0,0 +1,104 @@
+"""Tests for the incremental knowledge of a seat."""
+
+from random import Random
+
+from hearts_engine import types as T
+from hearts_engine.cards import Cards
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.rules import valid_actions_for_state
+from hearts_engine.solver import QS
+from hearts_engine.state import GameState
+from hearts_engine.state import PlayCard
+from hearts_engine.state import SelectPass
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .deals import Constraints
+from .knowledge import Knowledge
+from .knowledge import hearts_broken
+from .knowledge import is_void
+from .knowledge import observe_pass
+from .knowledge import observe_play
+from .knowledge import queen_played
+
+_ME = T.player_id(0)
+
+
+def _first_round(seed: int) -> list[tuple[GameState, Knowledge]]:
+    """Each playing state of a random first round, with seat 0's view."""
+    random = Random(seed)
+    game = new_game(random)
+    knowledge = Knowledge.for_round(_ME, game.players[_ME].hand.mask, 0)
+    passed: tuple[T.Card, ...] = ()
+    seen: list[tuple[GameState, Knowledge]] = []
+    while game.round_number == 0 and game.phase != T.Phase.GAME_END:
+        action = random.choice(valid_actions_for_state(game))
+        if isinstance(action, SelectPass) and game.current_player == _ME:
+            passed = action.cards
+        if isinstance(action, PlayCard):
+            seat = game.current_player
+            knowledge = observe_play(knowledge, seat, action.card.index)
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        if game.phase == T.Phase.PASSING != result.new_state.phase:
+            before = game.players[_ME].hand - Cards(passed)
+            received = result.new_state.players[_ME].hand - before
+            knowledge = observe_pass(
+                knowledge, game.pass_direction, passed, tuple(received)
+            )
+        game = result.new_state
+        if game.phase == T.Phase.PLAYING:
+            seen.append((game, knowledge))
+    return seen
+
+
+class DescribeKnowledge:
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=None)
+    def it_agrees_with_the_state_after_every_play(self, seed: int) -> None:
+        for state, knowledge in _first_round(seed):
+            assert knowledge.hand == state.players[_ME].hand.mask
+            assert knowledge.points == state.round_points
+            assert hearts_broken(knowledge) == state.hearts_broken
+            assert state.trick is not None
+            if knowledge.played:
+                assert knowledge.lead == state.trick.lead
+            queen = any(
+                card.index == QS
+                for tricks in [*state.tricks_won, [state.trick]]
+                for trick in tricks
+                for card in trick.values()
+            )
+            assert queen_played(knowledge) == queen
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=None)
+    def it_gives_the_same_constraints_as_a_rescan(self, seed: int) -> None:
+        for state, knowledge in _first_round(seed):
+            passed = tuple(
+                T.CARDS[c] for c in range(52) if knowledge.passed >> c & 1
+            )
+            rescan = Constraints.from_game_state(state, _ME, passed)
+            assert Constraints.from_knowledge(knowledge) == rescan
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=None)
+    def it_can_be_rebuilt_from_a_state(self, seed: int) -> None:
+        for state, knowledge in _first_round(seed)[::7]:
+            rebuilt = Knowledge.from_game_state(state, _ME)
+            assert rebuilt.played == knowledge.played
+            assert rebuilt.voids == knowledge.voids
+            assert rebuilt.points == knowledge.points
+            assert rebuilt.trick == knowledge.trick
+
+
+class DescribeIsVoid:
+    def it_marks_a_seat_that_does_not_follow(self) -> None:
+        knowledge = Knowledge.for_round(_ME, 0, 0)
+        knowledge = observe_play(knowledge, T.player_id(1), 0)  # 2 of clubs
+        knowledge = observe_play(knowledge, T.player_id(2), 20)  # a diamond
+        assert is_void(knowledge, T.player_id(2), T.Suit.CLUBS)
+        assert not is_void(knowledge, T.player_id(2), T.Suit.DIAMONDS)
+        assert not is_void(knowledge, T.player_id(1), T.Suit.CLUBS)
@@ -0,0 +1,216 @@
+"""Pass selection by racing the candidate passes through simulated rounds.
+
+A pass is scored by the player's mean round score over simulated rounds:
+the other 39 cards are dealt at random, every other seat passes and plays
+with a batch policy (HeuristicPolicy by default), and the player passes
+the candidate and then plays with the same policy. Candidates in the same
+stage share their deals, so their differences are not swamped by the luck
+of the deal.
+
+All C(13,3) = 286 passes start, but few get many rounds: successive
+halving evaluates every survivor on a stage's fresh deals, keeps the better
+half by mean over all deals so far, and doubles the deals for the next
+stage. The rounds of a stage are played in batches of a few candidates,
+each with its own random stream, and spread over a process pool when
+workers > 1.
+"""
+
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.cards import iter_mask
+from hearts_engine.state import GameState
+
+from .batch import ONE
+from .batch import BatchPolicy
+from .batch import Bools
+from .batch import Ints
+from .batch import Masks
+from .batch import Table
+from .batch import play_round
+from .batch_policies import HeuristicPolicy
+from .tournament import shared_pool
+
+_FIRST_DEALS = 16  # deals per candidate in the first stage
+_BLOCK = 64  # candidates per batch and per random stream
+
+
+@dataclass(frozen=True, slots=True)
+class _Passing:
+    """A batch policy whose seat passes the given mask in each row."""
+
+    policy: BatchPolicy
+    seat: int
+    passes: Masks  # by row of the batch
+
+    def pass_cards(
+        self,
+        table: Table,
+        direction: T.PassDirection,
+        rng: np.random.Generator,
+    ) -> Masks:
+        if table.current[0] == self.seat:
+            return self.passes[table.games]
+        return self.policy.pass_cards(table, direction, rng)
+
+    def play_cards(
+        self, table: Table, legal: Masks, rng: np.random.Generator
+    ) -> Ints:
+        return self.policy.play_cards(table, legal, rng)
+
+    def add_to_others(self, table: Table, rng: np.random.Generator) -> Bools:
+        return self.policy.add_to_others(table, rng)
+
+
+def choose_pass(
+    state: GameState,
+    seed: int = 0,
+    first_deals: int = _FIRST_DEALS,
+    workers: int = 1,
+) -> tuple[T.Card, T.Card, T.Card]:
+    """The current player's best pass at a passing-phase state.
+
+    The deals are seeded from what the player can see, not the state's
+    key, which hashes the hands it cannot.
+    """
+    player = state.current_player
+    hand = state.players[player].hand.mask
+    ranked = race_passes(
+        hand,
+        player,
+        state.round_number,
+        tuple(p.score for p in state.players),
+        np.random.default_rng([seed, state.round_number, player, hand]),
+        first_deals=first_deals,
+        workers=workers,
+    )
+    a, b, c = iter_mask(ranked[0][0])
+    return (a, b, c)
+
+
+def race_passes(
+    hand: int,
+    player: int,
+    round_number: int,
+    scores: tuple[int, ...],
+    rng: np.random.Generator,
+    first_deals: int = _FIRST_DEALS,
+    workers: int = 1,
+    policy: BatchPolicy | None = None,
+) -> list[tuple[int, float]]:
+    """(pass mask, mean round score) of the final survivors, best first.
+
+    The round number sets the pass direction, which must not be HOLD.
+    """
+    cards = [1 << card.index for card in iter_mask(hand)]
+    candidates = [a | b | c for a, b, c in itertools.combinations(cards, 3)]
+    totals = dict.fromkeys(candidates, 0.0)
+    played = 0
+    deals = first_deals
+    while True:
+        hands = deal_others(hand, player, deals, rng)
+        points = evaluate_passes(
+            np.array(candidates, dtype=np.uint64),
+            hands,
+            player,
+            round_number,
+            np.array(scores, dtype=np.int64),
+            int(rng.integers(1 << 62)),
+            workers,
+            policy or HeuristicPolicy(),
+        )
+        for candidate, total in zip(candidates, points.tolist()):
+            totals[candidate] += total
+        played += deals
+        candidates.sort(key=lambda candidate: totals[candidate])
+        if len(candidates) <= 2:
+            return [(c, totals[c] / played) for c in candidates]
+        candidates = candidates[: (len(candidates) + 1) // 2]
+        deals *= 2
+
+
+def deal_others(
+    hand: int, player: int, n: int, rng: np.random.Generator
+) -> Masks:
+    """n random deals, as (n, 4) masks, of the other cards around a hand."""
+    others = np.array(
+        [card.index for card in iter_mask(((1 << 52) - 1) & ~hand)],
+        dtype=np.uint64,
+    )
+    shuffled = others[np.argsort(rng.random((n, len(others))), axis=1)]
+    bits = ONE << shuffled
+    hands = np.zeros((n, 4), dtype=np.uint64)
+    hands[:, player] = hand
+    for i in range(1, 4):
+        group = bits[:, 13 * (i - 1) : 13 * i]
+        hands[:, (player + i) % 4] = np.bitwise_or.reduce(group, axis=1)
+    return hands
+
+
+def evaluate_passes(
+    candidates: Masks,
+    hands: Masks,
+    player: int,
+    round_number: int,
+    scores: Ints,
+    seed: int,
+    workers: int,
+    policy: BatchPolicy,
+) -> Ints:
+    """Each candidate's summed round score over the deals.
+
+    Every candidate is played out on every deal: one batch row per pair.
+    Candidates go in blocks of _BLOCK, each a batch with its own stream
+    spawned from the seed, so the sums do not depend on the worker count
+    even with a random policy.
+    """
+    blocks = [
+        candidates[i : i + _BLOCK] for i in range(0, len(candidates), _BLOCK)
+    ]
+    streams = np.random.SeedSequence(seed).spawn(len(blocks))
+    if workers == 1:
+        return np.concatenate([
+            _evaluate(
+                block, hands, player, round_number, scores, stream, policy
+            )
+            for block, stream in zip(blocks, streams)
+        ])
+    futures = [
+        shared_pool(workers).submit(
+            _evaluate,
+            block,
+            hands,
+            player,
+            round_number,
+            scores,
+            stream,
+            policy,
+        )
+        for block, stream in zip(blocks, streams)
+    ]
+    return np.concatenate([future.result() for future in futures])
+
+
+def _evaluate(
+    candidates: Masks,
+    hands: Masks,
+    player: int,
+    round_number: int,
+    scores: Ints,
+    stream: np.random.SeedSequence,
+    policy: BatchPolicy,
+) -> Ints:
+    k, n = len(candidates), len(hands)
+    rows = np.arange(k * n)
+    passing = _Passing(policy, player, np.repeat(candidates, n))
+    points = play_round(
+        rows,
+        round_number,
+        np.tile(hands, (k, 1)),
+        np.tile(scores, (k * n, 1)),
+        [passing] * 4,
+        np.random.default_rng(stream),
+    )
+    return points[:, player].reshape(k, n).sum(axis=1)
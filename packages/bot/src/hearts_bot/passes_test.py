@@ -0,0 +1,107 @@
+"""Tests for pass selection."""
+
+import itertools
+from dataclasses import replace
+from random import Random
+
+import numpy as np
+from hearts_engine.cards import cards_mask
+from hearts_engine.cards import iter_mask
+from hearts_engine.main import new_game
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .batch_policies import HeuristicPolicy
+from .batch_policies import RandomPolicy
+from .passes import choose_pass
+from .passes import deal_others
+from .passes import evaluate_passes
+from .passes import race_passes
+from .pimc import pass_by_danger
+
+
+class DescribeChoosePass:
+    def it_passes_three_cards_from_the_hand(self) -> None:
+        state = new_game(Random(3))
+        passed = choose_pass(state, first_deals=2)
+        assert set(passed) <= set(state.players[0].hand)
+        assert len(set(passed)) == 3
+
+    def it_does_not_depend_on_the_hidden_hands(self) -> None:
+        state = new_game(Random(3))
+        a, b, c, d = state.players
+        swapped = replace(
+            state,
+            players=(a, replace(b, hand=c.hand), replace(c, hand=b.hand), d),
+        )
+        assert choose_pass(swapped, first_deals=2) == choose_pass(
+            state, first_deals=2
+        )
+
+    def it_beats_passing_by_danger_on_fresh_deals(self) -> None:
+        state = new_game(Random(1))
+        hand = state.players[0].hand
+        raced = cards_mask(choose_pass(state, first_deals=4))
+        danger = cards_mask(pass_by_danger(hand))
+        hands = deal_others(hand.mask, 0, 500, np.random.default_rng(9))
+        raced_points, danger_points = evaluate_passes(
+            np.array([raced, danger], dtype=np.uint64),
+            hands,
+            0,
+            0,
+            np.zeros(4, dtype=np.int64),
+            seed=0,
+            workers=1,
+            policy=HeuristicPolicy(),
+        ).tolist()
+        assert raced_points < danger_points
+
+
+class DescribeEvaluatePasses:
+    def it_does_not_depend_on_the_worker_count(self) -> None:
+        hand = new_game(Random(6)).players[1].hand.mask
+        cards = [1 << card.index for card in iter_mask(hand)]
+        candidates = np.array(
+            [a | b | c for a, b, c in itertools.combinations(cards, 3)],
+            dtype=np.uint64,
+        )
+        hands = deal_others(hand, 1, 4, np.random.default_rng(0))
+        sums = [
+            evaluate_passes(
+                candidates,
+                hands,
+                1,
+                0,
+                np.zeros(4, dtype=np.int64),
+                seed=0,
+                workers=workers,
+                policy=RandomPolicy(),
+            ).tolist()
+            for workers in (1, 3)
+        ]
+        assert sums[0] == sums[1]
+
+
+class DescribeRacePasses:
+    def it_does_not_depend_on_the_worker_count(self) -> None:
+        hand = new_game(Random(5)).players[2].hand.mask
+        inline = race_passes(
+            hand, 2, 1, (0, 0, 0, 0), np.random.default_rng(0)
+        )
+        pooled = race_passes(
+            hand, 2, 1, (0, 0, 0, 0), np.random.default_rng(0), workers=2
+        )
+        assert inline == pooled
+        assert len(inline) == 2
+
+
+class DescribeDealOthers:
+    @given(st.integers(min_value=0, max_value=3), st.integers())
+    @settings(max_examples=20, deadline=None)
+    def it_deals_the_other_cards_13_each(self, player: int, seed: int) -> None:
+        hand = new_game(Random(seed)).players[player].hand.mask
+        hands = deal_others(hand, player, 5, np.random.default_rng(0))
+        assert (hands[:, player] == hand).all()
+        assert (np.bitwise_count(hands) == 13).all()
+        assert (np.bitwise_or.reduce(hands, axis=1) == (1 << 52) - 1).all()
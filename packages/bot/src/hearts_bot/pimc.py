@@ -0,0 +1,211 @@
+"""Perfect-information Monte Carlo player (bot level 070).
+
+For each play, PimcPlayer samples deals of the unseen cards consistent with
+what its seat has seen, plays every legal card out in every deal as if all
+hands were known, and picks the card with the lowest mean round score.
+Deals with few cards left are solved exactly by the double-dummy solver;
+earlier ones are played out in batches by the playout kernel, with
+HeuristicPolicy for every seat.
+
+Deals are spread over a process pool when workers > 1, and evaluation stops
+at the per-play time budget with whatever deals are done. Decisions depend
+only on the player's seed and what its seat has seen, not on the pool or
+the clock, unless the budget runs out first.
+"""
+
+import time
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+from dataclasses import dataclass
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.cards import Cards
+from hearts_engine.cards import Hand
+from hearts_engine.search import SearchState
+from hearts_engine.search import legal_moves
+from hearts_engine.search import make_move
+from hearts_engine.search import unmake_move
+from hearts_engine.solver import QS
+from hearts_engine.solver import Table
+from hearts_engine.solver import move_values
+from hearts_engine.state import ChooseMoonOption
+from hearts_engine.state import GameState
+from hearts_engine.state import PlayCard
+from hearts_engine.state import PlayerAction
+from hearts_engine.state import SelectPass
+from numpy.typing import NDArray
+
+from .batch import Masks
+from .batch_policies import HeuristicPolicy
+from .deals import Constraints
+from .deals import Sampler
+from .deals import sample_deals
+from .playout import playouts
+from .tournament import default_moon_choice
+from .tournament import shared_pool
+
+# Pass danger by card index: the queen and the spades above her, then rank
+_PASS_ORDER = tuple(
+    (c.index in (QS, QS + 1, QS + 2), c.rank.order) for c in T.CARDS
+)
+_BATCH = 256  # deals played out at a time
+
+# (round number, cards) of a player's last pass
+Passed = tuple[int, tuple[T.Card, ...]]
+
+
+@dataclass(slots=True)
+class PimcPlayer:
+    """Samples deals and plays each legal card out in all of them."""
+
+    seed: int = 0
+    deals: int = 1000  # deals sampled per play
+    budget: float = 5.0  # seconds per play
+    # Solve deals exactly at this many cards or fewer. Keep it at 5 or
+    # below: at 7 or 8 one deal can outlast the budget (hearts_engine.solver)
+    solve_below: int = 4
+    workers: int = 1
+    passed: Passed = (-1, ())  # the state forgets passes; the player must not
+
+    def pass_cards(self, hand: Hand) -> tuple[T.Card, T.Card, T.Card]:
+        return pass_by_danger(hand)
+
+    def play_card(self, hand: Hand, valid: Cards) -> T.Card:
+        """Without the state there is nothing to sample: play low."""
+        return min(valid, key=lambda card: card.rank.order)
+
+    def choose_action(self, state: GameState) -> PlayerAction:
+        match state.phase:
+            case T.Phase.PASSING:
+                hand = state.players[state.current_player].hand
+                cards = self.pass_cards(hand)
+                self.passed = (state.round_number, cards)
+                return SelectPass(cards=cards)
+            case T.Phase.PLAYING:
+                return PlayCard(card=T.CARDS[choose_card(self, state)])
+            case T.Phase.ROUND_END:
+                return ChooseMoonOption(
+                    add_to_others=default_moon_choice(state)
+                )
+            case T.Phase.GAME_END:
+                raise AssertionError("Game is over")
+
+
+def passed_cards(passed: Passed, state: GameState) -> tuple[T.Card, ...]:
+    """The cards a player passed in the state's round, if it has passed."""
+    round_number, cards = passed
+    return cards if round_number == state.round_number else ()
+
+
+def view_entropy(state: GameState, seat: T.PlayerId) -> list[int]:
+    """Seed material from what the seat can see, for a playing-phase state.
+
+    The Zobrist key would do, but it hashes the hidden hands, and a seed
+    that tells apart positions the seat cannot would leak them into its play.
+    """
+    tricks = [t for tricks in state.tricks_won for t in tricks]
+    if state.trick is not None:
+        tricks.append(state.trick)
+    played = sum(1 << card.index for t in tricks for _, card in t.items())
+    hand = state.players[seat].hand.mask
+    return [state.round_number, seat, hand, played]
+
+
+def pass_by_danger(hand: Hand) -> tuple[T.Card, T.Card, T.Card]:
+    """The queen of spades and the spades above her, then the highest."""
+    a, b, c = sorted(hand, key=lambda card: _PASS_ORDER[card.index])[-3:]
+    return (a, b, c)
+
+
+def choose_card(player: PimcPlayer, state: GameState) -> T.CardIndex:
+    """The legal card with the lowest mean score over sampled deals."""
+    deadline = time.monotonic() + player.budget
+    search = SearchState.from_game_state(state)
+    cards = _bits(legal_moves(search))
+    if len(cards) == 1:
+        return cards[0]
+    seat = state.current_player
+    passed = passed_cards(player.passed, state)
+    sampler = Sampler.from_constraints(
+        Constraints.from_game_state(state, seat, passed)
+    )
+    rng = np.random.default_rng([player.seed, *view_entropy(state, seat)])
+    deals = sample_deals(sampler, player.deals, rng)
+    totals = np.zeros(len(cards))
+    if player.workers == 1:
+        totals += evaluate_deals(state, deals, player.solve_below, deadline)
+    else:
+        pool = shared_pool(player.workers)
+        futures = [
+            pool.submit(
+                evaluate_deals, state, chunk, player.solve_below, deadline
+            )
+            for chunk in np.array_split(deals, player.workers)
+        ]
+        done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        if not done:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            totals += future.result()
+    return cards[int(np.argmin(totals))]
+
+
+def evaluate_deals(
+    state: GameState, deals: Masks, solve_below: int, deadline: float
+) -> NDArray[np.float64]:
+    """Summed scores of each legal card (low to high) over the deals.
+
+    Stops after the first deal that ends past the deadline.
+    """
+    search = SearchState.from_game_state(state)
+    player = search.current
+    cards = _bits(legal_moves(search))
+    totals = np.zeros(len(cards))
+    if not len(deals):
+        return totals
+    if int(deals[0, player]).bit_count() > solve_below:
+        return _play_out(search, cards, deals, deadline)
+    table: Table = {}
+    for hands in deals:
+        search.hands = [int(hand) for hand in hands]
+        values = move_values(search, table)
+        totals += [values[card] for card in cards]
+        if time.monotonic() > deadline:
+            break
+    return totals
+
+
+def _play_out(
+    search: SearchState,
+    cards: Sequence[T.CardIndex],
+    deals: Masks,
+    deadline: float,
+) -> NDArray[np.float64]:
+    """Totals over the deals played out, a batch at a time."""
+    player = search.current
+    policy = HeuristicPolicy()
+    rng = np.random.default_rng(0)  # unused: the policy is deterministic
+    totals = np.zeros(len(cards))
+    for start in range(0, len(deals), _BATCH):
+        batch = deals[start : start + _BATCH]
+        search.hands = [int(hand) for hand in batch[0]]
+        for i, card in enumerate(cards):
+            after = batch.copy()
+            after[:, player] &= ~np.uint64(1 << card)
+            make_move(search, card)
+            totals[i] += playouts(search, after, policy, rng)[:, player].sum()
+            unmake_move(search)
+        if time.monotonic() > deadline:
+            break
+    return totals
+
+
+def _bits(mask: int) -> Sequence[T.CardIndex]:
+    cards: list[T.CardIndex] = []
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        cards.append(low.bit_length() - 1)
+    return cards
@@ -0,0 +1,95 @@
+"""Tests for the PIMC player."""
+
+import dataclasses
+import time
+from random import Random
+
+from hearts_engine import types as T
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.rules import valid_actions_for_state
+from hearts_engine.search import SearchState
+from hearts_engine.search import legal_moves
+from hearts_engine.state import GameState
+from hearts_engine.state import SelectPass
+from hearts_engine.state import update_player
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .pimc import PimcPlayer
+from .pimc import choose_card
+from .pimc import passed_cards
+from .pimc import view_entropy
+from .players import LowestCardPlayer
+from .tournament import Bot
+from .tournament import play_game
+
+
+def _playing(seed: int, plays: int) -> GameState:
+    """A random game `plays` cards into its first round."""
+    random = Random(seed)
+    game = new_game(random)
+    while plays or game.phase != T.Phase.PLAYING:
+        if game.phase == T.Phase.PLAYING:
+            plays -= 1
+        action = random.choice(valid_actions_for_state(game))
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+    return game
+
+
+class DescribePimcPlayer:
+    def it_is_a_bot(self) -> None:
+        assert isinstance(PimcPlayer(), Bot)
+
+    def it_plays_a_whole_game(self) -> None:
+        pimc = PimcPlayer(deals=4)
+        state = play_game([pimc, *[LowestCardPlayer()] * 3], seed=3)
+        assert state.phase == T.Phase.GAME_END
+
+    def it_remembers_its_pass_for_the_round(self) -> None:
+        pimc = PimcPlayer()
+        state = new_game(Random(2))
+        action = pimc.choose_action(state)
+        assert isinstance(action, SelectPass)
+        assert passed_cards(pimc.passed, state) == action.cards
+        later = dataclasses.replace(state, round_number=1)
+        assert passed_cards(pimc.passed, later) == ()
+
+
+class DescribeViewEntropy:
+    def it_ignores_the_hidden_hands(self) -> None:
+        state = _playing(6, 9)
+        seat = state.current_player
+        a, b = T.player_id(seat + 1), T.player_id(seat + 2)
+        players = update_player(state.players, a, hand=state.players[b].hand)
+        players = update_player(players, b, hand=state.players[a].hand)
+        swapped = dataclasses.replace(state, players=players)
+        assert swapped.key != state.key
+        assert view_entropy(swapped, seat) == view_entropy(state, seat)
+
+
+class DescribeChooseCard:
+    @given(
+        st.integers(min_value=0, max_value=10000),
+        st.integers(min_value=0, max_value=50),
+    )
+    @settings(max_examples=20, deadline=None)
+    def it_chooses_a_legal_card(self, seed: int, plays: int) -> None:
+        state = _playing(seed, plays)
+        card = choose_card(PimcPlayer(deals=8), state)
+        assert legal_moves(SearchState.from_game_state(state)) >> card & 1
+
+    def it_does_not_depend_on_the_worker_count(self) -> None:
+        state = _playing(4, 10)
+        inline = choose_card(PimcPlayer(deals=40), state)
+        pooled = choose_card(PimcPlayer(deals=40, workers=2), state)
+        assert inline == pooled
+
+    def it_stops_at_its_budget(self) -> None:
+        state = _playing(4, 1)
+        start = time.monotonic()
+        choose_card(PimcPlayer(deals=20000, budget=0.2), state)
+        assert time.monotonic() - start < 2.0
@@ -0,0 +1,38 @@
+"""Simple Player implementations."""
+
+from dataclasses import dataclass
+from dataclasses import field
+from random import Random
+
+from hearts_engine import types as T
+from hearts_engine.cards import Cards
+from hearts_engine.cards import Hand
+from hearts_engine.cards import draw_three
+
+
+@dataclass(slots=True)
+class RandomPlayer:
+    """Random valid play (bot level 000)."""
+
+    random: Random = field(default_factory=lambda: Random(0))
+
+    def reseed(self, seed: int) -> None:
+        self.random.seed(seed)
+
+    def pass_cards(self, hand: Hand) -> tuple[T.Card, T.Card, T.Card]:
+        return draw_three(hand, self.random)
+
+    def play_card(self, hand: Hand, valid: Cards) -> T.Card:
+        return self.random.choice(tuple(valid))
+
+
+@dataclass(frozen=True, slots=True)
+class LowestCardPlayer:
+    """Passes its highest cards and always plays its lowest valid card."""
+
+    def pass_cards(self, hand: Hand) -> tuple[T.Card, T.Card, T.Card]:
+        a, b, c = sorted(hand, key=lambda card: card.rank.order)[-3:]
+        return (a, b, c)
+
+    def play_card(self, hand: Hand, valid: Cards) -> T.Card:
+        return min(valid, key=lambda card: card.rank.order)
@@ -0,0 +1,162 @@
+"""Playouts: many deals of one position played to round end at once.
+
+Simulation bots end every sample the same way: play the rest of the round
+with a cheap policy and score it. Going through apply_action allocates a
+new GameState per card; a playout here is one row of NumPy card masks, and
+each play is a handful of array operations over all rows, with choices made
+by any BatchPolicy. heuristic_card is a cheap policy for playing one
+SearchState out a card at a time instead.
+
+The rows share the position's trick, lead and points, and differ in the
+hidden hands. Scores follow check_shot_moon, with a moon scored as +26 to
+the others (the shooter's default choice).
+"""
+
+import dataclasses
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.search import POINTS as CARD_POINTS
+from hearts_engine.search import SearchState
+from hearts_engine.search import legal_moves
+
+from .batch import HEARTS_LANE
+from .batch import NO_CARD
+from .batch import ONE
+from .batch import POINTS
+from .batch import BatchPolicy
+from .batch import Ints
+from .batch import Masks
+from .batch import Table
+from .batch import legal_plays
+from .batch import trick_winners
+
+_LANE = np.uint64(0x1FFF)
+_LANE_SHIFTS = np.arange(0, 52, 13, dtype=np.uint64)
+# Set bits of each 13-bit lane value, and the index of its k-th set bit
+_COUNTS = np.array([v.bit_count() for v in range(8192)], dtype=np.int64)
+_SELECT = np.array(
+    [
+        [i for i in range(13) if v >> i & 1] + [0] * (13 - v.bit_count())
+        for v in range(8192)
+    ],
+    dtype=np.int64,
+)
+
+
+def playouts(
+    search: SearchState,
+    deals: Masks,
+    policy: BatchPolicy,
+    rng: np.random.Generator,
+) -> Ints:
+    """Round scores (n, 4) after playing each deal out from the position.
+
+    deals replaces the search's hands: row i holds the four hands of
+    playout i, as card masks without the cards already in the trick.
+    """
+    n = len(deals)
+    rows = np.arange(n)
+    trick = np.full((n, 4), NO_CARD, dtype=np.int64)
+    size = search.trick_size
+    for i, card in enumerate(search.plays[len(search.plays) - size :]):
+        trick[:, (search.lead + i) % 4] = card
+    table = Table(
+        games=rows,
+        round_number=0,
+        tricks_played=search.tricks_played,
+        hands=deals.copy(),
+        trick=trick,
+        lead=np.full(n, search.lead, dtype=np.int64),
+        current=np.full(n, search.current, dtype=np.int64),
+        hearts_broken=np.full(n, search.hearts_broken, dtype=np.bool_),
+        round_points=np.tile(np.array(search.round_points), (n, 1)),
+        scores=np.zeros((n, 4), dtype=np.int64),
+    )
+    hands = table.hands
+    remaining = int(np.bitwise_count(deals[0]).sum()) if n else 0
+    for _ in range(remaining):
+        current = table.current
+        if size:
+            lane = table.trick[rows, table.lead] // 13
+        else:
+            lane = np.full(n, 4)
+        first = table.tricks_played == 0
+        code = lane * 4 + first * 2 + table.hearts_broken
+        legal = legal_plays(hands[rows, current], code)
+
+        cards = policy.play_cards(table, legal, rng)
+        hands[rows, current] ^= ONE << cards.astype(np.uint64)
+        table.trick[rows, current] = cards
+        table.hearts_broken[:] |= cards // 13 == HEARTS_LANE
+
+        size += 1
+        if size < 4:
+            table.current[:] = (current + 1) % 4
+            continue
+        winner = trick_winners(table.trick, table.lead)
+        points = POINTS[table.trick]
+        taken = points[:, 0] + points[:, 1] + points[:, 2] + points[:, 3]
+        table.round_points[rows, winner] += taken
+        table.lead[:] = table.current[:] = winner
+        table.trick[:] = NO_CARD
+        table = dataclasses.replace(
+            table, tricks_played=table.tricks_played + 1
+        )
+        size = 0
+    return moon_scores(table.round_points)
+
+
+def moon_scores(points: Ints) -> Ints:
+    """Round scores from points taken, with a moon as +26 to the others."""
+    takers = np.count_nonzero(points, axis=1)
+    shot = (takers == 1) & (points.max(axis=1) == 26)
+    return np.where(shot[:, None], 26 - points, points)
+
+
+def random_cards(legal: Masks, rng: np.random.Generator) -> Ints:
+    """A uniformly random card from each (non-empty) mask.
+
+    Draws the rank of the card among the mask's set bits, then finds it
+    lane by lane through 13-bit lookup tables.
+    """
+    rows = np.arange(len(legal))
+    lanes = ((legal[:, None] >> _LANE_SHIFTS) & _LANE).astype(np.int64)
+    counts = _COUNTS[lanes]
+    ends = counts.cumsum(axis=1)
+    pick = (rng.random(len(legal)) * ends[:, 3]).astype(np.int64)
+    lane = (
+        (pick >= ends[:, 0]).astype(np.int64)
+        + (pick >= ends[:, 1])
+        + (pick >= ends[:, 2])
+    )
+    k = pick - ends[rows, lane] + counts[rows, lane]
+    return lane * 13 + _SELECT[lanes[rows, lane], k]
+
+
+def heuristic_card(search: SearchState) -> T.CardIndex:
+    """A cheap sensible play: duck, dump points when void, lead low."""
+    legal = legal_moves(search)
+    size = search.trick_size
+    if not size:
+        return min(_cards(legal), key=lambda card: card % 13)
+    trick = search.plays[-size:]
+    lane = trick[0] // 13
+    if legal >> 13 * lane & 0x1FFF:
+        winning = max(card for card in trick if card // 13 == lane)
+        under = legal & ((1 << winning) - 1)
+        if under:
+            return under.bit_length() - 1
+        if size == 3 and not any(CARD_POINTS[card] for card in trick):
+            return legal.bit_length() - 1
+        return (legal & -legal).bit_length() - 1
+    return max(_cards(legal), key=lambda card: (CARD_POINTS[card], card % 13))
+
+
+def _cards(mask: int) -> list[T.CardIndex]:
+    cards: list[T.CardIndex] = []
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        cards.append(low.bit_length() - 1)
+    return cards
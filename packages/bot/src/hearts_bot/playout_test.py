@@ -0,0 +1,134 @@
+"""Tests for the playout kernel."""
+
+from random import Random
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.rules import valid_actions_for_state
+from hearts_engine.search import SearchState
+from hearts_engine.search import legal_moves
+from hearts_engine.search import make_move
+from hearts_engine.solver import final_score
+from hearts_engine.state import GameState
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from .batch import Bools
+from .batch import Ints
+from .batch import Masks
+from .batch import Table
+from .batch_policies import RandomPolicy
+from .deals import Constraints
+from .deals import Sampler
+from .deals import sample_deals
+from .playout import heuristic_card
+from .playout import moon_scores
+from .playout import playouts
+from .playout import random_cards
+
+
+class _Recorder:
+    """Random play, logging each step's legal masks and cards."""
+
+    def __init__(self) -> None:
+        self.steps: list[tuple[Masks, Ints]] = []
+
+    def pass_cards(
+        self,
+        table: Table,
+        direction: T.PassDirection,
+        rng: np.random.Generator,
+    ) -> Masks:
+        raise AssertionError("Playouts do not pass")
+
+    def play_cards(
+        self, table: Table, legal: Masks, rng: np.random.Generator
+    ) -> Ints:
+        cards = RandomPolicy().play_cards(table, legal, rng)
+        self.steps.append((legal, cards))
+        return cards
+
+    def add_to_others(self, table: Table, rng: np.random.Generator) -> Bools:
+        raise AssertionError("Playouts do not choose moon options")
+
+
+def _playing(seed: int, plays: int) -> GameState:
+    """A random game `plays` cards into its first round."""
+    random = Random(seed)
+    game = new_game(random)
+    while plays or game.phase != T.Phase.PLAYING:
+        if game.phase == T.Phase.PLAYING:
+            plays -= 1
+        action = random.choice(valid_actions_for_state(game))
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+    return game
+
+
+class DescribePlayouts:
+    @given(
+        st.integers(min_value=0, max_value=10000),
+        st.integers(min_value=0, max_value=51),
+    )
+    @settings(max_examples=20, deadline=None)
+    def it_agrees_with_search_state_play(self, seed: int, plays: int) -> None:
+        state = _playing(seed, plays)
+        sampler = Sampler.from_constraints(
+            Constraints.from_game_state(state, state.current_player)
+        )
+        rng = np.random.default_rng(seed)
+        deals = sample_deals(sampler, 8, rng)
+        recorder = _Recorder()
+        scores = playouts(
+            SearchState.from_game_state(state), deals, recorder, rng
+        )
+        for row, hands in enumerate(deals):
+            search = SearchState.from_game_state(state)
+            search.hands = [int(hand) for hand in hands]
+            for legal, cards in recorder.steps:
+                assert int(legal[row]) == legal_moves(search)
+                make_move(search, int(cards[row]))
+            expected = [final_score(search, seat) for seat in range(4)]
+            assert scores[row].tolist() == expected
+
+
+class DescribeMoonScores:
+    def it_gives_the_others_26_after_a_moon(self) -> None:
+        points = np.array([[0, 26, 0, 0], [13, 13, 0, 0], [26, 0, 0, 0]])
+        assert moon_scores(points).tolist() == [
+            [26, 0, 26, 26],
+            [13, 13, 0, 0],
+            [0, 26, 26, 26],
+        ]
+
+
+class DescribeRandomCards:
+    @given(st.lists(st.integers(min_value=1, max_value=2**52 - 1)))
+    def it_picks_a_card_in_each_mask(self, masks: list[int]) -> None:
+        legal = np.array(masks, dtype=np.uint64)
+        cards = random_cards(legal, np.random.default_rng(0))
+        for mask, card in zip(masks, cards):
+            assert mask >> int(card) & 1
+
+    def it_picks_uniformly(self) -> None:
+        mask = 1 << 3 | 1 << 20 | 1 << 30 | 1 << 51
+        legal = np.full(40000, mask, dtype=np.uint64)
+        cards = random_cards(legal, np.random.default_rng(0))
+        counts = np.bincount(cards, minlength=52)
+        assert counts[[3, 20, 30, 51]].min() > 9500
+        assert counts.sum() == 40000
+
+
+class DescribeHeuristicCard:
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=20, deadline=None)
+    def it_plays_legal_cards_to_round_end(self, seed: int) -> None:
+        search = SearchState.from_game_state(_playing(seed, 0))
+        for _ in range(52):
+            card = heuristic_card(search)
+            assert legal_moves(search) >> card & 1
+            make_move(search, card)
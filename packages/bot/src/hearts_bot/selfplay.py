@@ -0,0 +1,187 @@
+"""Self-play training data, written as fixed-size shards on disk.
+
+generate plays seeded games between the given players and records every
+playing-phase decision as encode()'s features of the player to move,
+labelled with that player's score for the round (after any moon). Shard i
+is filled from its own games, derived from (seed, i), so its content does
+not depend on the pool or on which shards were written before.
+
+Each shard is one .npy file of float32 rows: SIZE features, then the
+label. Shards are written under a temporary name and renamed into place,
+so a shard file exists only once it is complete. Rerunning generate in the
+same directory skips the existing shards, which makes the files themselves
+the checkpoint. manifest.json records the seed, the shard size and a
+digest of the pickled players so that a resumed run cannot mix different
+datasets.
+
+A worker holds one shard and one round of states at a time, and
+read_shards memory-maps each shard and yields slices of it, so memory stays
+bounded whatever the size of the dataset.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from collections.abc import Iterator
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from random import Random
+
+import numpy as np
+from hearts_engine import types as T
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.player import Player
+from hearts_engine.state import GameState
+
+from .features import SIZE
+from .features import Floats
+from .features import encode_batch
+from .tournament import choose_action
+from .tournament import load_players
+
+SHARD_SIZE = 1 << 16  # positions per shard
+_MANIFEST = "manifest.json"
+
+
+def generate(
+    directory: str | os.PathLike[str],
+    shards: int,
+    players: Sequence[Player],
+    seed: int = 0,
+    shard_size: int = SHARD_SIZE,
+    workers: int | None = None,
+) -> Iterator[int]:
+    """Write shards 0 to shards - 1 that are missing; yields each as done.
+
+    Runs on a process pool of `workers` processes (all cores when None),
+    or in this process when workers is 1. Players must be picklable.
+    """
+    assert len(players) == 4, players
+    os.makedirs(directory, exist_ok=True)
+    table = pickle.dumps(tuple(players))
+    _check_manifest(directory, table, seed, shard_size)
+    missing = [
+        i
+        for i in range(shards)
+        if not os.path.exists(shard_path(directory, i))
+    ]
+    workers = workers or os.process_cpu_count() or 1
+    if workers == 1:
+        for i in missing:
+            yield _write_shard(directory, table, seed, i, shard_size)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(_write_shard, directory, table, seed, i, shard_size)
+            for i in missing
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def read_shards(
+    directory: str | os.PathLike[str],
+    batch_size: int,
+    rng: np.random.Generator | None = None,
+) -> Iterator[tuple[Floats, Floats]]:
+    """Stream (features, labels) batches from every complete shard.
+
+    Shards are memory-mapped and batches are views into them, so only the
+    pages a batch touches are read. Shards come in index order, or in an
+    order shuffled by rng.
+    """
+    names = sorted(
+        name
+        for name in os.listdir(os.fspath(directory))
+        if name.startswith("shard-") and name.endswith(".npy")
+    )
+    if rng is not None:
+        rng.shuffle(names)
+    for name in names:
+        rows: Floats = np.load(os.path.join(directory, name), mmap_mode="r")
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            yield batch[:, :SIZE], batch[:, SIZE]
+
+
+def shard_path(directory: str | os.PathLike[str], index: int) -> str:
+    return os.path.join(directory, f"shard-{index:06d}.npy")
+
+
+def _check_manifest(
+    directory: str | os.PathLike[str], table: bytes, seed: int, shard_size: int
+) -> None:
+    manifest = {
+        "seed": seed,
+        "shard_size": shard_size,
+        "features": SIZE,
+        "players": hashlib.sha256(table).hexdigest(),
+    }
+    path = os.path.join(directory, _MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            existing = json.load(f)
+        if existing != manifest:
+            raise ValueError(
+                f"{directory} holds a different dataset: {existing}"
+            )
+        return
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+
+
+def _write_shard(
+    directory: str | os.PathLike[str],
+    table: bytes,
+    seed: int,
+    index: int,
+    shard_size: int,
+) -> int:
+    rows = np.empty((shard_size, SIZE + 1), dtype=np.float32)
+    random = Random(f"{seed}/{index}")
+    filled = 0
+    game = 0
+    while filled < shard_size:
+        players = load_players(table, random.getrandbits(64), game)
+        game += 1
+        for views, labels in _rounds(players, random):
+            n = min(len(views), shard_size - filled)
+            encode_batch(views[:n], rows[filled : filled + n, :SIZE])
+            rows[filled : filled + n, SIZE] = labels[:n]
+            filled += n
+            if filled == shard_size:
+                break
+    path = shard_path(directory, index)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        np.save(f, rows)
+    os.replace(temporary, path)
+    return index
+
+
+def _rounds(
+    players: Sequence[Player], random: Random
+) -> Iterator[tuple[list[tuple[GameState, T.PlayerId]], list[int]]]:
+    """Play one game; yield each round's decisions and their labels."""
+    state = new_game(random)
+    start = [p.score for p in state.players]
+    views: list[tuple[GameState, T.PlayerId]] = []
+    while state.phase != T.Phase.GAME_END:
+        if state.phase == T.Phase.PLAYING:
+            views.append((state, state.current_player))
+        action = choose_action(state, players[state.current_player])
+        result = apply_action(state, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        round_number = state.round_number
+        state = result.new_state
+        if (
+            state.round_number != round_number
+            or state.phase == T.Phase.GAME_END
+        ):
+            scores = [p.score - s for p, s in zip(state.players, start)]
+            yield views, [scores[player] for _, player in views]
+            start = [p.score for p in state.players]
+            views = []
@@ -0,0 +1,85 @@
+"""Tests for the self-play data pipeline."""
+
+from pathlib import Path
+from random import Random
+
+import numpy as np
+import pytest
+from hearts_engine.player import Player
+
+from .features import LAYOUT
+from .features import SIZE
+from .players import LowestCardPlayer
+from .players import RandomPlayer
+from .selfplay import generate
+from .selfplay import read_shards
+from .selfplay import shard_path
+
+
+def _players() -> list[Player]:
+    return [
+        RandomPlayer(Random(1)),
+        LowestCardPlayer(),
+        RandomPlayer(Random(2)),
+        LowestCardPlayer(),
+    ]
+
+
+class DescribeGenerate:
+    def it_writes_full_shards_of_labelled_positions(
+        self, tmp_path: Path
+    ) -> None:
+        assert list(generate(tmp_path, 2, _players(), 1, 300, workers=1)) == [
+            0,
+            1,
+        ]
+        rows = np.load(shard_path(tmp_path, 0))
+        assert rows.shape == (300, SIZE + 1)
+        labels = rows[:, SIZE]
+        assert set(labels.tolist()) <= set(range(-26, 27))
+        # Some position holds each card in hand: all 52 features are used
+        assert rows[:, LAYOUT["hand"]].any(axis=0).all()
+
+    def it_resumes_with_the_missing_shards_only(self, tmp_path: Path) -> None:
+        fresh = tmp_path / "fresh"
+        resumed = tmp_path / "resumed"
+        list(generate(fresh, 3, _players(), 1, 100, workers=1))
+        list(generate(resumed, 1, _players(), 1, 100, workers=1))
+        assert list(generate(resumed, 3, _players(), 1, 100, workers=2)) in (
+            [1, 2],
+            [2, 1],
+        )
+        for i in range(3):
+            expected = np.load(shard_path(fresh, i))
+            assert (np.load(shard_path(resumed, i)) == expected).all()
+
+    def it_refuses_to_mix_datasets(self, tmp_path: Path) -> None:
+        list(generate(tmp_path, 1, _players(), 1, 100, workers=1))
+        with pytest.raises(ValueError):
+            list(generate(tmp_path, 2, _players(), 2, 100, workers=1))
+
+    def it_refuses_to_mix_players(self, tmp_path: Path) -> None:
+        list(generate(tmp_path, 1, _players(), 1, 100, workers=1))
+        others = [LowestCardPlayer()] * 4
+        with pytest.raises(ValueError):
+            list(generate(tmp_path, 2, others, 1, 100, workers=1))
+
+
+class DescribeReadShards:
+    def it_streams_every_row_in_batches(self, tmp_path: Path) -> None:
+        list(generate(tmp_path, 2, _players(), 1, 100, workers=1))
+        batches = list(read_shards(tmp_path, 32))
+        assert [len(labels) for _, labels in batches] == [32, 32, 32, 4] * 2
+        features = np.concatenate([f for f, _ in batches])
+        stored = np.concatenate(
+            [np.load(shard_path(tmp_path, i)) for i in range(2)]
+        )
+        assert (features == stored[:, :SIZE]).all()
+
+    def it_shuffles_the_shard_order(self, tmp_path: Path) -> None:
+        list(generate(tmp_path, 4, _players(), 1, 10, workers=1))
+        rng = np.random.default_rng(0)
+        firsts = [bytes(f[0]) for f, _ in read_shards(tmp_path, 10, rng)]
+        ordered = [bytes(f[0]) for f, _ in read_shards(tmp_path, 10)]
+        assert firsts != ordered
+        assert sorted(firsts) == sorted(ordered)
@@ -0,0 +1,243 @@
+"""Tournament runner: many seeded games between Player implementations.
+
+Game i is dealt from a seed drawn from the master seed, and every game starts
+from its own fresh unpickled copy of the players, with each Seeded player
+reseeded from (game seed, i, seat). So each result depends only on (players,
+master seed, i), not on how games are sharded over workers, and no two games
+replay the same random stream. Players must be picklable.
+"""
+
+import atexit
+import os
+import pickle
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from random import Random
+from typing import Protocol
+from typing import runtime_checkable
+
+from hearts_engine import types as T
+from hearts_engine.main import apply_action
+from hearts_engine.main import new_game
+from hearts_engine.player import Player
+from hearts_engine.round import LOSING_SCORE
+from hearts_engine.rules import is_first_trick
+from hearts_engine.rules import valid_plays
+from hearts_engine.state import ChooseMoonOption
+from hearts_engine.state import GameState
+from hearts_engine.state import PlayCard
+from hearts_engine.state import PlayerAction
+from hearts_engine.state import SelectPass
+
+
+@runtime_checkable
+class Bot(Protocol):
+    """A player that decides from its own view of the whole state.
+
+    Bots must only look at what their seat may see: their own hand, the
+    tricks played, scores and hand sizes.
+    """
+
+    def choose_action(self, state: GameState) -> PlayerAction:
+        """The action the state calls for, for the current player."""
+        ...
+
+
+@runtime_checkable
+class Seeded(Protocol):
+    """A player with randomness of its own, reset at the start of a game."""
+
+    def reseed(self, seed: int) -> None:
+        """Restart the player's random stream from seed."""
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class GameResult:
+    """Final scores of one tournament game, by seat."""
+
+    index: int
+    seed: int
+    scores: tuple[int, ...]
+    rounds: int
+
+
+@dataclass(frozen=True, slots=True)
+class Standings:
+    """Aggregate of a tournament's results, by seat."""
+
+    games: int
+    total_scores: tuple[int, ...]
+    wins: tuple[float, ...]  # lowest final score; ties share the win
+
+    @classmethod
+    def from_results(cls, results: Iterable[GameResult]) -> Standings:
+        games = 0
+        totals = [0, 0, 0, 0]
+        wins = [0.0, 0.0, 0.0, 0.0]
+        for result in results:
+            games += 1
+            best = min(result.scores)
+            winners = [s for s in T.PLAYER_IDS if result.scores[s] == best]
+            for seat in T.PLAYER_IDS:
+                totals[seat] += result.scores[seat]
+                if seat in winners:
+                    wins[seat] += 1 / len(winners)
+        return cls(games=games, total_scores=tuple(totals), wins=tuple(wins))
+
+    @property
+    def mean_scores(self) -> tuple[float, ...]:
+        """Mean final score by seat; zeros before any game."""
+        games = max(self.games, 1)
+        return tuple(total / games for total in self.total_scores)
+
+
+def game_seeds(master_seed: int, games: int) -> list[int]:
+    """Per-game deal seeds derived from a master seed."""
+    random = Random(master_seed)
+    return [random.getrandbits(64) for _ in range(games)]
+
+
+def run_tournament(
+    players: Sequence[Player],
+    games: int,
+    master_seed: int,
+    workers: int | None = None,
+) -> Iterator[GameResult]:
+    """Play games between players (by seat), yielding results in order."""
+    assert len(players) == 4, players
+    table = pickle.dumps(tuple(players))
+    seeds = game_seeds(master_seed, games)
+    return run_games([table] * games, seeds, workers)
+
+
+def run_games(
+    tables: Sequence[bytes], seeds: Sequence[int], workers: int | None = None
+) -> Iterator[GameResult]:
+    """Play game i with the pickled players tables[i], dealt from seeds[i].
+
+    Games run on a process pool of `workers` processes (all cores when None),
+    or in this process when workers is 1. Results are yielded in order.
+    """
+    workers = workers or os.process_cpu_count() or 1
+    if workers == 1:
+        yield from map(_play_pickled, tables, range(len(seeds)), seeds)
+        return
+    chunksize = max(1, len(seeds) // (4 * workers))
+    with ProcessPoolExecutor(workers) as pool:
+        yield from pool.map(
+            _play_pickled,
+            tables,
+            range(len(seeds)),
+            seeds,
+            chunksize=chunksize,
+        )
+
+
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+
+
+def shared_pool(workers: int) -> ProcessPoolExecutor:
+    """One pool per worker count, kept until close_shared_pools.
+
+    For bots that split each decision over processes, where starting a
+    pool per decision would cost more than the decision.
+    """
+    pool = _POOLS.get(workers)
+    if pool is None:
+        pool = _POOLS[workers] = ProcessPoolExecutor(workers)
+    return pool
+
+
+def close_shared_pools() -> None:
+    """Shut down the shared pools; runs at exit, and is safe to call early.
+
+    A later shared_pool call starts a fresh pool.
+    """
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        pool.shutdown(cancel_futures=True)
+
+
+atexit.register(close_shared_pools)
+
+
+def play_game(
+    players: Sequence[Player], seed: int, game_id: str | None = None
+) -> GameState:
+    """Play a game to the end, dealt from Random(seed)."""
+    random = Random(seed)
+    state = new_game(random, game_id)
+    while state.phase != T.Phase.GAME_END:
+        player = players[state.current_player]
+        result = apply_action(state, choose_action(state, player), random)
+        assert isinstance(result, T.ActionSuccess), (player, result)
+        state = result.new_state
+    return state
+
+
+def choose_action(state: GameState, player: Player) -> PlayerAction:
+    """Ask a player for the action the state calls for.
+
+    A Bot decides from the state. Player has no moon choice; the shooter
+    takes the default_moon_choice.
+    """
+    if isinstance(player, Bot):
+        return player.choose_action(state)
+    hand = state.players[state.current_player].hand
+    match state.phase:
+        case T.Phase.PASSING:
+            return SelectPass(cards=player.pass_cards(hand))
+        case T.Phase.PLAYING:
+            assert state.trick is not None
+            valid = valid_plays(
+                hand,
+                state.trick.lead_suit,
+                is_first_trick(state.tricks_played),
+                state.hearts_broken,
+            )
+            return PlayCard(card=player.play_card(hand, valid))
+        case T.Phase.ROUND_END:
+            return ChooseMoonOption(add_to_others=default_moon_choice(state))
+        case T.Phase.GAME_END:
+            raise AssertionError("Game is over")
+
+
+def default_moon_choice(state: GameState) -> bool:
+    """Moon choice: +26 to the others unless that loses the shooter the game.
+
+    Adding ends the game when someone reaches the losing score; the shooter
+    then adds only if left alone with the lowest score.
+    """
+    shooter = state.current_player
+    scores = [
+        p.score + 26 * (pid != shooter) for pid, p in enumerate(state.players)
+    ]
+    if max(scores) < LOSING_SCORE:
+        return True
+    return all(
+        s > scores[shooter] for pid, s in enumerate(scores) if pid != shooter
+    )
+
+
+def load_players(blob: bytes, seed: int, index: int) -> tuple[Player, ...]:
+    """Unpickle a table, reseeding each Seeded player from (seed, index)."""
+    players: tuple[Player, ...] = pickle.loads(blob)
+    for seat, player in enumerate(players):
+        if isinstance(player, Seeded):
+            player.reseed(Random(f"{seed}/{index}/{seat}").getrandbits(64))
+    return players
+
+
+def _play_pickled(blob: bytes, index: int, seed: int) -> GameResult:
+    players = load_players(blob, seed, index)
+    state = play_game(players, seed, game_id=str(index))
+    return GameResult(
+        index=index,
+        seed=seed,
+        scores=tuple(p.score for p in state.players),
+        rounds=state.round_number + 1,
+    )
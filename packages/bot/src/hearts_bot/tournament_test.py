@@ -0,0 +1,122 @@
+"""Tests for the tournament runner."""
+
+import dataclasses
+import pickle
+from random import Random
+
+from hearts_engine import types as T
+from hearts_engine.main import new_game
+from hearts_engine.player import Player
+from hearts_engine.state import GameState
+from hearts_engine.state import update_player
+
+from .players import LowestCardPlayer
+from .players import RandomPlayer
+from .tournament import GameResult
+from .tournament import Standings
+from .tournament import close_shared_pools
+from .tournament import default_moon_choice
+from .tournament import load_players
+from .tournament import play_game
+from .tournament import run_tournament
+from .tournament import shared_pool
+
+
+def _players() -> list[Player]:
+    return [
+        RandomPlayer(Random(1)),
+        LowestCardPlayer(),
+        RandomPlayer(Random(2)),
+        LowestCardPlayer(),
+    ]
+
+
+def _moon_state(scores: list[int], shooter: T.PlayerId) -> GameState:
+    game = new_game(Random(0))
+    players = game.players
+    for pid, score in zip(T.PLAYER_IDS, scores):
+        players = update_player(players, pid, score=score)
+    return dataclasses.replace(
+        game, players=players, phase=T.Phase.ROUND_END, current_player=shooter
+    )
+
+
+class DescribePlayGame:
+    def it_plays_to_the_end(self) -> None:
+        state = play_game(_players(), seed=7)
+        assert state.phase == T.Phase.GAME_END
+        assert max(p.score for p in state.players) >= 100
+
+    def it_is_deterministic_for_a_seed(self) -> None:
+        first = play_game(_players(), seed=7, game_id="g")
+        second = play_game(_players(), seed=7, game_id="g")
+        assert first == second
+
+
+class DescribeRunTournament:
+    def it_yields_every_game_in_order(self) -> None:
+        results = list(run_tournament(_players(), 6, master_seed=3, workers=1))
+        assert [r.index for r in results] == list(range(6))
+        assert all(max(r.scores) >= 100 for r in results)
+
+    def it_does_not_depend_on_the_worker_count(self) -> None:
+        inline = list(run_tournament(_players(), 8, master_seed=3, workers=1))
+        pooled = list(run_tournament(_players(), 8, master_seed=3, workers=3))
+        assert inline == pooled
+
+    def it_varies_with_the_master_seed(self) -> None:
+        first = list(run_tournament(_players(), 4, master_seed=3, workers=1))
+        second = list(run_tournament(_players(), 4, master_seed=4, workers=1))
+        assert first != second
+
+
+class DescribeLoadPlayers:
+    def it_gives_each_game_its_own_random_stream(self) -> None:
+        table = pickle.dumps(tuple(_players()))
+
+        def draws(seed: int, index: int) -> list[float]:
+            players = load_players(table, seed, index)
+            assert isinstance(players[0], RandomPlayer)
+            return [players[0].random.random() for _ in range(3)]
+
+        assert draws(5, 0) == draws(5, 0)
+        assert draws(5, 0) != draws(5, 1)
+        assert draws(5, 0) != draws(6, 0)
+
+
+class DescribeSharedPool:
+    def it_keeps_one_pool_per_worker_count_until_closed(self) -> None:
+        pool = shared_pool(2)
+        assert shared_pool(2) is pool
+        assert pool.submit(abs, -3).result() == 3
+        close_shared_pools()
+        fresh = shared_pool(2)
+        assert fresh is not pool
+        close_shared_pools()
+
+
+class DescribeStandings:
+    def it_totals_scores_and_splits_tied_wins(self) -> None:
+        standings = Standings.from_results([
+            GameResult(index=0, seed=0, scores=(10, 100, 50, 10), rounds=5),
+            GameResult(index=1, seed=1, scores=(30, 20, 104, 60), rounds=6),
+        ])
+        assert standings.games == 2
+        assert standings.total_scores == (40, 120, 154, 70)
+        assert standings.wins == (0.5, 1.0, 0.0, 0.5)
+        assert standings.mean_scores == (20.0, 60.0, 77.0, 35.0)
+
+
+class DescribeDefaultMoonChoice:
+    def it_adds_to_others_when_the_game_goes_on(self) -> None:
+        assert default_moon_choice(_moon_state([10, 20, 30, 40], 0))
+
+    def it_adds_to_others_when_that_wins_the_game(self) -> None:
+        assert default_moon_choice(_moon_state([50, 80, 60, 70], 0))
+
+    def it_subtracts_when_adding_would_lose_the_game(self) -> None:
+        assert not default_moon_choice(_moon_state([90, 80, 60, 70], 0))
+
+    def it_has_zero_means_before_any_game(self) -> None:
+        standings = Standings.from_results([])
+        assert standings.mean_scores == (0.0, 0.0, 0.0, 0.0)
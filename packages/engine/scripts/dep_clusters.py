@@ -41,9 +41,11 @@ CLUSTERS: dict[str, set[str]] = {
         "PlayCard",
         "ChooseMoonOption",
         "apply_play",
+        "trusted_play",
     },
     "passing": {
         "apply_pass",
+        "trusted_pass",
         "next_player_for_passing",
         "execute_passes",
         "pass_target",
@@ -57,6 +59,7 @@ CLUSTERS: dict[str, set[str]] = {
         "check_shot_moon",
         "check_game_end",
         "apply_moon_choice",
+        "trusted_moon_choice",
     },
     "ending/scoring": {
         "apply_normal_scoring",
@@ -1,28 +1,137 @@
-"""Card collections for Hearts."""
+"""Card collections for Hearts.
 
+Collections are backed by a 52-bit integer mask with bit `card.index` set for
+each card. Each suit occupies a contiguous 13-bit lane (in `Suit.order` order,
+ranks ascending), so suit filtering is a mask-and and set difference is `& ~`.
+"""
+
+from collections.abc import Iterable
 from collections.abc import Iterator
 from collections.abc import Set as AbstractSet
 from random import Random
 from typing import Self
+from typing import TypeVar
+from typing import overload
 
 from . import types as T
 
+_T = TypeVar("_T")
+
+SUIT_BITS = 13
+FULL_MASK = (1 << 52) - 1
+SUIT_MASKS: dict[T.Suit, int] = {
+    suit: ((1 << SUIT_BITS) - 1) << (suit.order * SUIT_BITS) for suit in T.Suit
+}
+
+
+def card_bit(card: T.Card) -> int:
+    """Single-bit mask for a card."""
+    return 1 << card.index
+
+
+def cards_mask(cards: Iterable[T.Card]) -> int:
+    """Mask of an arbitrary iterable of cards."""
+    if isinstance(cards, Cards):
+        return cards.mask
+    mask = 0
+    for card in cards:
+        mask |= card_bit(card)
+    return mask
+
+
+def iter_mask(mask: int) -> Iterator[T.Card]:
+    """Yield the cards of a mask, lowest bit (smallest card) first."""
+    while mask:
+        low = mask & -mask
+        yield T.CARDS[low.bit_length() - 1]
+        mask ^= low
+
+
+class Cards(AbstractSet[T.Card]):
+    """Immutable collection of cards with group operation."""
+
+    __slots__ = ("_mask",)
+    _mask: int
+
+    def __init__(self, cards: Iterable[T.Card] = ()) -> None:
+        self._mask = cards_mask(cards)
+
+    @classmethod
+    def from_mask(cls, mask: int) -> Self:
+        """Wrap a card mask without re-deriving it from cards."""
+        result = cls.__new__(cls)
+        result._mask = mask
+        return result
+
+    @property
+    def mask(self) -> int:
+        return self._mask
 
-class Cards(frozenset[T.Card]):
-    """Collection of cards with group operation."""
+    def __contains__(self, card: object) -> bool:
+        return isinstance(card, T.Card) and bool(self._mask & card_bit(card))
 
-    def __sub__(self, other: AbstractSet[T.Card]) -> Self:
+    def __iter__(self) -> Iterator[T.Card]:
+        return iter_mask(self._mask)
+
+    def __len__(self) -> int:
+        return self._mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self._mask != 0
+
+    def __hash__(self) -> int:
+        # Equal to frozensets of the same cards, so it must hash like them
+        return hash(frozenset(iter_mask(self._mask)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Cards):
+            return self._mask == other._mask
+        return super().__eq__(other)
+
+    def __le__(self, other: AbstractSet[object]) -> bool:
+        if isinstance(other, Cards):
+            return self._mask & ~other._mask == 0
+        return super().__le__(other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def __reduce__(self) -> tuple[object, tuple[int]]:
+        return (type(self).from_mask, (self._mask,))
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[_T]) -> frozenset[_T]:
+        # What the Set mixins build, as ^ and the reflected operators with
+        # a builtin set on the left: a frozenset, like the frozenset-based
+        # Cards gave, and not cls, whose constructor may take no cards
+        return frozenset(it)
+
+    def __and__(self, other: AbstractSet[object]) -> Self:
+        return self.from_mask(self._mask & _other_mask(other))
+
+    @overload
+    def __or__(self, other: Cards) -> Self: ...
+    @overload
+    def __or__(self, other: AbstractSet[_T]) -> AbstractSet[T.Card | _T]: ...
+    def __or__(self, other: AbstractSet[_T]) -> AbstractSet[T.Card | _T]:
+        if isinstance(other, Cards) or all(
+            isinstance(c, T.Card) for c in other
+        ):
+            return self.from_mask(self._mask | _other_mask(other))
+        return frozenset(self) | other
+
+    def __sub__(self, other: AbstractSet[object]) -> Self:
         """Return self minus other, preserving type."""
-        cls = type(self)
-        return cls(super().__sub__(other))
+        return self.from_mask(self._mask & ~_other_mask(other))
+
+    def isdisjoint(self, other: Iterable[object]) -> bool:
+        return not self._mask & _other_mask(other)
 
     def of_suit(self, suit: T.Suit) -> Self:
-        cls = type(self)
-        return cls(c for c in self if c.suit == suit)
+        return self.from_mask(self._mask & SUIT_MASKS[suit])
 
     def not_of_suit(self, suit: T.Suit) -> Self:
-        cls = type(self)
-        return cls(c for c in self if c.suit != suit)
+        return self.from_mask(self._mask & ~SUIT_MASKS[suit])
 
     def hearts(self) -> Self:
         return self.of_suit(T.Suit.HEARTS)
@@ -30,11 +139,18 @@ class Cards(frozenset[T.Card]):
     def group(self) -> dict[T.Suit, list[T.Card]]:
         """Return cards grouped by suit, sorted within each group."""
         result: dict[T.Suit, list[T.Card]] = {}
-        for card in sorted(self):
+        for card in self:  # bit order is sort order
             result.setdefault(card.suit, []).append(card)
         return result
 
 
+def _other_mask(other: Iterable[object]) -> int:
+    """Mask of the cards in other, ignoring anything that is not a card."""
+    if isinstance(other, Cards):
+        return other.mask
+    return cards_mask(c for c in other if isinstance(c, T.Card))
+
+
 def draw(cards: Cards, n: int, rng: Random) -> Cards:
     """Draw n random cards from a collection."""
     return Cards(rng.sample(tuple(cards), n))
@@ -49,16 +165,16 @@ def draw_three(cards: Cards, rng: Random) -> tuple[T.Card, T.Card, T.Card]:
 class Hand(Cards):
     """A player's hand."""
 
-    pass
+    __slots__ = ()
 
 
 class Deck(Cards):
     """A standard 52-card deck."""
 
-    def __new__(cls) -> Deck:
-        return super().__new__(
-            cls, (T.Card(suit, rank) for suit in T.Suit for rank in T.Rank)
-        )
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        self._mask = FULL_MASK
 
 
 def deal_hands(deck: Deck, rng: Random) -> Iterator[Hand]:
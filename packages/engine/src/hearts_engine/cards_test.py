@@ -1,5 +1,8 @@
 """Tests for cards module."""
 
+import pickle
+from collections.abc import Set as AbstractSet
+
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -7,6 +10,7 @@ from . import types as T
 from .card import QUEEN_OF_SPADES
 from .card import TWO_OF_CLUBS
 from .card import Trick
+from .cards import SUIT_MASKS
 from .cards import Cards
 from .cards import Deck
 from .cards import Hand
@@ -48,6 +52,29 @@ class DescribeCard:
             T.Card(T.Suit.HEARTS, T.Rank.KING),
         ]
 
+    def it_interns_instances(self) -> None:
+        card = T.Card(T.Suit.HEARTS, T.Rank.ACE)
+        assert card is T.Card(T.Suit.HEARTS, T.Rank.ACE)
+        assert card is T.Card.from_string("ah")
+        assert card is T.CARDS[card.index]
+
+    def it_survives_copy_and_pickle_as_the_same_instance(self) -> None:
+        import copy
+        import pickle
+
+        assert copy.deepcopy(QUEEN_OF_SPADES) is QUEEN_OF_SPADES
+        assert pickle.loads(pickle.dumps(QUEEN_OF_SPADES)) is QUEEN_OF_SPADES
+
+    def it_indexes_densely_in_sort_order(self) -> None:
+        assert [c.index for c in T.CARDS] == list(range(52))
+        assert list(T.CARDS) == sorted(Deck())
+        assert TWO_OF_CLUBS.index == 0
+        assert T.Card(T.Suit.HEARTS, T.Rank.ACE).index == 51
+
+    def it_round_trips_through_index(self) -> None:
+        for card in Deck():
+            assert T.Card.from_index(card.index) is card
+
     def it_parses_keyboard_input(self) -> None:
         # Lowercase suit letters for easy typing
         assert T.Card.from_string("ah") == T.Card(T.Suit.HEARTS, T.Rank.ACE)
@@ -200,11 +227,41 @@ class DescribeCardTTY:
 class DescribeCards:
     """Tests for Cards collection."""
 
-    def it_is_a_frozenset_of_card(self) -> None:
+    def it_is_a_set_of_card(self) -> None:
         cards = Cards([T.Card(T.Suit.HEARTS, T.Rank.ACE)])
-        assert isinstance(cards, frozenset)
+        assert isinstance(cards, AbstractSet)
         assert len(cards) == 1
 
+    def it_puts_each_suit_in_its_own_lane(self) -> None:
+        deck = Deck()
+        for suit in T.Suit:
+            assert deck.of_suit(suit).mask == SUIT_MASKS[suit]
+        assert TWO_OF_CLUBS in Cards.from_mask(1)
+        assert Cards.from_mask(1 << 51) == {T.Card(T.Suit.HEARTS, T.Rank.ACE)}
+
+    def it_iterates_in_sorted_order(self) -> None:
+        assert list(Deck()) == sorted(Deck())
+
+    def it_compares_equal_to_frozensets(self) -> None:
+        cards = [QUEEN_OF_SPADES, TWO_OF_CLUBS]
+        assert Cards(cards) == frozenset(cards)
+        assert Hand(cards) == Cards(cards)
+        assert hash(Hand(cards)) == hash(Cards(cards))
+        assert hash(Cards(cards)) == hash(frozenset(cards))
+
+    def it_preserves_type_through_set_operations(self) -> None:
+        hand = Hand([QUEEN_OF_SPADES, TWO_OF_CLUBS])
+        assert type(hand - {QUEEN_OF_SPADES}) is Hand
+        assert type(hand | Cards([TWO_OF_CLUBS])) is Hand
+        assert type(hand & Cards([TWO_OF_CLUBS])) is Hand
+        assert type(hand.hearts()) is Hand
+
+    def it_takes_a_deck_on_the_right_of_a_builtin_set(self) -> None:
+        assert {TWO_OF_CLUBS} | Deck() == set(T.CARDS)
+        assert {TWO_OF_CLUBS} & Deck() == {TWO_OF_CLUBS}
+        assert {TWO_OF_CLUBS} - Deck() == set()
+        assert {TWO_OF_CLUBS} ^ Deck() == set(T.CARDS) - {TWO_OF_CLUBS}
+
     def it_groups_by_suit(self) -> None:
         cards = Cards([
             T.Card(T.Suit.HEARTS, T.Rank.KING),
@@ -221,6 +278,43 @@ class DescribeCards:
         assert T.Suit.SPADES not in grouped
 
 
+class DescribeCardsProperties:
+    """Mask-backed Cards agree with frozenset semantics."""
+
+    @given(st.frozensets(cards), st.frozensets(cards), suits)
+    def it_matches_frozenset(
+        self, a: frozenset[T.Card], b: frozenset[T.Card], suit: T.Suit
+    ) -> None:
+        ca, cb = Cards(a), Cards(b)
+        assert ca - cb == a - b
+        assert ca - b == a - b
+        assert ca | cb == a | b
+        assert ca & cb == a & b
+        assert (ca <= cb) == (a <= b)
+        assert ca.isdisjoint(cb) == a.isdisjoint(b)
+        assert hash(ca) == hash(a)
+        assert ca.of_suit(suit) == {c for c in a if c.suit == suit}
+        assert ca.not_of_suit(suit) == {c for c in a if c.suit != suit}
+        assert len(ca) == len(a)
+        assert all(c in ca for c in a)
+
+    @given(st.sets(cards), st.frozensets(cards))
+    def it_matches_set_on_the_right_of_a_builtin_set(
+        self, a: set[T.Card], b: frozenset[T.Card]
+    ) -> None:
+        for cb in (Cards(b), Hand(b)):
+            assert a | cb == a | b
+            assert a & cb == a & b
+            assert a - cb == a - b
+            assert a ^ cb == a ^ b
+            assert not isinstance(a - cb, Cards)
+
+    @given(st.frozensets(cards))
+    def it_pickles(self, a: frozenset[T.Card]) -> None:
+        hand = Hand(a)
+        assert pickle.loads(pickle.dumps(hand)) == hand
+
+
 class DescribeHand:
     """Tests for Hand subclass."""
 
@@ -0,0 +1,255 @@
+"""Compact binary encoding of GameState.
+
+Layout (little-endian), 67 bytes plus 4 per completed trick and 3 per
+pending pass when the game id is a UUID, so 91 bytes six tricks into a
+round:
+
+    header  19 bytes  version, phase/flags, round number, seats, scores,
+                      round scores, trick count and pending-pass bits
+    hands   28 bytes  four 52-bit card masks, 7 bytes each
+    trick    4 bytes  current trick by seat, 0xFF for an empty seat
+    game id           16 raw bytes for a UUID, otherwise at most 255 bytes
+                      of UTF-8
+    tricks   4 bytes  per completed trick: card indices by seat, with the
+                      lead in the top two bits of the first; grouped by
+                      winner in player order, oldest first
+    passes   3 bytes  per pending pass, in player order
+
+Round points, trick counts and the Zobrist key are derived on decode.
+"""
+
+import struct
+import uuid
+
+from . import types as T
+from .card import Trick
+from .cards import Hand
+from .rules import trick_winner
+from .scoring import trick_points
+from .state import GameState
+from .state import PendingPasses
+from .state import PlayerState
+from .state import ThreeCards
+
+VERSION = 1
+_HEADER = struct.Struct("<BBHB4h4bBB")
+_HANDS = _HEADER.size
+_TRICK = _HANDS + 28
+_GAME_ID = _TRICK + 4
+_EMPTY = 0xFF
+
+_PHASES = tuple(T.Phase)
+_HEARTS_BROKEN = 1 << 2
+_HAS_TRICK = 1 << 3
+_UUID_ID = 1 << 4
+
+
+def encode(state: GameState) -> bytes:
+    """Encode a GameState into its compact binary form.
+
+    Raises ValueError for a game id that is not a UUID and is too long.
+    """
+    flags = _PHASES.index(state.phase)
+    if state.hearts_broken:
+        flags |= _HEARTS_BROKEN
+    if state.trick is not None:
+        flags |= _HAS_TRICK
+    if _is_uuid(state.game_id):
+        flags |= _UUID_ID
+        game_id = uuid.UUID(state.game_id).bytes
+    else:
+        game_id = state.game_id.encode("utf-8")
+        if len(game_id) > 0xFF:
+            raise ValueError(f"Game id over 255 bytes: {state.game_id!r}")
+    tricks = [t for p in state.players for t in p.tricks_won]
+    lead = state.trick.lead if state.trick is not None else 0
+    pending = sum(
+        1 << pid
+        for pid, cards in zip(T.PLAYER_IDS, state.pending_passes)
+        if cards is not None
+    )
+    out = bytearray(
+        _HEADER.pack(
+            VERSION,
+            flags,
+            state.round_number,
+            state.dealer | state.current_player << 2 | lead << 4,
+            *(p.score for p in state.players),
+            *(p.round_score for p in state.players),
+            len(tricks) | pending << 4,
+            len(game_id),
+        )
+    )
+    for player in state.players:
+        out += player.hand.mask.to_bytes(7, "little")
+    trick_cards = state.trick.cards if state.trick else (None,) * 4
+    out += bytes(_EMPTY if c is None else c.index for c in trick_cards)
+    out += game_id
+    for trick in tricks:
+        out += _encode_trick(trick)
+    for cards in state.pending_passes:
+        if cards is not None:
+            out += bytes(c.index for c in cards)
+    return bytes(out)
+
+
+def decode(data: bytes | memoryview) -> GameState:
+    """Decode bytes produced by encode()."""
+    view = StateView(data)
+    tricks_won: list[list[Trick]] = [[], [], [], []]
+    for trick in view.tricks:
+        tricks_won[trick_winner(trick)].append(trick)
+    players = tuple(
+        PlayerState(
+            hand=Hand.from_mask(mask),
+            score=score,
+            round_score=round_score,
+            tricks_won=tuple(won),
+            round_points=sum(trick_points(t) for t in won),
+        )
+        for mask, score, round_score, won in zip(
+            view.hand_masks, view.scores, view.round_scores, tricks_won
+        )
+    )
+    return GameState(
+        game_id=view.game_id,
+        phase=view.phase,
+        round_number=view.round_number,
+        dealer=view.dealer,
+        players=players,
+        trick=view.trick,
+        current_player=view.current_player,
+        hearts_broken=view.hearts_broken,
+        pending_passes=view.pending_passes,
+        tricks_played=view.tricks_played,
+        point_takers=sum(1 for p in players if p.round_points),
+    )
+
+
+class StateView:
+    """Zero-copy reader over an encoded GameState."""
+
+    __slots__ = ("_buf", "_header")
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        self._buf = memoryview(data)
+        self._header: tuple[int, ...] = _HEADER.unpack_from(self._buf)
+        if self._header[0] != VERSION:
+            raise ValueError(
+                f"Unsupported encoding version: {self._header[0]}"
+            )
+
+    @property
+    def phase(self) -> T.Phase:
+        return _PHASES[self._header[1] & 3]
+
+    @property
+    def hearts_broken(self) -> bool:
+        return bool(self._header[1] & _HEARTS_BROKEN)
+
+    @property
+    def round_number(self) -> int:
+        return self._header[2]
+
+    @property
+    def dealer(self) -> T.PlayerId:
+        return T.player_id(self._header[3])
+
+    @property
+    def current_player(self) -> T.PlayerId:
+        return T.player_id(self._header[3] >> 2)
+
+    @property
+    def scores(self) -> tuple[int, ...]:
+        return self._header[4:8]
+
+    @property
+    def round_scores(self) -> tuple[int, ...]:
+        return self._header[8:12]
+
+    @property
+    def tricks_played(self) -> int:
+        return self._header[12] & 0xF
+
+    @property
+    def hand_masks(self) -> tuple[int, int, int, int]:
+        buf = self._buf
+        a, b, c, d = (
+            int.from_bytes(buf[i : i + 7], "little")
+            for i in range(_HANDS, _TRICK, 7)
+        )
+        return (a, b, c, d)
+
+    @property
+    def trick(self) -> Trick | None:
+        if not self._header[1] & _HAS_TRICK:
+            return None
+        a, b, c, d = (
+            None if i == _EMPTY else T.Card.from_index(i)
+            for i in self._buf[_TRICK:_GAME_ID]
+        )
+        return Trick(
+            lead=T.player_id(self._header[3] >> 4), cards=(a, b, c, d)
+        )
+
+    @property
+    def game_id(self) -> str:
+        raw = self._buf[_GAME_ID : self._tricks_offset]
+        if self._header[1] & _UUID_ID:
+            return str(uuid.UUID(bytes=bytes(raw)))
+        return str(raw, "utf-8")
+
+    @property
+    def tricks(self) -> tuple[Trick, ...]:
+        """Completed tricks, grouped by winner in player order."""
+        start = self._tricks_offset
+        return tuple(
+            _decode_trick(self._buf[i : i + 4])
+            for i in range(start, start + 4 * self.tricks_played, 4)
+        )
+
+    @property
+    def pending_passes(self) -> PendingPasses:
+        present = self._header[12] >> 4
+        offset = self._tricks_offset + 4 * self.tricks_played
+        passes: list[ThreeCards | None] = []
+        for pid in T.PLAYER_IDS:
+            if present >> pid & 1:
+                a, b, c = (
+                    T.Card.from_index(i)
+                    for i in self._buf[offset : offset + 3]
+                )
+                passes.append((a, b, c))
+                offset += 3
+            else:
+                passes.append(None)
+        return (passes[0], passes[1], passes[2], passes[3])
+
+    @property
+    def _tricks_offset(self) -> int:
+        return _GAME_ID + self._header[13]
+
+
+def _is_uuid(game_id: str) -> bool:
+    try:
+        return str(uuid.UUID(game_id)) == game_id
+    except ValueError:
+        return False
+
+
+def _encode_trick(trick: Trick) -> bytes:
+    a, b, c, d = (card.index for card in trick.values())
+    return bytes((a | trick.lead << 6, b, c, d))
+
+
+def _decode_trick(raw: memoryview) -> Trick:
+    first, b, c, d = raw
+    return Trick(
+        lead=T.player_id(first >> 6),
+        cards=(
+            T.Card.from_index(first & 0x3F),
+            T.Card.from_index(b),
+            T.Card.from_index(c),
+            T.Card.from_index(d),
+        ),
+    )
@@ -0,0 +1,82 @@
+"""Tests for the binary GameState codec."""
+
+from random import Random
+
+import pytest
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from . import types as T
+from .codec import StateView
+from .codec import decode
+from .codec import encode
+from .main import apply_action
+from .main import new_game
+from .rules import valid_actions_for_state
+from .state import GameState
+
+
+def _random_states(seed: int, n: int) -> list[GameState]:
+    """States visited by n random actions from a new game."""
+    random = Random(seed)
+    rng = Random(seed)
+    game: GameState = new_game(random)
+    states = [game]
+    for _ in range(n):
+        if game.phase == T.Phase.GAME_END:
+            break
+        action = rng.choice(valid_actions_for_state(game))
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+        states.append(game)
+    return states
+
+
+class DescribeCodec:
+    """Tests for encode/decode."""
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=5000)
+    def it_round_trips_every_state_of_a_game(self, seed: int) -> None:
+        for state in _random_states(seed, 300):
+            assert decode(encode(state)) == state
+
+    def it_takes_91_bytes_six_tricks_into_a_round(self) -> None:
+        state = next(
+            s
+            for s in _random_states(42, 200)
+            if s.phase == T.Phase.PLAYING and s.tricks_played == 6
+        )
+        assert len(encode(state)) == 91
+
+    def it_keeps_arbitrary_game_ids(self) -> None:
+        state = new_game(Random(42), game_id="table-7")
+        assert decode(encode(state)).game_id == "table-7"
+
+    def it_rejects_game_ids_over_255_bytes(self) -> None:
+        state = new_game(Random(42), game_id="x" * 255)
+        assert decode(encode(state)).game_id == "x" * 255
+        with pytest.raises(ValueError):
+            encode(new_game(Random(42), game_id="x" * 256))
+
+    def it_rejects_unknown_versions(self) -> None:
+        data = bytearray(encode(new_game(Random(42))))
+        data[0] = 99
+        with pytest.raises(ValueError):
+            decode(bytes(data))
+
+
+class DescribeStateView:
+    """Tests for the zero-copy reader."""
+
+    def it_reads_fields_without_decoding(self) -> None:
+        state = _random_states(42, 30)[-1]
+        view = StateView(memoryview(encode(state)))
+        assert view.phase == state.phase
+        assert view.current_player == state.current_player
+        assert view.hand_masks == tuple(p.hand.mask for p in state.players)
+        assert view.scores == tuple(p.score for p in state.players)
+        assert view.tricks_played == state.tricks_played
+        assert view.trick == state.trick
@@ -0,0 +1,279 @@
+"""Append-only game log: the actions of a game, with periodic snapshots.
+
+A game is its starting state, its Random and the actions applied to them,
+so a log of the actions is enough to recover every state. apply_logged
+applies an action and appends it; the log also marks each round start and
+holds a snapshot (the codec's encoding of the state, with the Random's
+state) at the start, at each new round and after every action whose count
+in the game is a multiple of `every`. rebuild reaches any action index
+from the nearest snapshot at or before it, so it replays fewer than
+`every` actions, however long the game.
+
+Every record is flushed as it is written. read_log stops at a record cut
+short by a crash, and LogWriter.resume drops it and carries on appending.
+
+Layout (little-endian):
+
+    header     16 bytes  magic, version, snapshot interval, seed
+    action      5 bytes  b"A", kind, three card indices (0xFF unused)
+    round       7 bytes  b"R", action index, round number
+    snapshot             b"S", action index, state length, encoded state,
+                         then the Random's state: version, 625 words and
+                         the pending gauss value (NaN for none)
+"""
+
+import math
+import os
+import struct
+from bisect import bisect_right
+from dataclasses import dataclass
+from random import Random
+from types import TracebackType
+from typing import BinaryIO
+from typing import Self
+
+from . import types as T
+from .codec import decode
+from .codec import encode
+from .main import apply_action
+from .replay import replay
+from .state import ChooseMoonOption
+from .state import GameState
+from .state import PlayCard
+from .state import PlayerAction
+from .state import SelectPass
+
+MAGIC = b"HLG\0"
+VERSION = 1
+SNAPSHOT_EVERY = 64  # snapshot after every 64th action of the game
+_HEADER = struct.Struct("<4sHHq")
+_ACTION = struct.Struct("<c4B")
+_ROUND = struct.Struct("<cIH")
+_SNAPSHOT = struct.Struct("<cII")
+_RANDOM = struct.Struct("<B625Id")
+_UNUSED = 0xFF
+_PASS, _PLAY, _MOON = range(3)
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """The state after the first `index` actions, and the Random's state."""
+
+    index: int
+    state: bytes
+    random: tuple[object, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class GameLog:
+    """The complete records of a log file."""
+
+    seed: int
+    every: int
+    actions: tuple[PlayerAction, ...]
+    rounds: tuple[tuple[int, int], ...]  # (action index, round number)
+    snapshots: tuple[Snapshot, ...]
+    size: int  # bytes of complete records, header included
+
+
+class LogWriter:
+    """Appends one game's records to a log file."""
+
+    __slots__ = ("file", "every", "count", "round_number")
+
+    def __init__(
+        self, file: BinaryIO, every: int, count: int, round_number: int
+    ) -> None:
+        self.file = file
+        self.every = every
+        self.count = count  # actions written
+        self.round_number = round_number  # of the last round start written
+
+    @classmethod
+    def create(
+        cls,
+        path: str | os.PathLike[str],
+        seed: int = 0,
+        every: int = SNAPSHOT_EVERY,
+    ) -> Self:
+        """Start a new log; seed is recorded for audit only."""
+        file = open(path, "wb")
+        file.write(_HEADER.pack(MAGIC, VERSION, every, seed))
+        file.flush()
+        return cls(file, every, count=0, round_number=-1)
+
+    @classmethod
+    def resume(
+        cls, path: str | os.PathLike[str]
+    ) -> tuple[Self, GameState, Random]:
+        """Reopen a log after a crash, with the last state it reaches.
+
+        Raises ValueError if the crash came before begin recorded the
+        starting state, which the log cannot recover.
+        """
+        log = read_log(path)
+        state, random = rebuild(log, len(log.actions))
+        file = open(path, "r+b")
+        file.truncate(log.size)
+        file.seek(log.size)
+        round_number = log.rounds[-1][1] if log.rounds else -1
+        writer = cls(file, log.every, len(log.actions), round_number)
+        # The crash may have cut off the records of a round start
+        if state.round_number != round_number:
+            _start_round(writer, state, random)
+        elif log.snapshots[-1].index < log.rounds[-1][0]:
+            _snapshot(writer, state, random)
+        return writer, state, random
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def begin(writer: LogWriter, state: GameState, random: Random) -> None:
+    """Record the starting state, as from new_game."""
+    assert writer.count == 0 and writer.round_number < 0
+    _start_round(writer, state, random)
+
+
+def apply_logged(
+    writer: LogWriter, state: GameState, action: PlayerAction, random: Random
+) -> T.ActionResult:
+    """apply_action, appending the action and any snapshot it calls for.
+
+    Failed actions change nothing and are not logged.
+    """
+    result = apply_action(state, action, random)
+    if not isinstance(result, T.ActionSuccess):
+        return result
+    writer.file.write(_encode_action(action))
+    writer.count += 1
+    new_state = result.new_state
+    if new_state.round_number != writer.round_number:
+        _start_round(writer, new_state, random)
+    elif writer.count % writer.every == 0:
+        _snapshot(writer, new_state, random)
+    writer.file.flush()
+    return result
+
+
+def read_log(path: str | os.PathLike[str]) -> GameLog:
+    """Read a log, up to its last complete record."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Not a game log, or its header is cut short: {path}")
+    magic, version, every, seed = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} game log: {path}")
+    actions: list[PlayerAction] = []
+    rounds: list[tuple[int, int]] = []
+    snapshots: list[Snapshot] = []
+    offset = _HEADER.size
+    while offset < len(data):
+        tag = data[offset : offset + 1]
+        if tag == b"A":
+            if offset + _ACTION.size > len(data):
+                break
+            _, kind, a, b, c = _ACTION.unpack_from(data, offset)
+            actions.append(_decode_action(kind, a, b, c))
+            offset += _ACTION.size
+        elif tag == b"R":
+            if offset + _ROUND.size > len(data):
+                break
+            _, index, round_number = _ROUND.unpack_from(data, offset)
+            rounds.append((index, round_number))
+            offset += _ROUND.size
+        elif tag == b"S":
+            if offset + _SNAPSHOT.size > len(data):
+                break
+            _, index, length = _SNAPSHOT.unpack_from(data, offset)
+            start = offset + _SNAPSHOT.size
+            end = start + length + _RANDOM.size
+            if end > len(data):
+                break
+            version, *words, gauss = _RANDOM.unpack_from(data, start + length)
+            random = (
+                version,
+                tuple(words),
+                None if math.isnan(gauss) else gauss,
+            )
+            state = data[start : start + length]
+            snapshots.append(Snapshot(index=index, state=state, random=random))
+            offset = end
+        else:
+            raise ValueError(f"Bad record at byte {offset} of {path}")
+    return GameLog(
+        seed=seed,
+        every=every,
+        actions=tuple(actions),
+        rounds=tuple(rounds),
+        snapshots=tuple(snapshots),
+        size=offset,
+    )
+
+
+def rebuild(log: GameLog, index: int) -> tuple[GameState, Random]:
+    """The state after the first `index` actions, and the game's Random.
+
+    Raises ValueError if the log holds no snapshot, as when its writer
+    stopped before begin.
+    """
+    assert 0 <= index <= len(log.actions), index
+    i = bisect_right([s.index for s in log.snapshots], index) - 1
+    if i < 0:
+        raise ValueError("The log holds no starting state")
+    snapshot = log.snapshots[i]
+    state = decode(snapshot.state)
+    random = Random()
+    random.setstate(snapshot.random)
+    # apply_logged checked these actions as it wrote them
+    state = replay(state, log.actions[snapshot.index : index], random)
+    return state, random
+
+
+def _start_round(writer: LogWriter, state: GameState, random: Random) -> None:
+    writer.round_number = state.round_number
+    writer.file.write(_ROUND.pack(b"R", writer.count, state.round_number))
+    _snapshot(writer, state, random)
+
+
+def _snapshot(writer: LogWriter, state: GameState, random: Random) -> None:
+    encoded = encode(state)
+    version, words, gauss = random.getstate()
+    writer.file.write(_SNAPSHOT.pack(b"S", writer.count, len(encoded)))
+    writer.file.write(encoded)
+    writer.file.write(
+        _RANDOM.pack(version, *words, math.nan if gauss is None else gauss)
+    )
+    writer.file.flush()
+
+
+def _encode_action(action: PlayerAction) -> bytes:
+    match action:
+        case SelectPass(cards=(a, b, c)):
+            return _ACTION.pack(b"A", _PASS, a.index, b.index, c.index)
+        case PlayCard(card=card):
+            return _ACTION.pack(b"A", _PLAY, card.index, _UNUSED, _UNUSED)
+        case ChooseMoonOption(add_to_others=add):
+            return _ACTION.pack(b"A", _MOON, add, _UNUSED, _UNUSED)
+
+
+def _decode_action(kind: int, a: int, b: int, c: int) -> PlayerAction:
+    if kind == _PASS:
+        return SelectPass(cards=(T.CARDS[a], T.CARDS[b], T.CARDS[c]))
+    if kind == _PLAY:
+        return PlayCard(card=T.CARDS[a])
+    if kind == _MOON:
+        return ChooseMoonOption(add_to_others=bool(a))
+    raise ValueError(f"Bad action kind {kind}")
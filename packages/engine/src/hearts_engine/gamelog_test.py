@@ -0,0 +1,120 @@
+"""Tests for the append-only game log."""
+
+import tempfile
+from pathlib import Path
+from random import Random
+
+import pytest
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from . import types as T
+from .gamelog import LogWriter
+from .gamelog import apply_logged
+from .gamelog import begin
+from .gamelog import read_log
+from .gamelog import rebuild
+from .main import new_game
+from .rules import valid_actions_for_state
+from .state import GameState
+
+
+def _logged_game(path: Path, seed: int, every: int) -> list[GameState]:
+    """Play a random game to the end with a log; its states in order."""
+    random = Random(seed)
+    choices = Random(seed + 1)
+    state = new_game(random, game_id=f"game-{seed}")
+    states = [state]
+    with LogWriter.create(path, seed, every) as writer:
+        begin(writer, state, random)
+        while state.phase != T.Phase.GAME_END:
+            action = choices.choice(valid_actions_for_state(state))
+            result = apply_logged(writer, state, action, random)
+            assert isinstance(result, T.ActionSuccess), result
+            state = result.new_state
+            states.append(state)
+    return states
+
+
+class DescribeRebuild:
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=5, deadline=None)
+    def it_rebuilds_every_state_of_a_game(self, seed: int) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "game.log"
+            states = _logged_game(path, seed, every=16)
+            log = read_log(path)
+            assert len(log.actions) == len(states) - 1
+            for index, state in enumerate(states):
+                assert rebuild(log, index)[0] == state
+
+    def it_replays_at_most_a_snapshot_interval(self, tmp_path: Path) -> None:
+        path = tmp_path / "game.log"
+        _logged_game(path, 7, every=16)
+        log = read_log(path)
+        starts = [s.index for s in log.snapshots]
+        assert starts[0] == 0
+        assert max(b - a for a, b in zip(starts, starts[1:])) <= 16
+        assert {index for index, _ in log.rounds} <= set(starts)
+        assert [n for _, n in log.rounds] == list(range(len(log.rounds)))
+
+
+class DescribeLogWriter:
+    def it_resumes_after_a_torn_record(self, tmp_path: Path) -> None:
+        path = tmp_path / "game.log"
+        states = _logged_game(path, 3, every=16)
+        full = read_log(path)
+        with open(path, "r+b") as f:
+            f.truncate(full.size - 2)  # cut the last action short
+        writer, state, random = LogWriter.resume(path)
+        assert state == states[-2]
+        with writer:
+            result = apply_logged(writer, state, full.actions[-1], random)
+        assert isinstance(result, T.ActionSuccess), result
+        assert result.new_state == states[-1]
+        log = read_log(path)
+        assert log.actions == full.actions
+        assert rebuild(log, len(log.actions))[0] == states[-1]
+
+    def it_continues_a_game_after_resuming(self, tmp_path: Path) -> None:
+        path = tmp_path / "game.log"
+        random = Random(5)
+        state = new_game(random, game_id="resumed")
+        with LogWriter.create(path, 5) as writer:
+            begin(writer, state, random)
+        writer, state, random = LogWriter.resume(path)
+        with writer:
+            for _ in range(10):
+                action = valid_actions_for_state(state)[0]
+                result = apply_logged(writer, state, action, random)
+                assert isinstance(result, T.ActionSuccess), result
+                state = result.new_state
+        log = read_log(path)
+        assert len(log.actions) == 10
+        assert rebuild(log, 10)[0] == state
+
+    def it_rejects_other_files(self, tmp_path: Path) -> None:
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 32)
+        with pytest.raises(ValueError):
+            read_log(path)
+
+    def it_rejects_a_torn_header(self, tmp_path: Path) -> None:
+        path = tmp_path / "game.log"
+        LogWriter.create(path, 5).close()
+        path.write_bytes(path.read_bytes()[:10])
+        with pytest.raises(ValueError):
+            read_log(path)
+
+    def it_cannot_resume_a_log_without_a_starting_state(
+        self, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "game.log"
+        LogWriter.create(path, 5).close()
+        log = read_log(path)
+        assert log.actions == () and log.snapshots == ()
+        with pytest.raises(ValueError):
+            rebuild(log, 0)
+        with pytest.raises(ValueError):
+            LogWriter.resume(path)
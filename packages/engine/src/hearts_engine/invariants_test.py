@@ -12,6 +12,7 @@ from .cards import draw_three
 from .main import apply_action
 from .main import new_game
 from .rules import valid_actions_for_state
+from .scoring import round_points
 from .state import GameState
 from .state import SelectPass
 from .state import pass_direction_for_round
@@ -107,13 +108,38 @@ class DescribeStatefulInvariants:
             total = len(hand_cards) + len(trick_cards) + len(won_cards)
             assert total == 52, f"Card count mismatch: {total}"
 
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=5000)
+    def it_keeps_round_bookkeeping_in_step_with_tricks(
+        self, seed: int
+    ) -> None:
+        """Incremental counters match a rescan of tricks_won."""
+        random = Random(seed)
+        game: GameState = new_game(random)
+        for _ in range(300):
+            if game.phase == T.Phase.GAME_END:
+                break
+            result = apply_action(
+                game, valid_actions_for_state(game)[0], random
+            )
+            assert isinstance(result, T.ActionSuccess), result
+            game = result.new_state
+
+            points = [round_points(tw) for tw in game.tricks_won]
+            assert list(game.round_points) == points
+            assert game.tricks_played == sum(len(tw) for tw in game.tricks_won)
+            assert game.point_takers == sum(1 for p in points if p)
+
     @given(st.integers(min_value=0, max_value=10000))
     @settings(max_examples=10, deadline=5000)
     def it_terminates_within_reasonable_actions(self, seed: int) -> None:
         """Game reaches GAME_END within bounded actions."""
         random = Random(seed)
         game: GameState = new_game(random)
-        max_actions = 1000  # Generous upper bound
+        # Generous upper bound. Actions come back in card order, so valid[0]
+        # always plays low and picks the -26 moon option, which drags out
+        # some games past 1000 actions.
+        max_actions = 2000
 
         for _ in range(max_actions):
             if game.phase == T.Phase.GAME_END:
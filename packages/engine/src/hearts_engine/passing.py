@@ -11,6 +11,10 @@ from .state import PendingPasses
 from .state import pass_target
 from .state import update_pending_passes
 from .state import update_player
+from .zobrist import HAND
+from .zobrist import PENDING_PASS
+from .zobrist import move_phase
+from .zobrist import move_turn
 
 
 def apply_pass(
@@ -32,22 +36,33 @@ def apply_pass(
     if len(set(cards)) != 3:
         return T.ActionFailure(error="Must select 3 different cards")
 
+    return T.ActionSuccess(new_state=trusted_pass(state, cards))
+
+
+def trusted_pass(
+    state: GameState, cards: tuple[T.Card, T.Card, T.Card]
+) -> GameState:
+    """apply_pass without its checks, for a pass known to be valid."""
+    player = state.current_player
     pending = update_pending_passes(state.pending_passes, player, cards)
-    state = dataclasses.replace(state, pending_passes=pending)
+    key = state.key
+    for card in cards:
+        key ^= PENDING_PASS[player][card.index]
+    state = dataclasses.replace(state, pending_passes=pending, next_key=key)
 
     if all(p is not None for p in state.pending_passes):
         state = execute_passes(state)
         leader = find_two_of_clubs_holder(state.hands)
         state = start_playing_phase(state, leader)
     else:
+        next_player = next_player_for_passing(player, state.pending_passes)
         state = dataclasses.replace(
             state,
-            current_player=next_player_for_passing(
-                player, state.pending_passes
-            ),
+            current_player=next_player,
+            next_key=move_turn(state.key, player, next_player),
         )
 
-    return T.ActionSuccess(new_state=state)
+    return state
 
 
 def next_player_for_passing(
@@ -66,11 +81,16 @@ def execute_passes(state: GameState) -> GameState:
     received: dict[T.PlayerId, list[T.Card]] = {0: [], 1: [], 2: [], 3: []}
 
     players = state.players
+    key = state.key
     # First pass: remove cards from each player's hand and track received
     for player in T.PLAYER_IDS:
         cards = state.pending_passes[player]
         assert cards is not None, player
-        received[pass_target(player, state.pass_direction)].extend(cards)
+        target = pass_target(player, state.pass_direction)
+        received[target].extend(cards)
+        for card in cards:
+            key ^= PENDING_PASS[player][card.index] ^ HAND[player][card.index]
+            key ^= HAND[target][card.index]
         players = update_player(
             players, player, hand=Hand(players[player].hand - set(cards))
         )
@@ -82,15 +102,20 @@ def execute_passes(state: GameState) -> GameState:
         )
 
     return dataclasses.replace(
-        state, players=players, pending_passes=(None, None, None, None)
+        state,
+        players=players,
+        pending_passes=(None, None, None, None),
+        next_key=key,
     )
 
 
 def start_playing_phase(state: GameState, leader: T.PlayerId) -> GameState:
     """Transition to playing phase."""
+    key = move_phase(state.key, state.phase, T.Phase.PLAYING)
     return dataclasses.replace(
         state,
         phase=T.Phase.PLAYING,
         trick=Trick(lead=leader),
         current_player=leader,
+        next_key=move_turn(key, state.current_player, leader),
     )
@@ -6,11 +6,18 @@ from random import Random
 from . import types as T
 from .card import Trick
 from .cards import Hand
+from .cards import card_bit
 from .rules import is_first_trick
+from .rules import is_valid_play
 from .rules import trick_winner
-from .rules import valid_plays
+from .scoring import trick_points
 from .state import GameState
 from .state import update_player
+from .zobrist import HAND
+from .zobrist import HEARTS_BROKEN
+from .zobrist import TRICK
+from .zobrist import WON
+from .zobrist import move_turn
 
 
 def apply_play(
@@ -27,28 +34,49 @@ def apply_play(
     if card not in hand:
         return T.ActionFailure(error="Card not in hand")
 
-    is_first = is_first_trick(state.tricks_won)
-    if card not in valid_plays(
-        hand, state.trick.lead_suit, is_first, state.hearts_broken
+    is_first = is_first_trick(state.tricks_played)
+    if not is_valid_play(
+        card, hand, state.trick.lead_suit, is_first, state.hearts_broken
     ):
         return T.ActionFailure(error=f"Invalid play: {card}")
 
+    return T.ActionSuccess(new_state=trusted_play(state, card, random))
+
+
+def trusted_play(state: GameState, card: T.Card, random: Random) -> GameState:
+    """apply_play without its checks, for a play known to be valid."""
+    assert state.trick is not None
+    player = state.current_player
+    hand = state.players[player].hand
     trick = state.trick.with_play(player, card)
-    state = dataclasses.replace(
-        state,
-        players=update_player(state.players, player, hand=Hand(hand - {card})),
-        trick=trick,
-        hearts_broken=state.hearts_broken or card.suit == T.Suit.HEARTS,
+    hearts_broken = state.hearts_broken or card.suit == T.Suit.HEARTS
+    key = state.key ^ HAND[player][card.index] ^ TRICK[player][card.index]
+    if hearts_broken != state.hearts_broken:
+        key ^= HEARTS_BROKEN
+    players = update_player(
+        state.players, player, hand=Hand.from_mask(hand.mask & ~card_bit(card))
     )
 
     if len(trick) == 4:
-        state = complete_trick(state, random)
-    else:
         state = dataclasses.replace(
-            state, current_player=T.player_id(player + 1)
+            state,
+            players=players,
+            trick=trick,
+            hearts_broken=hearts_broken,
+            next_key=key,
         )
+        return complete_trick(state, random)
 
-    return T.ActionSuccess(new_state=state)
+    # One replace per play: it is most of the cost of a replay
+    next_player = T.player_id(player + 1)
+    return dataclasses.replace(
+        state,
+        players=players,
+        trick=trick,
+        hearts_broken=hearts_broken,
+        current_player=next_player,
+        next_key=move_turn(key, player, next_player),
+    )
 
 
 def complete_trick(state: GameState, random: Random) -> GameState:
@@ -57,15 +85,25 @@ def complete_trick(state: GameState, random: Random) -> GameState:
 
     assert state.trick is not None
     winner = trick_winner(state.trick)
+    points = trick_points(state.trick)
+    winner_state = state.players[winner]
+    new_taker = points > 0 and winner_state.round_points == 0
+    key = move_turn(state.key, state.current_player, winner)
+    for pid, card in state.trick.items():
+        key ^= TRICK[pid][card.index] ^ WON[winner][card.index]
     state = dataclasses.replace(
         state,
         players=update_player(
             state.players,
             winner,
-            tricks_won=(*state.players[winner].tricks_won, state.trick),
+            tricks_won=(*winner_state.tricks_won, state.trick),
+            round_points=winner_state.round_points + points,
         ),
         trick=Trick(lead=winner),
         current_player=winner,
+        tricks_played=state.tricks_played + 1,
+        point_takers=state.point_takers + new_taker,
+        next_key=key,
     )
 
     if all(len(p.hand) == 0 for p in state.players):
@@ -0,0 +1,261 @@
+"""Compact archive of finished games, read through a memory map.
+
+A game is its seed and the actions applied to new_game(Random(seed)), so a
+record holds just those: the passes by seat and the 52 plays in order, one
+byte per card, for each round, with the final scores for scans that need
+nothing else. write_game checks a game as it replays it, so replay_record
+can trust the archive and skip the checks unless asked. GameRecords maps
+the file read-only and reads each record with one slice of the map, so a
+scan makes no Python object per card.
+
+Layout (little-endian):
+
+    header   8 bytes  magic, version
+    records           back to back, one per game:
+        game  17 bytes  seed, round count, final scores
+        round 65 bytes  per round: three card indices passed by each seat
+                        (0xFF in hold rounds), the 52 cards in the order
+                        played, and the moon choice (1 add to others, 0
+                        subtract, 0xFF none)
+    index    8 bytes  per record, its offset; 8-byte aligned
+    footer  16 bytes  index offset, record count
+
+The index is written by RecordWriter.close, so a file is readable only
+once its writer has been closed; GameRecords checks the footer against
+the file size and rejects a file without one. The index is read in place
+on little-endian hosts, and copied with its bytes swapped on others.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from random import Random
+from types import TracebackType
+from typing import BinaryIO
+from typing import Self
+
+from . import types as T
+from .main import apply_action
+from .main import new_game
+from .replay import replay
+from .state import ChooseMoonOption
+from .state import GameState
+from .state import PlayCard
+from .state import PlayerAction
+from .state import SelectPass
+
+MAGIC = b"HGR\0"
+VERSION = 1
+_HEADER = struct.Struct("<4sI")
+_GAME = struct.Struct("<qB4h")
+_FOOTER = struct.Struct("<QQ")
+_PASSES = 12
+_PLAYS = _PASSES + 52
+ROUND_SIZE = _PLAYS + 1
+_NONE = 0xFF
+
+
+@dataclass(frozen=True, slots=True)
+class GameRecord:
+    """One archived game, with ROUND_SIZE bytes per round."""
+
+    seed: int
+    scores: tuple[int, ...]
+    rounds: bytes
+
+
+class RecordWriter:
+    """Appends finished games to a new archive."""
+
+    __slots__ = ("file", "offsets")
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.offsets = array("Q")
+
+    @classmethod
+    def create(cls, path: str | os.PathLike[str]) -> Self:
+        file = open(path, "wb")
+        file.write(_HEADER.pack(MAGIC, VERSION))
+        return cls(file)
+
+    def close(self) -> None:
+        """Write the index and footer, and close the file."""
+        if self.file.closed:
+            return
+        self.file.write(bytes(-self.file.tell() % 8))
+        start = self.file.tell()
+        offsets = array("Q", self.offsets)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        self.file.write(offsets.tobytes())
+        self.file.write(_FOOTER.pack(start, len(self.offsets)))
+        self.file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class GameRecords:
+    """An archive file, mapped read-only."""
+
+    __slots__ = ("offsets", "data", "_map")
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map)
+        if size < _HEADER.size + _FOOTER.size:
+            self._map.close()
+            raise ValueError(f"Not a game archive: {path}")
+        magic, version = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"Not a version {VERSION} game archive: {path}")
+        start, count = _FOOTER.unpack_from(self._map, size - _FOOTER.size)
+        if start % 8 or start + 8 * count + _FOOTER.size != size:
+            self._map.close()
+            raise ValueError(f"Archive has no index, or a torn one: {path}")
+        self.data = memoryview(self._map)
+        # The offset of each record, in the order written
+        self.offsets = self.data[start : start + 8 * count].cast("Q")
+        if sys.byteorder == "big":
+            swapped = array("Q", self.offsets)
+            swapped.byteswap()
+            self.offsets.release()
+            self.offsets = memoryview(swapped)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def close(self) -> None:
+        self.offsets.release()
+        self.data.release()
+        self._map.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def write_game(
+    writer: RecordWriter, seed: int, actions: Iterable[PlayerAction]
+) -> GameState:
+    """Append a finished game, replayed from new_game(Random(seed)).
+
+    Returns the final state; raises ValueError if an action is invalid or
+    the game is not over.
+    """
+    random = Random(seed)
+    state = new_game(random, game_id=str(seed))
+    rounds = bytearray()
+    current = _empty_round()
+    plays = _PASSES
+    for action in actions:
+        match action:
+            case SelectPass(cards=cards):
+                seat = 3 * state.current_player
+                current[seat : seat + 3] = bytes(c.index for c in cards)
+            case PlayCard(card=card):
+                current[plays] = card.index
+                plays += 1
+            case ChooseMoonOption(add_to_others=add):
+                current[_PLAYS] = add
+        result = apply_action(state, action, random)
+        if not isinstance(result, T.ActionSuccess):
+            raise ValueError(f"Invalid action {action}: {result.error}")
+        new_state = result.new_state
+        if (
+            new_state.round_number != state.round_number
+            or new_state.phase == T.Phase.GAME_END
+        ):
+            rounds += current
+            current = _empty_round()
+            plays = _PASSES
+        state = new_state
+    if state.phase != T.Phase.GAME_END:
+        raise ValueError("The game is not over")
+    writer.offsets.append(writer.file.tell())
+    scores = (p.score for p in state.players)
+    writer.file.write(_GAME.pack(seed, len(rounds) // ROUND_SIZE, *scores))
+    writer.file.write(rounds)
+    return state
+
+
+def game_record(records: GameRecords, i: int) -> GameRecord:
+    """The i-th record."""
+    offset = records.offsets[i]
+    seed, count, *scores = _GAME.unpack_from(records.data, offset)
+    start = offset + _GAME.size
+    return GameRecord(
+        seed=seed,
+        scores=tuple(scores),
+        rounds=records.data[start : start + count * ROUND_SIZE].tobytes(),
+    )
+
+
+def iter_records(records: GameRecords) -> Iterator[GameRecord]:
+    """Every record, in the order written."""
+    for i in range(len(records)):
+        yield game_record(records, i)
+
+
+def record_rounds(record: GameRecord) -> Iterator[tuple[bytes, bytes, int]]:
+    """(passes by seat, cards in play order, moon choice) for each round."""
+    rounds = record.rounds
+    for start in range(0, len(rounds), ROUND_SIZE):
+        yield (
+            rounds[start : start + _PASSES],
+            rounds[start + _PASSES : start + _PLAYS],
+            rounds[start + _PLAYS],
+        )
+
+
+def record_actions(record: GameRecord) -> Iterator[PlayerAction]:
+    """The game's actions, in the order they were applied.
+
+    Seats pass in order from 0, and a moon choice follows the last play.
+    """
+    for passes, plays, moon in record_rounds(record):
+        if passes[0] != _NONE:
+            for seat in range(0, _PASSES, 3):
+                a, b, c = passes[seat : seat + 3]
+                yield SelectPass(cards=(T.CARDS[a], T.CARDS[b], T.CARDS[c]))
+        for card in plays:
+            yield PlayCard(card=T.CARDS[card])
+        if moon != _NONE:
+            yield ChooseMoonOption(add_to_others=bool(moon))
+
+
+def replay_record(record: GameRecord, verify: bool = False) -> GameState:
+    """The final state of an archived game; verify checks every action."""
+    random = Random(record.seed)
+    state = new_game(random, game_id=str(record.seed))
+    return replay(state, record_actions(record), random, verify)
+
+
+def _empty_round() -> bytearray:
+    round_ = bytearray(ROUND_SIZE)
+    round_[:_PASSES] = bytes([_NONE]) * _PASSES
+    round_[_PLAYS] = _NONE
+    return round_
@@ -0,0 +1,94 @@
+"""Tests for the game archive."""
+
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from . import types as T
+from .main import apply_action
+from .main import new_game
+from .records import ROUND_SIZE
+from .records import GameRecords
+from .records import RecordWriter
+from .records import game_record
+from .records import iter_records
+from .records import record_actions
+from .records import record_rounds
+from .records import replay_record
+from .records import write_game
+from .rules import valid_actions_for_state
+from .state import GameState
+from .state import PlayerAction
+
+
+def _random_game(seed: int) -> list[PlayerAction]:
+    """The actions of a game played at random from new_game(Random(seed))."""
+    random = Random(seed)
+    choices = Random(-seed)
+    state = new_game(random, game_id=str(seed))
+    actions: list[PlayerAction] = []
+    while state.phase != T.Phase.GAME_END:
+        action = choices.choice(valid_actions_for_state(state))
+        result = apply_action(state, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        actions.append(action)
+        state = result.new_state
+    return actions
+
+
+class DescribeGameRecords:
+    def it_reads_back_every_game_written(self, tmp_path: Path) -> None:
+        path = tmp_path / "games.bin"
+        games = {seed: _random_game(seed) for seed in range(1, 6)}
+        finals: list[GameState] = []
+        with RecordWriter.create(path) as writer:
+            for seed, actions in games.items():
+                finals.append(write_game(writer, seed, actions))
+        with GameRecords(path) as records:
+            assert len(records) == len(games)
+            for record, (seed, actions), final in zip(
+                iter_records(records), games.items(), finals
+            ):
+                assert record.seed == seed
+                assert record.scores == tuple(p.score for p in final.players)
+                assert list(record_actions(record)) == actions
+                assert replay_record(record) == final
+                rounds = list(record_rounds(record))
+                assert len(rounds) == final.round_number + 1
+                for _, plays, _ in rounds:
+                    assert sorted(plays) == list(range(52))
+
+    def it_takes_a_game_header_and_65_bytes_a_round(
+        self, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "games.bin"
+        with RecordWriter.create(path) as writer:
+            write_game(writer, 7, _random_game(7))
+            write_game(writer, 8, _random_game(8))
+        with GameRecords(path) as records:
+            first = game_record(records, 0)
+            size = records.offsets[1] - records.offsets[0]
+            assert size == 17 + len(first.rounds)
+            assert len(first.rounds) % ROUND_SIZE == 0
+
+    def it_rejects_unfinished_games(self, tmp_path: Path) -> None:
+        with RecordWriter.create(tmp_path / "games.bin") as writer:
+            with pytest.raises(ValueError):
+                write_game(writer, 3, _random_game(3)[:-1])
+
+    def it_rejects_other_files(self, tmp_path: Path) -> None:
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 32)
+        with pytest.raises(ValueError):
+            GameRecords(path)
+
+    def it_rejects_an_archive_its_writer_did_not_close(
+        self, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "games.bin"
+        writer = RecordWriter.create(path)
+        write_game(writer, 5, _random_game(5))
+        writer.file.close()
+        with pytest.raises(ValueError):
+            GameRecords(path)
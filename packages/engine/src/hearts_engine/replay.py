@@ -0,0 +1,72 @@
+"""Replaying action sequences from our own logs.
+
+apply_action checks every action against the rules and wraps each result;
+replaying a log we wrote ourselves, every check passes. replay applies the
+actions with the trusted transitions instead, which skip the checks and
+build only the states. verify=True goes through apply_action and raises
+ValueError at the first invalid action, for audits of a log's integrity.
+"""
+
+from collections.abc import Iterable
+from collections.abc import Sequence
+from random import Random
+
+from . import types as T
+from .main import apply_action
+from .passing import trusted_pass
+from .play import trusted_play
+from .round import trusted_moon_choice
+from .state import ChooseMoonOption
+from .state import GameState
+from .state import PlayCard
+from .state import PlayerAction
+from .state import SelectPass
+
+
+def replay(
+    state: GameState,
+    actions: Iterable[PlayerAction],
+    random: Random,
+    verify: bool = False,
+) -> GameState:
+    """The state after the actions, which advance the Random as played."""
+    if verify:
+        return _verified(state, actions, random)
+    for action in actions:
+        match action:
+            case PlayCard(card=card):
+                state = trusted_play(state, card, random)
+            case SelectPass(cards=cards):
+                state = trusted_pass(state, cards)
+            case ChooseMoonOption(add_to_others=add_to_others):
+                state = trusted_moon_choice(state, add_to_others, random)
+    return state
+
+
+def replay_checkpoints(
+    state: GameState,
+    actions: Sequence[PlayerAction],
+    random: Random,
+    at: Iterable[int],
+    verify: bool = False,
+) -> list[GameState]:
+    """The states after the first n actions, for each n in ascending at."""
+    states: list[GameState] = []
+    done = 0
+    for n in at:
+        assert done <= n <= len(actions), (done, n)
+        state = replay(state, actions[done:n], random, verify)
+        states.append(state)
+        done = n
+    return states
+
+
+def _verified(
+    state: GameState, actions: Iterable[PlayerAction], random: Random
+) -> GameState:
+    for i, action in enumerate(actions):
+        result = apply_action(state, action, random)
+        if not isinstance(result, T.ActionSuccess):
+            raise ValueError(f"Action {i}, {action}: {result.error}")
+        state = result.new_state
+    return state
@@ -0,0 +1,71 @@
+"""Tests for trusted replay."""
+
+from random import Random
+
+import pytest
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from . import types as T
+from .main import apply_action
+from .main import new_game
+from .replay import replay
+from .replay import replay_checkpoints
+from .rules import valid_actions_for_state
+from .state import GameState
+from .state import PlayCard
+from .state import PlayerAction
+
+
+def _random_game(seed: int) -> tuple[list[GameState], list[PlayerAction]]:
+    """The states and actions of a game played at random."""
+    random = Random(seed)
+    choices = Random(-seed)
+    state = new_game(random, game_id="replayed")
+    states = [state]
+    actions: list[PlayerAction] = []
+    while state.phase != T.Phase.GAME_END:
+        action = choices.choice(valid_actions_for_state(state))
+        result = apply_action(state, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        actions.append(action)
+        state = result.new_state
+        states.append(state)
+    return states, actions
+
+
+class DescribeReplay:
+    @given(st.integers(min_value=0, max_value=10000), st.booleans())
+    @settings(max_examples=10, deadline=None)
+    def it_reaches_the_state_apply_action_does(
+        self, seed: int, verify: bool
+    ) -> None:
+        states, actions = _random_game(seed)
+        random = Random(seed)
+        start = new_game(random, game_id="replayed")
+        final = replay(start, actions, random, verify)
+        assert final == states[-1]
+        assert final.key == states[-1].key
+
+    def it_stops_an_audit_at_an_invalid_action(self) -> None:
+        states, actions = _random_game(4)
+        random = Random(4)
+        start = new_game(random, game_id="replayed")
+        state = states[7]
+        hand = state.players[state.current_player].hand
+        stray = next(c for c in T.CARDS if c not in hand)
+        actions[7] = PlayCard(card=stray)
+        with pytest.raises(ValueError, match="Action 7"):
+            replay(start, actions, random, verify=True)
+
+
+class DescribeReplayCheckpoints:
+    def it_returns_the_states_at_each_index(self) -> None:
+        states, actions = _random_game(9)
+        random = Random(9)
+        start = new_game(random, game_id="replayed")
+        at = [0, 5, 5, 60, len(actions)]
+        assert replay_checkpoints(start, actions, random, at) == [
+            states[n] for n in at
+        ]
@@ -9,25 +9,30 @@ from .cards import Deck
 from .cards import deal_hands
 from .rules import check_shot_moon
 from .rules import find_two_of_clubs_holder
-from .scoring import round_points
 from .state import GameState
 from .state import PlayerState
 from .state import pass_direction_for_round
 from .state import update_player
+from .zobrist import move_phase
+from .zobrist import move_turn
 
 LOSING_SCORE = 100
 
 
 def complete_round(state: GameState, random: Random) -> GameState:
     """Complete a round and score it."""
-    shooter = check_shot_moon(state.tricks_won)
+    shooter = check_shot_moon(state.round_points, state.point_takers)
     if shooter is not None:
+        key = move_phase(state.key, state.phase, T.Phase.ROUND_END)
         return dataclasses.replace(
-            state, phase=T.Phase.ROUND_END, current_player=shooter
+            state,
+            phase=T.Phase.ROUND_END,
+            current_player=shooter,
+            next_key=move_turn(key, state.current_player, shooter),
         )
 
     state = dataclasses.replace(
-        state, players=apply_normal_scoring(state.players)
+        state, players=apply_normal_scoring(state.players), next_key=state.key
     )
     return check_game_end(state, random)
 
@@ -37,9 +42,11 @@ def apply_normal_scoring(
 ) -> tuple[PlayerState, ...]:
     """Apply normal round scoring (no moon shot)."""
     for pid, player in zip(T.PLAYER_IDS, players):
-        points = round_points(player.tricks_won)
         players = update_player(
-            players, pid, round_score=points, score=player.score + points
+            players,
+            pid,
+            round_score=player.round_points,
+            score=player.score + player.round_points,
         )
     return players
 
@@ -51,10 +58,19 @@ def apply_moon_choice(
     if state.phase != T.Phase.ROUND_END:
         return T.ActionFailure(error="Not in round end phase")
 
-    shooter = check_shot_moon(state.tricks_won)
+    shooter = check_shot_moon(state.round_points, state.point_takers)
     if shooter is None or shooter != state.current_player:
         return T.ActionFailure(error="Not the moon shooter")
 
+    state = trusted_moon_choice(state, add_to_others, random)
+    return T.ActionSuccess(new_state=state)
+
+
+def trusted_moon_choice(
+    state: GameState, add_to_others: bool, random: Random
+) -> GameState:
+    """apply_moon_choice without its checks; the shooter is to choose."""
+    shooter = state.current_player
     players = state.players
     if add_to_others:
         for pid, player in zip(T.PLAYER_IDS, players):
@@ -75,15 +91,18 @@ def apply_moon_choice(
             if pid != shooter:
                 players = update_player(players, pid, round_score=0)
 
-    state = dataclasses.replace(state, players=players)
-    state = check_game_end(state, random)
-    return T.ActionSuccess(new_state=state)
+    state = dataclasses.replace(state, players=players, next_key=state.key)
+    return check_game_end(state, random)
 
 
 def check_game_end(state: GameState, random: Random) -> GameState:
     """Check if game should end."""
     if any(p.score >= LOSING_SCORE for p in state.players):
-        return dataclasses.replace(state, phase=T.Phase.GAME_END)
+        return dataclasses.replace(
+            state,
+            phase=T.Phase.GAME_END,
+            next_key=move_phase(state.key, state.phase, T.Phase.GAME_END),
+        )
     return start_new_round(state, random)
 
 
@@ -95,7 +114,12 @@ def start_new_round(state: GameState, random: Random) -> GameState:
     players = state.players
     for pid, hand in zip(T.PLAYER_IDS, deal_hands(Deck(), random)):
         players = update_player(
-            players, pid, hand=hand, round_score=0, tricks_won=()
+            players,
+            pid,
+            hand=hand,
+            round_score=0,
+            tricks_won=(),
+            round_points=0,
         )
 
     # Determine phase and starting player
@@ -121,4 +145,6 @@ def start_new_round(state: GameState, random: Random) -> GameState:
         hearts_broken=False,
         pending_passes=(None, None, None, None),
         phase=phase,
+        tricks_played=0,
+        point_takers=0,
     )
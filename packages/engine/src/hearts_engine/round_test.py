@@ -99,10 +99,18 @@ class DescribeMoonShooting:
             lead=0,
         )
         players = update_player(
-            game.players, 0, tricks_won=hearts_tricks + (final_trick,)
+            game.players,
+            0,
+            tricks_won=hearts_tricks + (final_trick,),
+            round_points=26,
         )
         game = dataclasses.replace(
-            game, phase=T.Phase.ROUND_END, current_player=0, players=players
+            game,
+            phase=T.Phase.ROUND_END,
+            current_player=0,
+            players=players,
+            tricks_played=13,
+            point_takers=1,
         )
 
         result = apply_action(
@@ -144,10 +152,18 @@ class DescribeMoonShooting:
             lead=0,
         )
         players = update_player(
-            game.players, 0, tricks_won=hearts_tricks + (final_trick,)
+            game.players,
+            0,
+            tricks_won=hearts_tricks + (final_trick,),
+            round_points=26,
         )
         game = dataclasses.replace(
-            game, phase=T.Phase.ROUND_END, current_player=0, players=players
+            game,
+            phase=T.Phase.ROUND_END,
+            current_player=0,
+            players=players,
+            tricks_played=13,
+            point_takers=1,
         )
 
         result = apply_action(
@@ -6,12 +6,15 @@ from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 from . import types as T
+from .card import QUEEN_OF_SPADES
 from .card import TWO_OF_CLUBS
 from .card import Trick
+from .cards import FULL_MASK
+from .cards import SUIT_MASKS
 from .cards import Cards
 from .cards import Hand
+from .cards import card_bit
 from .scoring import is_point_card
-from .scoring import round_points
 from .state import GameState
 
 if TYPE_CHECKING:
@@ -34,9 +37,9 @@ def trick_winner(trick: Trick) -> T.PlayerId:
     return winner
 
 
-def is_first_trick(tricks_won: Sequence[tuple[Trick, ...]]) -> bool:
+def is_first_trick(tricks_played: int) -> bool:
     """Check if this is the first trick of the round."""
-    return all(len(tw) == 0 for tw in tricks_won)
+    return tricks_played == 0
 
 
 CardRestriction = Callable[[Cards], Cards]
@@ -73,7 +76,7 @@ def _apply_restrictions(
 
 
 def valid_leads(hand: Hand, first_trick: bool, hearts_broken: bool) -> Cards:
-    """Get valid cards when leading a trick."""
+    """Get valid cards when leading a trick (reference implementation)."""
     if first_trick:
         restrictions = [two_of_clubs_only]
     elif hearts_broken:
@@ -84,23 +87,82 @@ def valid_leads(hand: Hand, first_trick: bool, hearts_broken: bool) -> Cards:
 
 
 def valid_follows(hand: Hand, lead_suit: T.Suit, first_trick: bool) -> Cards:
-    """Get valid cards when following a trick."""
+    """Get valid cards when following a trick (reference implementation)."""
     restrictions = [must_follow_suit(lead_suit)]
     if first_trick:
         restrictions.append(no_point_cards)
     return _apply_restrictions(hand, restrictions)
 
 
+_NO_HEARTS = FULL_MASK & ~SUIT_MASKS[T.Suit.HEARTS]
+_NO_POINTS = _NO_HEARTS & ~card_bit(QUEEN_OF_SPADES)
+
+
+def _restriction_masks(
+    lead_suit: T.Suit | None, first_trick: bool, hearts_broken: bool
+) -> tuple[int, ...]:
+    """The restrictions of valid_leads/valid_follows, as masks."""
+    if lead_suit is None:
+        if first_trick:
+            return (card_bit(TWO_OF_CLUBS),)
+        if hearts_broken:
+            return ()
+        return (_NO_HEARTS,)
+    if first_trick:
+        return (SUIT_MASKS[lead_suit], _NO_POINTS)
+    return (SUIT_MASKS[lead_suit],)
+
+
+# Keyed by (lead suit, first trick, hearts broken); applied in order with the
+# same empty-result fallback as _apply_restrictions.
+RESTRICTION_MASKS: dict[tuple[T.Suit | None, bool, bool], tuple[int, ...]] = {
+    (lead_suit, first_trick, hearts_broken): _restriction_masks(
+        lead_suit, first_trick, hearts_broken
+    )
+    for lead_suit in (None, *T.Suit)
+    for first_trick in (False, True)
+    for hearts_broken in (False, True)
+}
+
+
+def valid_plays_mask(
+    hand_mask: int,
+    lead_suit: T.Suit | None,
+    first_trick: bool,
+    hearts_broken: bool,
+) -> int:
+    """Mask of the valid cards in a hand mask."""
+    valid = hand_mask
+    for restriction in RESTRICTION_MASKS[
+        lead_suit, first_trick, hearts_broken
+    ]:
+        if valid & restriction:
+            valid &= restriction
+    return valid
+
+
 def valid_plays(
     hand: Hand,
     lead_suit: T.Suit | None,
     first_trick: bool,
     hearts_broken: bool,
 ) -> Cards:
-    """Get all valid cards to play (dispatcher)."""
-    if lead_suit is None:
-        return valid_leads(hand, first_trick, hearts_broken)
-    return valid_follows(hand, lead_suit, first_trick)
+    """Get all valid cards to play."""
+    return Cards.from_mask(
+        valid_plays_mask(hand.mask, lead_suit, first_trick, hearts_broken)
+    )
+
+
+def is_valid_play(
+    card: T.Card,
+    hand: Hand,
+    lead_suit: T.Suit | None,
+    first_trick: bool,
+    hearts_broken: bool,
+) -> bool:
+    """Check one card against the valid plays without building them."""
+    valid = valid_plays_mask(hand.mask, lead_suit, first_trick, hearts_broken)
+    return bool(valid & card_bit(card))
 
 
 def valid_pass_selections(
@@ -150,24 +212,25 @@ def valid_actions(
 
 def valid_actions_for_state(state: GameState) -> list[PlayerAction]:
     """Extract args from GameState and call valid_actions."""
-    tricks_won = state.tricks_won
     return valid_actions(
         phase=state.phase,
         current_player=state.current_player,
         hand=state.players[state.current_player].hand,
         trick=state.trick,
-        first_trick=is_first_trick(tricks_won),
+        first_trick=is_first_trick(state.tricks_played),
         hearts_broken=state.hearts_broken,
-        moon_shooter=check_shot_moon(tricks_won),
+        moon_shooter=check_shot_moon(state.round_points, state.point_takers),
     )
 
 
 def check_shot_moon(
-    tricks_won: Sequence[tuple[Trick, ...]],
+    round_points: Sequence[int], point_takers: int
 ) -> T.PlayerId | None:
     """Check if any player shot the moon. Returns player id or None."""
-    for pid, tw in zip(T.PLAYER_IDS, tricks_won):
-        if round_points(tw) == 26:
+    if point_takers != 1:
+        return None
+    for pid, points in zip(T.PLAYER_IDS, round_points):
+        if points == 26:
             return pid
     return None
 
@@ -9,7 +9,14 @@ from . import types as T
 from .card import QUEEN_OF_SPADES
 from .card import TWO_OF_CLUBS
 from .card import Trick
+from .cards import Hand
+from .rules import check_shot_moon
+from .rules import is_first_trick
+from .rules import is_valid_play
 from .rules import trick_winner
+from .rules import valid_follows
+from .rules import valid_leads
+from .rules import valid_plays
 from .scoring import card_points
 from .scoring import is_point_card
 from .scoring import trick_points
@@ -195,3 +202,53 @@ class DescribePointCardProperties:
 
         total = sum(card_points(c) for c in Deck())
         assert total == 26
+
+
+class DescribeRoundBookkeeping:
+    """Tests for the constant-time round queries."""
+
+    def it_is_first_trick_until_one_is_played(self) -> None:
+        assert is_first_trick(0)
+        assert not is_first_trick(1)
+
+    def it_finds_the_moon_shooter(self) -> None:
+        assert check_shot_moon((0, 26, 0, 0), point_takers=1) == 1
+
+    def it_finds_no_shooter_when_points_are_split(self) -> None:
+        assert check_shot_moon((13, 13, 0, 0), point_takers=2) is None
+        assert check_shot_moon((0, 13, 0, 0), point_takers=1) is None
+
+
+class DescribeValidPlays:
+    """The mask fast path agrees with the restriction functions."""
+
+    @given(
+        st.frozensets(cards, min_size=1, max_size=13),
+        st.sampled_from([None, *T.Suit]),
+        st.booleans(),
+        st.booleans(),
+    )
+    def it_matches_the_reference_restrictions(
+        self,
+        cards: frozenset[T.Card],
+        lead_suit: T.Suit | None,
+        first_trick: bool,
+        hearts_broken: bool,
+    ) -> None:
+        hand = Hand(cards)
+        if lead_suit is None:
+            if first_trick:
+                hand = Hand(cards | {TWO_OF_CLUBS})
+            expected = valid_leads(hand, first_trick, hearts_broken)
+        else:
+            expected = valid_follows(hand, lead_suit, first_trick)
+        valid = valid_plays(hand, lead_suit, first_trick, hearts_broken)
+        assert valid == expected
+        for card in hand:
+            assert is_valid_play(
+                card, hand, lead_suit, first_trick, hearts_broken
+            ) == (card in expected)
+
+    def it_rejects_cards_outside_the_hand(self) -> None:
+        hand = Hand([TWO_OF_CLUBS])
+        assert not is_valid_play(QUEEN_OF_SPADES, hand, None, False, True)
@@ -0,0 +1,172 @@
+"""Mutable make/unmake state for search.
+
+GameState allocates new tuples, players, tricks and hands on every play, which
+is right for the server and far too slow for lookahead. SearchState holds the
+playing phase of one round as card masks and flat int lists, mutated in place
+by make_move and restored by unmake_move. It is the one deliberate exception
+to the immutability rule: it lives only inside a search and is never stored.
+
+Moves are card indices. The rules are those of apply_play and complete_trick;
+a search stops at round end, where round.py would score and deal.
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+from random import Random
+
+from . import types as T
+from .play import apply_play
+from .rules import RESTRICTION_MASKS
+from .scoring import card_points
+from .state import GameState
+
+# card_points by card index
+POINTS: tuple[int, ...] = tuple(card_points(c) for c in T.CARDS)
+HEARTS_LANE = T.Suit.HEARTS.order
+
+# RESTRICTION_MASKS keyed by lead lane (4 = leading), first trick, broken
+_LANE_SUITS: tuple[T.Suit | None, ...] = (*T.Suit, None)
+_RESTRICTIONS: tuple[tuple[int, ...], ...] = tuple(
+    RESTRICTION_MASKS[suit, first_trick, hearts_broken]
+    for suit in _LANE_SUITS
+    for first_trick in (False, True)
+    for hearts_broken in (False, True)
+)
+
+
+@dataclass(slots=True)
+class SearchState:
+    """One round's playing phase, mutated in place by make/unmake."""
+
+    hands: list[int]  # card mask per player
+    lead: int
+    current: int
+    hearts_broken: bool
+    tricks_played: int
+    round_points: list[int]
+    point_takers: int
+    # Cards played in order; the last trick_size of them form the trick.
+    plays: list[int] = field(default_factory=list[int])
+    trick_size: int = 0
+    # One small int per play: the lead and hearts_broken it overwrote.
+    undo: list[int] = field(default_factory=list[int])
+
+    @classmethod
+    def from_game_state(cls, state: GameState) -> SearchState:
+        """Copy the playing-phase position out of a GameState."""
+        assert state.phase == T.Phase.PLAYING, state.phase
+        assert state.trick is not None
+        lead = state.trick.lead
+        plays = [
+            card.index
+            for seat in range(4)
+            if (card := state.trick[T.player_id(lead + seat)]) is not None
+        ]
+        return cls(
+            hands=[p.hand.mask for p in state.players],
+            lead=lead,
+            current=state.current_player,
+            hearts_broken=state.hearts_broken,
+            tricks_played=state.tricks_played,
+            round_points=list(state.round_points),
+            point_takers=state.point_takers,
+            plays=plays,
+            trick_size=len(plays),
+        )
+
+
+def legal_moves(search: SearchState) -> int:
+    """Mask of the cards the current player may play."""
+    if search.trick_size:
+        lane = search.plays[-search.trick_size] // 13
+    else:
+        lane = 4
+    code = lane * 4 + (search.tricks_played == 0) * 2 + search.hearts_broken
+    valid = search.hands[search.current]
+    for restriction in _RESTRICTIONS[code]:
+        if valid & restriction:
+            valid &= restriction
+    return valid
+
+
+def is_round_over(search: SearchState) -> bool:
+    """True once every card of the round has been played."""
+    hands = search.hands
+    return not (hands[0] | hands[1] | hands[2] | hands[3])
+
+
+def trick_winner_offset(cards: list[int]) -> int:
+    """Position (from the lead) of the winning card among 4 plays."""
+    best = 0
+    for i in (1, 2, 3):
+        if cards[i] // 13 == cards[best] // 13 and cards[i] > cards[best]:
+            best = i
+    return best
+
+
+def make_move(search: SearchState, card: T.CardIndex) -> None:
+    """Play a card for the current player. The card must be legal."""
+    player = search.current
+    assert search.hands[player] >> card & 1, (player, card)
+    search.undo.append(search.lead | search.hearts_broken << 2)
+    search.hands[player] ^= 1 << card
+    search.plays.append(card)
+    if card // 13 == HEARTS_LANE:
+        search.hearts_broken = True
+
+    if search.trick_size < 3:
+        search.trick_size += 1
+        search.current = (player + 1) % 4
+        return
+
+    trick = search.plays[-4:]
+    winner = (search.lead + trick_winner_offset(trick)) % 4
+    points = POINTS[trick[0]] + POINTS[trick[1]]
+    points += POINTS[trick[2]] + POINTS[trick[3]]
+    if points and not search.round_points[winner]:
+        search.point_takers += 1
+    search.round_points[winner] += points
+    search.tricks_played += 1
+    search.trick_size = 0
+    search.lead = search.current = winner
+
+
+def unmake_move(search: SearchState) -> None:
+    """Take back the last make_move."""
+    if search.trick_size == 0:
+        trick = search.plays[-4:]
+        winner = search.current
+        points = POINTS[trick[0]] + POINTS[trick[1]]
+        points += POINTS[trick[2]] + POINTS[trick[3]]
+        search.round_points[winner] -= points
+        if points and not search.round_points[winner]:
+            search.point_takers -= 1
+        search.tricks_played -= 1
+        search.trick_size = 3
+    else:
+        search.trick_size -= 1
+
+    card = search.plays.pop()
+    saved = search.undo.pop()
+    search.lead = saved & 3
+    search.hearts_broken = bool(saved >> 2)
+    player = (search.lead + search.trick_size) % 4
+    search.current = player
+    search.hands[player] |= 1 << card
+
+
+def to_game_state(
+    search: SearchState, origin: GameState, random: Random
+) -> GameState:
+    """Replay the search's plays onto the GameState it was copied from.
+
+    Plays go through apply_play, so a finished round is scored (and the next
+    dealt from random) exactly as in a live game.
+    """
+    state = origin
+    assert origin.trick is not None
+    for card in search.plays[len(origin.trick) :]:
+        result = apply_play(state, T.Card.from_index(card), random)
+        assert isinstance(result, T.ActionSuccess), result
+        state = result.new_state
+    return state
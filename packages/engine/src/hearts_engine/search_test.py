@@ -0,0 +1,113 @@
+"""Tests for the make/unmake search state."""
+
+import copy
+from random import Random
+
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from . import types as T
+from .cards import draw_three
+from .main import apply_action
+from .main import new_game
+from .rules import is_first_trick
+from .rules import valid_plays
+from .search import SearchState
+from .search import is_round_over
+from .search import legal_moves
+from .search import make_move
+from .search import to_game_state
+from .search import unmake_move
+from .state import GameState
+from .state import PlayCard
+from .state import SelectPass
+
+
+def _get_to_playing(seed: int) -> tuple[GameState, Random]:
+    random = Random(seed)
+    game: GameState = new_game(random)
+    for i in T.PLAYER_IDS:
+        cards = draw_three(game.players[i].hand, random)
+        result = apply_action(game, SelectPass(cards=cards), random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+    return game, random
+
+
+def _pick(mask: int, rng: Random) -> int:
+    bits = [i for i in range(52) if mask >> i & 1]
+    return rng.choice(bits)
+
+
+class DescribeSearchState:
+    """SearchState follows the engine's rules exactly."""
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=20, deadline=5000)
+    def it_agrees_with_apply_action(self, seed: int) -> None:
+        game, random = _get_to_playing(seed)
+        origin = game
+        search = SearchState.from_game_state(game)
+        rng = Random(seed)
+        while not is_round_over(search):
+            assert game.trick is not None
+            player = game.players[game.current_player]
+            expected = valid_plays(
+                player.hand,
+                game.trick.lead_suit,
+                is_first_trick(game.tricks_played),
+                game.hearts_broken,
+            )
+            assert legal_moves(search) == expected.mask
+            card = _pick(legal_moves(search), rng)
+
+            make_move(search, card)
+            result = apply_action(
+                game, PlayCard(card=T.Card.from_index(card)), random
+            )
+            assert isinstance(result, T.ActionSuccess), result
+            game = result.new_state
+            if is_round_over(search):
+                break
+            assert search.hands == [p.hand.mask for p in game.players]
+            assert search.current == game.current_player
+            assert search.round_points == list(game.round_points)
+            assert search.point_takers == game.point_takers
+            assert search.tricks_played == game.tricks_played
+            assert search.hearts_broken == game.hearts_broken
+
+        _, replay_random = _get_to_playing(seed)  # same RNG position
+        assert to_game_state(search, origin, replay_random) == game
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=20, deadline=5000)
+    def it_unmakes_back_to_the_start(self, seed: int) -> None:
+        game, _ = _get_to_playing(seed)
+        search = SearchState.from_game_state(game)
+        initial = copy.deepcopy(search)
+        rng = Random(seed)
+        snapshots: list[SearchState] = []
+        while not is_round_over(search):
+            snapshots.append(copy.deepcopy(search))
+            make_move(search, _pick(legal_moves(search), rng))
+        while snapshots:
+            unmake_move(search)
+            assert search == snapshots.pop()
+        assert search == initial
+
+    def it_copies_a_trick_in_progress(self) -> None:
+        game, random = _get_to_playing(42)
+        for _ in range(2):
+            search = SearchState.from_game_state(game)
+            card = T.Card.from_index(_pick(legal_moves(search), random))
+            result = apply_action(game, PlayCard(card=card), random)
+            assert isinstance(result, T.ActionSuccess), result
+            game = result.new_state
+        search = SearchState.from_game_state(game)
+        assert search.trick_size == 2
+        assert game.trick is not None
+        assert [T.Card.from_index(c) for c in search.plays] == [
+            game.trick[game.trick.lead],
+            game.trick[T.player_id(game.trick.lead + 1)],
+        ]
@@ -0,0 +1,115 @@
+"""Tests for the double-dummy solver."""
+
+from random import Random
+
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from . import types as T
+from .main import apply_action
+from .main import new_game
+from .rules import valid_actions_for_state
+from .search import SearchState
+from .search import is_round_over
+from .search import legal_moves
+from .search import make_move
+from .search import unmake_move
+from .solver import Table
+from .solver import final_score
+from .solver import move_values
+from .solver import solve
+from .solver import solve_player
+from .state import GameState
+
+
+def _endgame(seed: int, cards: int) -> GameState:
+    """Random play until a trick starts with `cards` cards in each hand."""
+    random = Random(seed)
+    game = new_game(random)
+    while not (
+        game.phase == T.Phase.PLAYING
+        and game.trick is not None
+        and len(game.trick) == 0
+        and len(game.players[game.current_player].hand) == cards
+    ):
+        action = random.choice(valid_actions_for_state(game))
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+    return game
+
+
+def _minimax(search: SearchState, player: int) -> int:
+    """Paranoid value by brute force."""
+    if is_round_over(search):
+        return final_score(search, player)
+    values: list[int] = []
+    legal = legal_moves(search)
+    while legal:
+        low = legal & -legal
+        legal ^= low
+        make_move(search, low.bit_length() - 1)
+        values.append(_minimax(search, player))
+        unmake_move(search)
+    return min(values) if search.current == player else max(values)
+
+
+class DescribeSolvePlayer:
+    @given(
+        st.integers(min_value=0, max_value=10000),
+        st.integers(min_value=1, max_value=3),
+    )
+    @settings(max_examples=30, deadline=None)
+    def it_agrees_with_brute_force(self, seed: int, cards: int) -> None:
+        search = SearchState.from_game_state(_endgame(seed, cards))
+        for player in T.PLAYER_IDS:
+            assert solve_player(search, player) == _minimax(search, player)
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=None)
+    def it_leaves_the_search_state_unchanged(self, seed: int) -> None:
+        search = SearchState.from_game_state(_endgame(seed, 3))
+        before = SearchState.from_game_state(_endgame(seed, 3))
+        solve_player(search, search.current)
+        assert search == before
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=None)
+    def it_can_share_a_table_between_searches(self, seed: int) -> None:
+        table: Table = {}
+        for cards in (2, 3):
+            search = SearchState.from_game_state(_endgame(seed, cards))
+            for player in T.PLAYER_IDS:
+                shared = solve_player(search, player, table)
+                assert shared == solve_player(search, player)
+
+
+class DescribeSolve:
+    def it_solves_every_player_from_a_game_state(self) -> None:
+        game = _endgame(3, 3)
+        values = solve(game)
+        search = SearchState.from_game_state(game)
+        assert values == tuple(_minimax(search, p) for p in T.PLAYER_IDS)
+
+    def it_never_scores_below_points_already_split(self) -> None:
+        game = _endgame(5, 4)
+        assert game.point_takers > 1  # no moon left
+        values = solve(game)
+        assert all(v >= p for v, p in zip(values, game.round_points))
+
+
+class DescribeMoveValues:
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=15, deadline=None)
+    def it_values_every_legal_card(self, seed: int) -> None:
+        search = SearchState.from_game_state(_endgame(seed, 3))
+        values = move_values(search)
+        legal = legal_moves(search)
+        assert sum(1 << card for card in values) == legal
+        player = search.current
+        assert min(values.values()) == solve_player(search, player)
+        for card, value in values.items():
+            make_move(search, card)
+            assert value == _minimax(search, player)
+            unmake_move(search)
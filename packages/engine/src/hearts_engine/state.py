@@ -1,13 +1,16 @@
 """Game state types for Hearts."""
 
 import dataclasses
+from dataclasses import InitVar
 from dataclasses import dataclass
+from dataclasses import field
 from typing import TypedDict
 from typing import Unpack
 
 from . import types as T
 from .card import Trick
 from .cards import Hand
+from .zobrist import position_key
 
 PASS_CYCLE: tuple[T.PassDirection, ...] = (
     T.PassDirection.LEFT,
@@ -88,6 +91,8 @@ class PlayerState:
     score: int = 0
     round_score: int = 0
     tricks_won: tuple[Trick, ...] = ()
+    # Points in tricks_won, kept up to date by complete_trick
+    round_points: int = 0
 
 
 class PlayerStateChanges(TypedDict, total=False):
@@ -97,6 +102,7 @@ class PlayerStateChanges(TypedDict, total=False):
     score: int
     round_score: int
     tricks_won: tuple[Trick, ...]
+    round_points: int
 
 
 def update_player(
@@ -136,6 +142,28 @@ class GameState:
     # Pass phase state (indexed by PlayerId, None = not yet selected)
     pending_passes: PendingPasses = (None, None, None, None)
 
+    # Round bookkeeping, kept up to date by complete_trick
+    tricks_played: int = 0
+    point_takers: int = 0  # players with nonzero round_points
+
+    # Zobrist key, kept up to date by the actions. They pass the new key as
+    # next_key; any other construction or replace() computes it from scratch.
+    key: int = field(init=False, repr=False, compare=False)
+    next_key: InitVar[int] = 0
+
+    def __post_init__(self, next_key: int) -> None:
+        object.__setattr__(self, "key", next_key or position_key(self))
+
+    def __hash__(self) -> int:
+        return self.key
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GameState):
+            return NotImplemented
+        if self.key != other.key:
+            return False
+        return all(getattr(self, f) == getattr(other, f) for f in _COMPARED)
+
     @property
     def pass_direction(self) -> T.PassDirection:
         """Current pass direction."""
@@ -150,3 +178,11 @@ class GameState:
     def tricks_won(self) -> tuple[tuple[Trick, ...], ...]:
         """All player tricks_won as a tuple."""
         return tuple(p.tricks_won for p in self.players)
+
+    @property
+    def round_points(self) -> tuple[int, ...]:
+        """All player round_points as a tuple."""
+        return tuple(p.round_points for p in self.players)
+
+
+_COMPARED = tuple(f.name for f in dataclasses.fields(GameState) if f.compare)
@@ -0,0 +1,318 @@
+"""Endgame tablebase: solved positions in a memory-mapped file.
+
+generate enumerates every endgame position with up to max_cards cards per
+hand, solves it and writes the results; bots open the file with Tablebase
+and probe it instead of searching again. Solving goes backwards from one
+card per hand: each position searches its next trick, as the paranoid
+solver would, and reads the rest of the round from the positions a card
+shorter. The
+file is mapped read-only, so worker processes share one copy in the page
+cache rather than each loading it into their heap.
+
+Positions are trick boundaries with no moon left (two or more players have
+taken points), where what is still to come does not depend on what was
+taken before. They are keyed by relative rank and relative seat, as in the
+solver's table, and the suits without points are interchangeable, so one
+entry covers every position that differs only in which cards were played,
+who leads, or which plain suit is which.
+
+Layout (native byte order, 8-byte aligned):
+
+    header  16 bytes  magic, version, max cards, entry count
+    keys     8 bytes  per entry, sorted
+    values   4 bytes  per entry: points still to come for the leader and
+                      each player after them, against the other three
+"""
+
+import itertools
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from types import TracebackType
+
+from . import types as T
+from .cards import SUIT_MASKS
+from .search import POINTS
+from .search import SearchState
+from .search import is_round_over
+from .search import legal_moves
+from .search import make_move
+from .search import unmake_move
+from .solver import QS
+from .state import GameState
+
+MAGIC = b"HTB\0"
+VERSION = 1
+# Largest cards per hand generate can enumerate: 2 cards are about 490,000
+# positions and a minute of CPython, 3 would be about 450 million
+MAX_CARDS = 2
+_HEADER = struct.Struct("=4sHHQ")
+_NO_QUEEN = 15
+_LOW = -1  # below every score
+_HIGH = 27  # above every score
+_HEARTS = SUIT_MASKS[T.Suit.HEARTS]
+_SPADES = SUIT_MASKS[T.Suit.SPADES]
+_PLAIN = (SUIT_MASKS[T.Suit.CLUBS], SUIT_MASKS[T.Suit.DIAMONDS])
+
+
+class Tablebase:
+    """A tablebase file, mapped read-only."""
+
+    __slots__ = ("max_cards", "keys", "values", "_map")
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_cards, count = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"Not a version {VERSION} tablebase: {path}")
+        self.max_cards: int = max_cards
+        view = memoryview(self._map)
+        start = _HEADER.size + 8 * count
+        # Sorted keys, and 4 bytes of points still to come per key.
+        self.keys = view[_HEADER.size : start].cast("Q")
+        self.values = view[start : start + 4 * count]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def close(self) -> None:
+        self.keys.release()
+        self.values.release()
+        self._map.close()
+
+    def __enter__(self) -> Tablebase:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def probe(tablebase: Tablebase, search: SearchState) -> tuple[int, ...] | None:
+    """Each player's guaranteed round score, or None if not in the table.
+
+    Agrees with the solver's solve_player for every player.
+    """
+    if (
+        search.trick_size
+        or search.point_takers < 2
+        or search.hands[search.lead].bit_count() > tablebase.max_cards
+    ):
+        return None
+    key = endgame_key(search)
+    keys = tablebase.keys
+    i = bisect_left(keys, key)
+    if i == len(keys) or keys[i] != key:
+        return None
+    to_come = tablebase.values[4 * i : 4 * i + 4]
+    lead = search.lead
+    points = search.round_points
+    return tuple(points[p] + to_come[(p - lead) % 4] for p in range(4))
+
+
+def lookup(tablebase: Tablebase, state: GameState) -> tuple[int, ...] | None:
+    """probe for a GameState in the playing phase."""
+    return probe(tablebase, SearchState.from_game_state(state))
+
+
+def endgame_key(search: SearchState) -> int:
+    """Key of a trick-boundary position with no moon left.
+
+    Each suit is reduced to the seats, relative to the leader, that hold its
+    live cards from low to high. Hearts come first, then spades while the
+    queen is live, then the suits without points in a canonical order.
+    """
+    lead = search.lead
+    hands = [search.hands[(lead + i) % 4] for i in range(4)]
+    live = hands[0] | hands[1] | hands[2] | hands[3]
+    segments = [_segment(hands, live & _HEARTS)]
+    plain = [_segment(hands, live & mask) for mask in _PLAIN]
+    if live >> QS & 1:
+        segments.append(_segment(hands, live & _SPADES))
+        queen = (live & _SPADES & ((1 << QS) - 1)).bit_count()
+    else:
+        plain.append(_segment(hands, live & _SPADES))
+        queen = _NO_QUEEN
+    segments.extend(sorted(plain))
+    key = queen
+    for length, owners in segments:
+        key = (key << 4 | length) << 2 * length | owners
+    return key
+
+
+def generate(path: str | os.PathLike[str], max_cards: int) -> int:
+    """Solve every endgame with up to max_cards cards per hand into path.
+
+    Returns the number of entries. Positions are solved a card count at a
+    time, from one card up: a position's values come from searching its
+    next trick and reading the rest from the entries a card shorter.
+    """
+    assert 1 <= max_cards <= MAX_CARDS, max_cards
+    entries: dict[int, bytes] = {}
+    for cards in range(1, max_cards + 1):
+        rows: dict[tuple[int, ...], bytes] = {}
+        for search in _positions(cards):
+            key = endgame_key(search)
+            if key not in entries:
+                values = _trick_values(search, entries, rows, 4)
+                lead = search.lead
+                entries[key] = bytes(
+                    values[p] - search.round_points[p]
+                    for p in ((lead + i) % 4 for i in range(4))
+                )
+    keys = sorted(entries)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, max_cards, len(keys)))
+        f.write(array("Q", keys).tobytes())
+        f.write(b"".join(entries[key] for key in keys))
+    return len(keys)
+
+
+def _trick_values(
+    search: SearchState,
+    entries: dict[int, bytes],
+    rows: dict[tuple[int, ...], bytes],
+    plies: int,
+) -> list[int]:
+    """Each player's guaranteed round score, searching the rest of the trick.
+
+    Each player's value is a paranoid search of its own, as in the solver:
+    the minimum where that player is to move and the maximum elsewhere. The
+    four share one walk of the tree. Once the trick is over, the entries
+    hold what is still to come; rows caches them by hands and leader,
+    which is cheaper than the key.
+    """
+    if not plies:
+        points = search.round_points
+        if is_round_over(search):
+            return list(points)
+        lead = search.lead
+        position = (lead, *search.hands)
+        row = rows.get(position)
+        if row is None:
+            row = rows[position] = entries[endgame_key(search)]
+        return [points[p] + row[(p - lead) % 4] for p in range(4)]
+    current = search.current
+    best = [_LOW] * 4
+    best[current] = _HIGH
+    legal = legal_moves(search)
+    while legal:
+        low = legal & -legal
+        legal ^= low
+        make_move(search, low.bit_length() - 1)
+        values = _trick_values(search, entries, rows, plies - 1)
+        unmake_move(search)
+        for p in range(4):
+            if p == current:
+                best[p] = min(best[p], values[p])
+            else:
+                best[p] = max(best[p], values[p])
+    return best
+
+
+def _segment(hands: list[int], suit: int) -> tuple[int, int]:
+    """(live cards, owners low to high at 2 bits each) for one suit."""
+    h0, h1, h2 = hands[0], hands[1], hands[2]
+    owners = 0
+    length = 0
+    while suit:
+        low = suit & -suit
+        suit ^= low
+        owners = owners << 2 | (
+            0 if h0 & low else 1 if h1 & low else 2 if h2 & low else 3
+        )
+        length += 1
+    return length, owners
+
+
+def _positions(cards: int) -> Iterator[SearchState]:
+    """Trick-boundary positions with cards per hand, seat 0 to lead.
+
+    Every canonical position appears at least once. Only the order of live
+    cards matters, so each suit gets its lowest ranks, with the queen of
+    spades placed among the spades as needed.
+    """
+    total = 4 * cards
+    for hearts in range(min(total, 13) + 1):
+        for spades in range(min(total - hearts, 13) + 1):
+            for clubs in range(min(total - hearts - spades, 13) + 1):
+                diamonds = total - hearts - spades - clubs
+                if diamonds > 13 or clubs < diamonds:
+                    continue  # too many, or clubs and diamonds swapped
+                for live in _suit_layouts(hearts, spades, clubs, diamonds):
+                    if sum(POINTS[card] for card in live) > 24:
+                        continue  # a moon is still possible
+                    if QS not in live and spades < clubs:
+                        continue  # spades without the queen are plain too
+                    for sequence in _owners([cards] * 4, total):
+                        yield _position(live, sequence, cards)
+
+
+def _owners(left: list[int], n: int) -> Iterator[tuple[int, ...]]:
+    """Every sequence of n seats using seat s left[s] times, in order.
+
+    The distinct orderings only, generated one at a time: there are
+    (4c)! / c!**4 of them for c cards each, against (4c)! permutations.
+    """
+    if not n:
+        yield ()
+        return
+    for seat in range(4):
+        if left[seat]:
+            left[seat] -= 1
+            for rest in _owners(left, n - 1):
+                yield (seat, *rest)
+            left[seat] += 1
+
+
+def _suit_layouts(
+    hearts: int, spades: int, clubs: int, diamonds: int
+) -> list[list[int]]:
+    """Live card indices for these suit lengths, low to high per suit."""
+    suits = [
+        _lowest(T.Suit.HEARTS, hearts),
+        _lowest(T.Suit.CLUBS, clubs),
+        _lowest(T.Suit.DIAMONDS, diamonds),
+    ]
+    others = [c.index for c in T.CARDS if c.suit == T.Suit.SPADES]
+    others.remove(QS)
+    layouts: list[list[int]] = []
+    if spades <= 12:
+        layouts.append([*others[:spades]])
+    for below in range(max(0, spades - 3), min(spades, 11)):
+        above = spades - 1 - below
+        layouts.append([*others[:below], QS, *others[len(others) - above :]])
+    return [sorted(itertools.chain(*suits, spade)) for spade in layouts]
+
+
+def _lowest(suit: T.Suit, n: int) -> list[int]:
+    return [c.index for c in T.CARDS if c.suit == suit][:n]
+
+
+def _position(
+    live: list[int], owners: tuple[int, ...], cards: int
+) -> SearchState:
+    hands = [0, 0, 0, 0]
+    for card, owner in zip(live, owners):
+        hands[owner] |= 1 << card
+    taken = 26 - sum(POINTS[card] for card in live)
+    hearts = sum(1 for card in live if card // 13 == T.Suit.HEARTS.order)
+    return SearchState(
+        hands=hands,
+        lead=0,
+        current=0,
+        hearts_broken=hearts < 13,
+        tricks_played=13 - cards,
+        # Any split with two takers: what is still to come is the same.
+        round_points=[taken - 1, 1, 0, 0],
+        point_takers=2,
+    )
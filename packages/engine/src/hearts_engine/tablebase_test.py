@@ -0,0 +1,117 @@
+"""Tests for the endgame tablebase."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from random import Random
+
+import pytest
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from . import types as T
+from .main import apply_action
+from .main import new_game
+from .rules import valid_actions_for_state
+from .search import SearchState
+from .solver import solve
+from .state import GameState
+from .tablebase import MAX_CARDS
+from .tablebase import Tablebase
+from .tablebase import endgame_key
+from .tablebase import generate
+from .tablebase import lookup
+from .tablebase import probe
+
+
+def _endgame(seed: int, cards: int) -> GameState:
+    """Random play until a trick starts with `cards` cards in each hand."""
+    random = Random(seed)
+    game = new_game(random)
+    while not (
+        game.phase == T.Phase.PLAYING
+        and game.trick is not None
+        and len(game.trick) == 0
+        and len(game.players[game.current_player].hand) == cards
+    ):
+        action = random.choice(valid_actions_for_state(game))
+        result = apply_action(game, action, random)
+        assert isinstance(result, T.ActionSuccess), result
+        game = result.new_state
+    return game
+
+
+@pytest.fixture(scope="module")
+def tablebase(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Tablebase]:
+    path = tmp_path_factory.mktemp("tablebase") / "endgames.bin"
+    generate(path, MAX_CARDS)
+    with Tablebase(path) as tablebase:
+        yield tablebase
+
+
+class DescribeLookup:
+    @given(
+        st.integers(min_value=0, max_value=10000),
+        st.integers(min_value=1, max_value=MAX_CARDS),
+    )
+    @settings(max_examples=60, deadline=None)
+    def it_agrees_with_the_solver(
+        self, tablebase: Tablebase, seed: int, cards: int
+    ) -> None:
+        game = _endgame(seed, cards)
+        values = lookup(tablebase, game)
+        if game.point_takers > 1:
+            assert values == solve(game)
+        else:
+            assert values is None
+
+    def it_misses_beyond_its_cards_per_hand(
+        self, tablebase: Tablebase
+    ) -> None:
+        game = _endgame(5, MAX_CARDS + 1)
+        assert game.point_takers > 1
+        assert lookup(tablebase, game) is None
+
+    def it_misses_inside_a_trick(self, tablebase: Tablebase) -> None:
+        search = SearchState.from_game_state(_endgame(2, 1))
+        search.trick_size = 1
+        assert probe(tablebase, search) is None
+
+
+class DescribeTablebase:
+    def it_rejects_other_files(self, tmp_path: Path) -> None:
+        path = tmp_path / "other.bin"
+        path.write_bytes(bytes(64))
+        with pytest.raises(ValueError):
+            Tablebase(path)
+
+    def it_counts_its_entries(self, tmp_path: Path) -> None:
+        path = tmp_path / "endgames.bin"
+        count = generate(path, 1)
+        with Tablebase(path) as tablebase:
+            assert len(tablebase) == count
+            assert tablebase.max_cards == 1
+
+
+class DescribeEndgameKey:
+    def it_ignores_who_leads(self) -> None:
+        search = SearchState.from_game_state(_endgame(5, 4))
+        key = endgame_key(search)
+        search.hands = search.hands[1:] + search.hands[:1]
+        search.lead = (search.lead - 1) % 4
+        assert endgame_key(search) == key
+
+    def it_treats_clubs_and_diamonds_alike(self) -> None:
+        search = SearchState.from_game_state(_endgame(5, 4))
+        key = endgame_key(search)
+        clubs, diamonds = T.Suit.CLUBS.order * 13, T.Suit.DIAMONDS.order * 13
+        search.hands = [
+            _swap_lanes(hand, clubs, diamonds) for hand in search.hands
+        ]
+        assert endgame_key(search) == key
+
+
+def _swap_lanes(hand: int, a: int, b: int) -> int:
+    lane = (1 << 13) - 1
+    rest = hand & ~(lane << a) & ~(lane << b)
+    return rest | (hand >> a & lane) << b | (hand >> b & lane) << a
@@ -1,6 +1,7 @@
 """Foundation types for Hearts engine."""
 
 from dataclasses import dataclass
+from dataclasses import field
 from enum import Enum
 from typing import TYPE_CHECKING
 from typing import Literal
@@ -91,12 +92,29 @@ SUIT_KEYS = {
 RANK_KEYS = {r.display.lower(): r for r in Rank}
 
 
-@dataclass(frozen=True, slots=True)
+# Dense card index: suit.order * 13 + rank.order - 2, i.e. sort order.
+CardIndex = int
+
+
+@dataclass(frozen=True, slots=True, init=False, eq=False)
 class Card:
-    """An immutable playing card."""
+    """An immutable playing card.
+
+    Cards are interned: constructing one hands back the shared instance from
+    CARDS, so equality is identity and the dense index is hash and sort key.
+    """
 
     suit: Suit
     rank: Rank
+    index: CardIndex = field(init=False, repr=False, compare=False)
+
+    def __new__(cls, suit: Suit, rank: Rank) -> Card:
+        return CARDS[suit.order * 13 + rank.order - 2]
+
+    @classmethod
+    def from_index(cls, index: CardIndex) -> Card:
+        """Look up the interned card for a dense index."""
+        return CARDS[index]
 
     @classmethod
     def from_string(cls, s: str) -> Card:
@@ -106,6 +124,12 @@ class Card:
         rank = RANK_KEYS[s[:-1]]
         return cls(suit, rank)
 
+    def __hash__(self) -> int:
+        return self.index
+
+    def __reduce__(self) -> tuple[object, tuple[CardIndex]]:
+        return (Card.from_index, (self.index,))
+
     def __str__(self) -> str:
         return f"{self.rank}{self.suit}"
 
@@ -118,9 +142,21 @@ class Card:
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, Card):
             return NotImplemented
-        if self.suit != other.suit:
-            return self.suit.order < other.suit.order
-        return self.rank.order < other.rank.order
+        return self.index < other.index
+
+
+def _intern(suit: Suit, rank: Rank) -> Card:
+    card = object.__new__(Card)
+    object.__setattr__(card, "suit", suit)
+    object.__setattr__(card, "rank", rank)
+    object.__setattr__(card, "index", suit.order * 13 + rank.order - 2)
+    return card
+
+
+# The 52 interned cards, indexed by CardIndex.
+CARDS: tuple[Card, ...] = tuple(
+    _intern(suit, rank) for suit in Suit for rank in Rank
+)
 
 
 # Game phases
@@ -0,0 +1,65 @@
+"""Zobrist position keys for GameState.
+
+A key XORs one random 64-bit word per (card, location) pair plus words for
+the player to move, the phase and hearts broken. The key is kept up to date by
+XOR-ing words in and out as cards move, and backs GameState.__hash__.
+
+Scores, round number, dealer and game id are not part of the key; states that
+differ only there share a key and are told apart by __eq__.
+"""
+
+from random import Random
+from typing import TYPE_CHECKING
+
+from . import types as T
+
+if TYPE_CHECKING:
+    from .state import GameState
+
+# Fixed seed: keys are stable across processes, so they can be persisted.
+_random = Random(0x5EED_4EA7)
+
+
+def _words(n: int) -> tuple[int, ...]:
+    return tuple(_random.getrandbits(64) for _ in range(n))
+
+
+# Per player, indexed by card index: where each card currently is.
+HAND = tuple(_words(52) for _ in T.PLAYER_IDS)
+TRICK = tuple(_words(52) for _ in T.PLAYER_IDS)
+WON = tuple(_words(52) for _ in T.PLAYER_IDS)
+PENDING_PASS = tuple(_words(52) for _ in T.PLAYER_IDS)
+
+TURN = _words(4)
+PHASE = dict(zip(T.Phase, _words(len(T.Phase))))
+HEARTS_BROKEN = _random.getrandbits(64)
+
+
+def position_key(state: GameState) -> int:
+    """Compute a state's key from scratch."""
+    key = TURN[state.current_player] ^ PHASE[state.phase]
+    if state.hearts_broken:
+        key ^= HEARTS_BROKEN
+    for pid, player in zip(T.PLAYER_IDS, state.players):
+        for card in player.hand:
+            key ^= HAND[pid][card.index]
+        for trick in player.tricks_won:
+            for card in trick.values():
+                key ^= WON[pid][card.index]
+    if state.trick is not None:
+        for pid, card in state.trick.items():
+            key ^= TRICK[pid][card.index]
+    for pid, cards in zip(T.PLAYER_IDS, state.pending_passes):
+        for card in cards or ():
+            key ^= PENDING_PASS[pid][card.index]
+    return key
+
+
+def move_turn(key: int, before: T.PlayerId, after: T.PlayerId) -> int:
+    """Key after the player to move changes."""
+    return key ^ TURN[before] ^ TURN[after]
+
+
+def move_phase(key: int, before: T.Phase, after: T.Phase) -> int:
+    """Key after a phase change."""
+    return key ^ PHASE[before] ^ PHASE[after]
@@ -0,0 +1,55 @@
+"""Tests for Zobrist position keys."""
+
+import dataclasses
+from random import Random
+
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+
+from . import types as T
+from .main import apply_action
+from .main import new_game
+from .rules import valid_actions_for_state
+from .state import GameState
+from .zobrist import position_key
+
+
+class DescribePositionKey:
+    """Tests for incrementally maintained keys."""
+
+    @given(st.integers(min_value=0, max_value=10000))
+    @settings(max_examples=10, deadline=5000)
+    def it_matches_a_full_recompute_after_every_action(
+        self, seed: int
+    ) -> None:
+        random = Random(seed)
+        rng = Random(seed)
+        game: GameState = new_game(random)
+        for _ in range(400):
+            if game.phase == T.Phase.GAME_END:
+                break
+            action = rng.choice(valid_actions_for_state(game))
+            result = apply_action(game, action, random)
+            assert isinstance(result, T.ActionSuccess), result
+            game = result.new_state
+            assert game.key == position_key(game), action
+
+    def it_recomputes_after_replace(self) -> None:
+        game = new_game(Random(42))
+        moved = dataclasses.replace(game, current_player=2)
+        assert moved.key == position_key(moved)
+        assert moved.key != game.key
+
+    def it_backs_hash_and_equality(self) -> None:
+        game = new_game(Random(42), game_id="g")
+        same = new_game(Random(42), game_id="g")
+        assert game is not same
+        assert hash(game) == hash(same) == hash(game.key)
+        assert {game: 1}[same] == 1
+
+    def it_tells_apart_states_that_share_a_key(self) -> None:
+        game = new_game(Random(42), game_id="g")
+        renamed = dataclasses.replace(game, game_id="h")
+        assert renamed.key == game.key
+        assert renamed != game